@@ -1,36 +1,120 @@
 import os
-from model.db import db
+import threading
+from model.db import db, criar_indices, configurar_sqlite, manutencao_sqlite
 from model.atividade import Atividade
 from controller.atividade_controller import atividadeController
 from model.notas import Notas
+from model.replica import ReplicaReferencia, EstadoSincronizacao
+from model.versao import VersaoTabela, registrar_versoes
+from model.resumo_nota import ResumoNota, reconstruir_resumos, registrar_resumos_iniciais
 from controller.notas_controller import notasController
+from controller.diagnostico_controller import diagnosticoController
+from controller.media_controller import mediaController
+from controller.estatisticas_controller import estatisticasController
 from flask import Flask
+from service.sincronizacao import sincronizar
+from service.tarefas import iniciar_tarefa_periodica
+from utils.importacao import registrar_comando_importacao
+from utils.compressao import configurar_compressao
+from utils.json_rapido import configurar_json
+from utils.cache_respostas import em_cache
+from utils.metricas import configurar_metricas
+from utils.consultas import configurar_consultas
 from config import Config
 from flasgger import Swagger
 
 app = Flask(__name__)
 app.config.from_object(Config)
+configurar_json(app)
 db.init_app(app)
+sqlite = configurar_sqlite(app)
 swagger = Swagger(app)
+configurar_compressao(app)
+configurar_metricas(app)
+configurar_consultas(app)
 
 with app.app_context():
     db.create_all()
+    criar_indices()
+    registrar_versoes(Atividade, Notas)
+    registrar_resumos_iniciais()
 
 app.add_url_rule('/criar_atividade', view_func=atividadeController.criar,methods = ['POST'],endpoint='criar_atividade')
+app.add_url_rule('/criar_atividades_lote', view_func=atividadeController.criar_lote,methods = ['POST'],endpoint='criar_atividades_lote')
 
-app.add_url_rule('/listar_atividade', view_func = atividadeController.listar,methods = ['GET'],endpoint = 'listar_atividade')
+app.add_url_rule('/listar_atividade', view_func = em_cache(atividadeController.listar, Atividade),methods = ['GET'],endpoint = 'listar_atividade')
 
 app.add_url_rule('/atualizar_atividade/<int:id>', view_func=atividadeController.atualizar,methods= ['PUT'], endpoint='atualizar_atividade')
 
 app.add_url_rule('/deletar_atividade/<int:id>', view_func=atividadeController.deletar,methods = ['DELETE'],endpoint='deletar_atividade')
 
 app.add_url_rule('/criar_notas', view_func=notasController.criar,methods = ['POST'],endpoint='criar_notas')
+app.add_url_rule('/criar_notas_lote', view_func=notasController.criar_lote,methods = ['POST'],endpoint='criar_notas_lote')
 
-app.add_url_rule('/listar_notas', view_func = notasController.listar,methods = ['GET'],endpoint = 'listar_notas')
+app.add_url_rule('/listar_notas', view_func = em_cache(notasController.listar, Notas),methods = ['GET'],endpoint = 'listar_notas')
 
 app.add_url_rule('/atualizar_nota/<int:id>', view_func=notasController.atualizar, methods= ['PUT'],endpoint='atualizar_nota')
 
 app.add_url_rule('/deletar_nota/<int:id>', view_func=notasController.deletar, methods = ['DELETE'], endpoint='deletar_nota')
 
+app.add_url_rule('/media/<int:id_aluno>', view_func=mediaController.aluno, methods = ['GET'], endpoint='media_aluno')
+
+app.add_url_rule('/medias/turma/<int:id_turma>', view_func=mediaController.turma, methods = ['GET'], endpoint='medias_turma')
+
+app.add_url_rule('/estatisticas/turma/<int:id_turma>', view_func=estatisticasController.turma, methods = ['GET'], endpoint='estatisticas_turma')
+
+app.add_url_rule('/estatisticas/atividade/<int:id_atividade>', view_func=estatisticasController.atividade, methods = ['GET'], endpoint='estatisticas_atividade')
+
+app.add_url_rule('/diagnostico/cache_referencia', view_func=diagnosticoController.cache_referencia,methods = ['GET'],endpoint='cache_referencia')
+
+app.add_url_rule('/diagnostico/upstreams', view_func=diagnosticoController.upstreams,methods = ['GET'],endpoint='upstreams')
+
+app.add_url_rule('/diagnostico/cache_estatisticas', view_func=diagnosticoController.cache_estatisticas,methods = ['GET'],endpoint='cache_estatisticas')
+
+app.add_url_rule('/diagnostico/cache_respostas', view_func=diagnosticoController.cache_respostas,methods = ['GET'],endpoint='cache_respostas')
+
+app.add_url_rule('/metrics', view_func=diagnosticoController.metricas,methods = ['GET'],endpoint='metrics')
+
+@app.cli.command('sincronizar')
+def sincronizar_comando():
+    """Aplica na réplica local o feed de alterações do gerenciamento, uma vez."""
+    print(f'{sincronizar()} alterações aplicadas.')
+
+@app.cli.command('reconstruir_medias')
+def reconstruir_medias_comando():
+    """Recalcula do zero os resumos de médias a partir de notas e atividades (para reparo)."""
+    print(f'{reconstruir_resumos()} resumos de média gerados.')
+
+registrar_comando_importacao(app, 'importar_atividades', atividadeController.validar_lote, atividadeController.inserir_lote,
+                             'Importa atividades de um arquivo CSV ou NDJSON, validando professores e turmas no gerenciamento.')
+registrar_comando_importacao(app, 'importar_notas', notasController.validar_lote, notasController.inserir_lote,
+                             'Importa notas de um arquivo CSV ou NDJSON, validando os alunos no gerenciamento.')
+
+_tarefas_iniciadas = False
+_tarefas_lock = threading.Lock()
+
+def iniciar_tarefas():
+    """
+    Inicia as tarefas periódicas do serviço, uma única vez por processo.
+    No gunicorn elas rodam em um único worker (gunicorn.conf.py).
+    """
+    global _tarefas_iniciadas
+    with _tarefas_lock:
+        if _tarefas_iniciadas:
+            return
+        _tarefas_iniciadas = True
+    if app.config['SINCRONIZACAO_INTERVALO']:
+        iniciar_tarefa_periodica(app, 'sincronizacao', app.config['SINCRONIZACAO_INTERVALO'], sincronizar)
+    if sqlite and app.config['SQLITE_MANUTENCAO_INTERVALO']:
+        iniciar_tarefa_periodica(app, 'manutencao_sqlite', app.config['SQLITE_MANUTENCAO_INTERVALO'], manutencao_sqlite)
+
+if app.config['TAREFAS_NA_IMPORTACAO']:
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        # Pela CLI do Flask o app é importado também pelos comandos (flask sincronizar, flask importar_*...),
+        # que rodariam junto com as tarefas: elas só começam na primeira requisição, o que só acontece no flask run
+        app.before_request(iniciar_tarefas)
+    else:
+        iniciar_tarefas()
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5002, debug=True)
\ No newline at end of file
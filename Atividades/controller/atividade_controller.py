@@ -2,14 +2,36 @@ from flask import request, jsonify
 from model.db import db
 from model.atividade import Atividade
 import requests
+from service import gerenciamento
+from utils.listagem import listar, Filtro
+from utils import lote
+from sqlalchemy import insert, select
 from datetime import date
 # Lembre-se que o Swagger(app) é inicializado no seu app.py
 
-url_professor = 'http://api_gerenciamento:5000/lista_professor'
-url_turma = 'http://api_gerenciamento:5000/lista_turmas'
+# Quantidade máxima de ids por consulta IN (o SQLite limita o número de parâmetros)
+TAMANHO_LOTE_IN = 500
 
 class atividadeController:
 
+    # Campos das listagens (nome no JSON -> coluna), também aceitos em ?fields=
+    CAMPOS = {
+        'id': Atividade.id,
+        'nome_atividade': Atividade.nome_atividade,
+        'descricao': Atividade.descricao,
+        'peso_porcento': Atividade.peso_porcento,
+        'data_entrega': Atividade.data_entrega,
+        'turma_id': Atividade.id_turma,
+        'professor_id': Atividade.id_professor
+    }
+
+    # Filtros aceitos na listagem (parâmetro da query string -> Filtro), todos com índice
+    FILTROS = {
+        'turma_id': Filtro(Atividade.id_turma),
+        'data_inicio': Filtro(Atividade.data_entrega, '>='),
+        'data_fim': Filtro(Atividade.data_entrega, '<=')
+    }
+
     @staticmethod
     def listar():
         """
@@ -17,9 +39,52 @@ class atividadeController:
         ---
         tags:
           - Atividades
+        parameters:
+          - name: limit
+            in: query
+            type: integer
+            required: false
+            description: Itens por página (padrão 100, máximo 1000).
+          - name: after
+            in: query
+            type: integer
+            required: false
+            description: Cursor da página anterior (id do último item recebido, também enviado em X-Proximo-Cursor).
+          - name: todos
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro, devolve todos os registros sem paginação.
+          - name: stream
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro (ou com Accept application/x-ndjson), envia NDJSON em streaming, um registro por linha.
+          - name: fields
+            in: query
+            type: string
+            required: false
+            description: Lista de campos separados por vírgula (ex. id,nome); só essas colunas são lidas do banco.
+          - name: turma_id
+            in: query
+            type: integer
+            required: false
+            description: Só as atividades desta turma.
+          - name: data_inicio
+            in: query
+            type: string
+            format: date
+            required: false
+            description: Só atividades com data de entrega a partir deste dia (AAAA-MM-DD).
+          - name: data_fim
+            in: query
+            type: string
+            format: date
+            required: false
+            description: Só atividades com data de entrega até este dia, inclusive (AAAA-MM-DD).
         responses:
           200:
-            description: Uma lista de todas as atividades.
+            description: Uma página da lista de atividades, ordenada por id.
             schema:
               type: array
               items:
@@ -49,19 +114,7 @@ class atividadeController:
                     type: integer
                     description: ID do professor associado.
         """
-        atividades = Atividade.query.all()
-        return jsonify([
-            {
-                'id': a.id,
-                'nome_atividade': a.nome_atividade,
-                'descricao': a.descricao,
-                'peso_porcento': a.peso_porcento,
-                # Converte a data para string no formato ISO para ser "jsonificável"
-                'data_entrega': a.data_entrega.isoformat() if a.data_entrega else None, 
-                'turma_id': a.id_turma,
-                'professor_id': a.id_professor
-            } for a in atividades
-        ])
+        return listar(atividadeController.CAMPOS, Atividade.id, atividadeController.FILTROS)
 
     @staticmethod
     def criar():
@@ -112,28 +165,14 @@ class atividadeController:
         """
         data = request.get_json()
         try:
-            # Validação de Professor
-            response_prof = requests.get(url_professor)
-            response_prof.raise_for_status()
-            professores = response_prof.json()
-            professor_encontrado = False
-            for p in professores:
-                if str(p.get('id')) == str(data.get('id_professor')):
-                    professor_encontrado = True
-                    break
-            if not professor_encontrado:
+            # Validação de Professor e Turma em uma única consulta ao gerenciamento
+            faltando = gerenciamento.inexistentes(
+                professores=[data.get('id_professor')],
+                turmas=[data.get('id_turma')]
+            )
+            if faltando.get('professores'):
                 return jsonify({'erro': f'O professor com ID {data.get("id_professor")} não existe.'}), 404
-
-            # Validação de Turma
-            response_turma = requests.get(url_turma)
-            response_turma.raise_for_status()
-            turmas = response_turma.json()
-            turma_encontrada = False
-            for t in turmas:
-                if str(t.get('id')) == str(data.get('id_turma')):
-                    turma_encontrada = True
-                    break
-            if not turma_encontrada:
+            if faltando.get('turmas'):
                 return jsonify({'erro': f'A turma com ID {data.get("id_turma")} não existe.'}), 404
 
             # Criação da Atividade
@@ -156,6 +195,120 @@ class atividadeController:
         except requests.exceptions.RequestException as e:
             return jsonify({'erro': f'Falha ao consultar professores ou turmas: {str(e)}'}), 500
 
+    @staticmethod
+    def ids_existentes(ids):
+        """Retorna o conjunto de ids de `ids` que são atividades cadastradas, com uma consulta IN por lote."""
+        ids = list(ids)
+        encontrados = set()
+        for inicio in range(0, len(ids), TAMANHO_LOTE_IN):
+            lote_ids = ids[inicio:inicio + TAMANHO_LOTE_IN]
+            encontrados.update(db.session.execute(select(Atividade.id).where(Atividade.id.in_(lote_ids))).scalars())
+        return encontrados
+
+    @staticmethod
+    def converter_lote(item):
+        """Converte um item de lote nas colunas de Atividade; levanta lote.ItemInvalido se algo estiver errado."""
+        return {
+            'nome_atividade': lote.texto(item, 'nome_atividade'),
+            'descricao': lote.texto(item, 'descricao'),
+            'peso_porcento': lote.inteiro(item, 'peso_porcento'),
+            'data_entrega': lote.data(item, 'data_entrega'),
+            'id_turma': lote.inteiro(item, 'id_turma'),
+            'id_professor': lote.inteiro(item, 'id_professor')
+        }
+
+    @staticmethod
+    def inserir_lote(linhas):
+        """Insere as linhas (já validadas) com um único executemany e retorna os ids na ordem das linhas. Não faz commit."""
+        if not linhas:
+            return []
+        return db.session.execute(
+            insert(Atividade).returning(Atividade.id, sort_by_parameter_order=True), linhas
+        ).scalars().all()
+
+    @staticmethod
+    def validar_lote(itens):
+        """
+        Converte os itens e valida professores e turmas de todos eles com uma única validação no gerenciamento.
+        Retorna (linhas, erros); levanta RequestException se o gerenciamento falhar.
+        """
+        linhas, erros = lote.converter_itens(itens, atividadeController.converter_lote)
+        faltando = gerenciamento.inexistentes(
+            professores=sorted({linha['id_professor'] for linha in linhas.values()}),
+            turmas=sorted({linha['id_turma'] for linha in linhas.values()})
+        )
+        lote.rejeitar_referencias(
+            linhas, erros, 'id_professor', {int(id) for id in faltando.get('professores', [])},
+            'O professor com ID {} não existe.'
+        )
+        lote.rejeitar_referencias(
+            linhas, erros, 'id_turma', {int(id) for id in faltando.get('turmas', [])},
+            'A turma com ID {} não existe.'
+        )
+        return linhas, erros
+
+    @staticmethod
+    def criar_lote():
+        """
+        Cria várias atividades em uma única requisição.
+        Professores e turmas de todos os itens são validados de uma vez no gerenciamento e os itens
+        válidos são inseridos em uma única transação. Itens inválidos não impedem a criação dos demais.
+        ---
+        tags:
+          - Atividades
+        parameters:
+          - name: body
+            in: body
+            required: true
+            schema:
+              type: array
+              items:
+                type: object
+                required:
+                  - nome_atividade
+                  - descricao
+                  - peso_porcento
+                  - data_entrega
+                  - id_turma
+                  - id_professor
+                properties:
+                  nome_atividade:
+                    type: string
+                  descricao:
+                    type: string
+                  peso_porcento:
+                    type: integer
+                  data_entrega:
+                    type: string
+                    format: date
+                  id_turma:
+                    type: integer
+                  id_professor:
+                    type: integer
+        responses:
+          201:
+            description: Todas as atividades foram criadas.
+          207:
+            description: Parte das atividades foi criada; veja o status de cada item em 'resultados'.
+          400:
+            description: Corpo inválido ou nenhuma atividade pôde ser criada.
+          500:
+            description: Falha ao consultar os serviços externos de professores ou turmas.
+        """
+        try:
+            itens = lote.itens_do_corpo()
+        except lote.LoteInvalido as e:
+            return jsonify({'erro': str(e)}), 400
+
+        try:
+            linhas, erros = atividadeController.validar_lote(itens)
+        except requests.exceptions.RequestException as e:
+            return jsonify({'erro': f'Falha ao consultar professores ou turmas: {str(e)}'}), 500
+        indices = list(linhas)
+        ids = atividadeController.inserir_lote([linhas[indice] for indice in indices])
+        db.session.commit()
+        return lote.responder_lote(len(itens), dict(zip(indices, ids)), erros)
+
     @staticmethod
     def atualizar(id):
         """
@@ -206,31 +359,15 @@ class atividadeController:
         atividade = Atividade.query.get_or_404(id) 
         data = request.get_json()
         try:
-            # Valida professor SE ele for enviado na requisição
-            if 'id_professor' in data:
-                response_prof = requests.get(url_professor)
-                response_prof.raise_for_status()
-                professores = response_prof.json()
-                professor_encontrado = False
-                for p in professores:
-                    if str(p.get('id')) == str(data.get('id_professor')):
-                        professor_encontrado = True
-                        break
-                if not professor_encontrado:
-                    return jsonify({'erro': f'O professor com ID {data.get("id_professor")} não existe.'}), 404
-            
-            # Valida turma SE ela for enviada na requisição
-            if 'id_turma' in data:
-                response_turma = requests.get(url_turma)
-                response_turma.raise_for_status()
-                turmas = response_turma.json()
-                turma_encontrada = False
-                for t in turmas: 
-                    if str(t.get('id')) == str(data.get('id_turma')):
-                        turma_encontrada = True
-                        break
-                if not turma_encontrada:
-                    return jsonify({'erro': f'A turma com ID {data.get("id_turma")} não existe.'}), 404
+            # Valida professor e turma SE forem enviados na requisição (uma única consulta)
+            faltando = gerenciamento.inexistentes(
+                professores=[data['id_professor']] if 'id_professor' in data else [],
+                turmas=[data['id_turma']] if 'id_turma' in data else []
+            )
+            if faltando.get('professores'):
+                return jsonify({'erro': f'O professor com ID {data.get("id_professor")} não existe.'}), 404
+            if faltando.get('turmas'):
+                return jsonify({'erro': f'A turma com ID {data.get("id_turma")} não existe.'}), 404
             
             # Atualiza os campos
             atividade.nome_atividade = data.get('nome_atividade', atividade.nome_atividade)
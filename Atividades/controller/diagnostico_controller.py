@@ -0,0 +1,78 @@
+from flask import jsonify, Response
+from service.cache_referencia import obter_cache
+from service.http_client import obter_cliente
+from utils.cache_respostas import obter_cache_respostas
+from utils.metricas import exportar
+from service.estatisticas import obter_cache_estatisticas
+
+class diagnosticoController:
+
+    @staticmethod
+    def cache_referencia():
+        """
+        Estatísticas do cache de dados de referência do gerenciamento (turmas, professores, alunos).
+        Útil para ajustar REFERENCIA_CACHE_TTL e REFERENCIA_CACHE_TAMANHO.
+        ---
+        tags:
+          - Diagnóstico
+        responses:
+          200:
+            description: Contadores de acertos, faltas, revalidações (304) e despejos do cache deste processo.
+        """
+        return jsonify(obter_cache().estatisticas())
+
+    @staticmethod
+    def upstreams():
+        """
+        Estatísticas das chamadas deste processo a outros serviços, por upstream.
+        ---
+        tags:
+          - Diagnóstico
+        responses:
+          200:
+            description: Requisições, falhas, retentativas, latência média e estado do circuito de cada upstream.
+        """
+        return jsonify(obter_cliente().estatisticas())
+
+    @staticmethod
+    def cache_estatisticas():
+        """
+        Estatísticas do cache dos relatórios de /estatisticas deste processo.
+        ---
+        tags:
+          - Diagnóstico
+        responses:
+          200:
+            description: Itens guardados, tamanho máximo, acertos e faltas.
+        """
+        return jsonify(obter_cache_estatisticas().estatisticas())
+
+    @staticmethod
+    def cache_respostas():
+        """
+        Estatísticas do cache de respostas das listagens e buscas deste processo.
+        ---
+        tags:
+          - Diagnóstico
+        responses:
+          200:
+            description: Itens e bytes guardados, limite de memória, acertos, faltas, taxa de acerto, despejos e invalidações.
+        """
+        return jsonify(obter_cache_respostas().estatisticas())
+
+    @staticmethod
+    def metricas():
+        """
+        Métricas no formato de texto do Prometheus: requisições, latência e requisições em andamento por
+        endpoint, tempo das consultas ao banco e das chamadas ao gerenciamento. Com o gunicorn, somadas entre os workers.
+        ---
+        tags:
+          - Diagnóstico
+        produces:
+          - text/plain
+        responses:
+          200:
+            description: Métricas no formato de exposição de texto do Prometheus.
+        """
+        corpo, tipo = exportar()
+        return Response(corpo, content_type=tipo)
@@ -0,0 +1,137 @@
+from flask import request, jsonify, current_app
+from model.db import db
+from model.atividade import Atividade
+from model.versao import versoes_tabelas
+from service.estatisticas import TABELAS, estatisticas_turma, estatisticas_atividade, obter_cache_estatisticas
+from utils.listagem import responder_condicional
+
+class estatisticasController:
+
+    @staticmethod
+    def parametros():
+        """
+        Lê ?percentis=10,50,90 e ?faixas=N (padrões ESTATISTICAS_PERCENTIS e ESTATISTICAS_FAIXAS).
+        Levanta ValueError com a mensagem de erro se algum valor for inválido.
+        """
+        config = current_app.config
+        percentis = request.args.get('percentis')
+        if percentis:
+            try:
+                percentis = tuple(float(p) for p in percentis.split(',') if p.strip())
+            except ValueError:
+                raise ValueError("O parâmetro 'percentis' deve ser uma lista de números separados por vírgula.")
+            if not percentis or any(p < 0 or p > 100 for p in percentis):
+                raise ValueError("Os percentis devem estar entre 0 e 100.")
+        else:
+            percentis = tuple(config['ESTATISTICAS_PERCENTIS'])
+        try:
+            faixas = int(request.args.get('faixas', config['ESTATISTICAS_FAIXAS']))
+        except ValueError:
+            raise ValueError("O parâmetro 'faixas' deve ser um número inteiro.")
+        if not 1 <= faixas <= 100:
+            raise ValueError("O parâmetro 'faixas' deve estar entre 1 e 100.")
+        return {
+            'nota_aprovacao': config['NOTA_APROVACAO'],
+            'nota_maxima': config['NOTA_MAXIMA'],
+            'faixas': faixas,
+            'percentis': percentis,
+        }
+
+    @staticmethod
+    def responder(tipo, id, parametros, calcular):
+        """
+        Responde o relatório pelo cache, com a chave incluindo as versões de notas e atividades, e com
+        ETag/Last-Modified dessas versões (304 se o cliente já tem o relatório atual).
+        """
+        def gerar():
+            versoes = tuple(sorted(versoes_tabelas(TABELAS).items()))
+            chave = (tipo, id, parametros['faixas'], parametros['percentis'], versoes)
+            return jsonify(obter_cache_estatisticas().obter(chave, calcular))
+        return responder_condicional(TABELAS, gerar)
+
+    @staticmethod
+    def turma(id_turma):
+        """
+        Estatísticas das notas de uma turma.
+        Traz a distribuição de todas as notas, das médias ponderadas dos alunos (com a taxa de aprovação
+        da turma) e de cada atividade. O resultado fica em cache até alguma nota ou atividade mudar;
+        a resposta tem ETag e Last-Modified e requisições condicionais recebem 304.
+        ---
+        tags:
+          - Estatísticas
+        parameters:
+          - name: id_turma
+            in: path
+            type: integer
+            required: true
+            description: ID da turma.
+          - name: percentis
+            in: query
+            type: string
+            required: false
+            description: Percentis separados por vírgula (padrão 10,25,50,75,90).
+          - name: faixas
+            in: query
+            type: integer
+            required: false
+            description: Quantidade de faixas iguais do histograma, que cobre as notas de 0 a NOTA_MAXIMA; de 1 a 100 (padrão 10).
+        responses:
+          200:
+            description: >
+              Objetos 'notas', 'medias_alunos' e um por atividade, cada um com quantidade, media, mediana,
+              desvio_padrao, minimo, maximo, percentis, histograma e taxa_aprovacao.
+          304:
+            description: O relatório não mudou desde o ETag enviado em If-None-Match.
+          400:
+            description: Parâmetros inválidos.
+        """
+        try:
+            parametros = estatisticasController.parametros()
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
+        return estatisticasController.responder('turma', id_turma, parametros,
+                                                lambda: estatisticas_turma(id_turma, parametros))
+
+    @staticmethod
+    def atividade(id_atividade):
+        """
+        Estatísticas das notas de uma atividade.
+        O resultado fica em cache até alguma nota ou atividade mudar; a resposta tem ETag e Last-Modified.
+        ---
+        tags:
+          - Estatísticas
+        parameters:
+          - name: id_atividade
+            in: path
+            type: integer
+            required: true
+            description: ID da atividade.
+          - name: percentis
+            in: query
+            type: string
+            required: false
+            description: Percentis separados por vírgula (padrão 10,25,50,75,90).
+          - name: faixas
+            in: query
+            type: integer
+            required: false
+            description: Quantidade de faixas iguais do histograma, que cobre as notas de 0 a NOTA_MAXIMA; de 1 a 100 (padrão 10).
+        responses:
+          200:
+            description: Quantidade, media, mediana, desvio_padrao, minimo, maximo, percentis, histograma e taxa_aprovacao.
+          304:
+            description: O relatório não mudou desde o ETag enviado em If-None-Match.
+          400:
+            description: Parâmetros inválidos.
+          404:
+            description: Atividade não encontrada.
+        """
+        try:
+            parametros = estatisticasController.parametros()
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
+        atividade = db.session.get(Atividade, id_atividade)
+        if atividade is None:
+            return jsonify({'erro': f'A atividade com ID {id_atividade} não existe.'}), 404
+        return estatisticasController.responder('atividade', id_atividade, parametros,
+                                                lambda: estatisticas_atividade(atividade, parametros))
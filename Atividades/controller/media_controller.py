@@ -0,0 +1,105 @@
+from flask import jsonify
+from sqlalchemy import select
+from model.db import db
+from model.resumo_nota import ResumoNota
+
+class mediaController:
+
+    @staticmethod
+    def serializar(resumo):
+        return {
+            'id_aluno': resumo.id_aluno,
+            'id_turma': resumo.id_turma,
+            'media': resumo.media,
+            'soma_pesos': resumo.soma_pesos,
+            'quantidade_notas': resumo.quantidade
+        }
+
+    @staticmethod
+    def aluno(id_aluno):
+        """
+        Média ponderada de um aluno em cada turma em que ele tem notas.
+        Lida do resumo mantido a cada alteração de notas e atividades, sem recalcular nada.
+        ---
+        tags:
+          - Médias
+        parameters:
+          - name: id_aluno
+            in: path
+            type: integer
+            required: true
+            description: ID do aluno.
+        responses:
+          200:
+            description: Média do aluno por turma.
+            schema:
+              type: object
+              properties:
+                id_aluno:
+                  type: integer
+                turmas:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      id_turma:
+                        type: integer
+                      media:
+                        type: number
+                        description: Soma de nota * peso_porcento dividida pela soma dos pesos das atividades com nota.
+                      soma_pesos:
+                        type: number
+                        description: Soma dos pesos (peso_porcento) das atividades com nota.
+                      quantidade_notas:
+                        type: integer
+          404:
+            description: O aluno não tem notas.
+        """
+        resumos = db.session.execute(
+            select(ResumoNota).where(ResumoNota.id_aluno == id_aluno).order_by(ResumoNota.id_turma)
+        ).scalars().all()
+        if not resumos:
+            return jsonify({'erro': f'Nenhuma nota encontrada para o aluno com ID {id_aluno}.'}), 404
+        turmas = []
+        for resumo in resumos:
+            item = mediaController.serializar(resumo)
+            del item['id_aluno']
+            turmas.append(item)
+        return jsonify({'id_aluno': id_aluno, 'turmas': turmas})
+
+    @staticmethod
+    def turma(id_turma):
+        """
+        Médias ponderadas de todos os alunos de uma turma, em uma consulta só.
+        ---
+        tags:
+          - Médias
+        parameters:
+          - name: id_turma
+            in: path
+            type: integer
+            required: true
+            description: ID da turma.
+        responses:
+          200:
+            description: Média de cada aluno com notas na turma, ordenado por id_aluno (lista vazia se não houver notas).
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  id_aluno:
+                    type: integer
+                  id_turma:
+                    type: integer
+                  media:
+                    type: number
+                  soma_pesos:
+                    type: number
+                  quantidade_notas:
+                    type: integer
+        """
+        resumos = db.session.execute(
+            select(ResumoNota).where(ResumoNota.id_turma == id_turma).order_by(ResumoNota.id_aluno)
+        ).scalars()
+        return jsonify([mediaController.serializar(resumo) for resumo in resumos])
@@ -1,15 +1,33 @@
 from flask import request, jsonify
 from model.db import db
 from model.notas import Notas
+from model.resumo_nota import registrar_notas_inseridas
+from controller.atividade_controller import atividadeController
 import requests
+from service import gerenciamento
+from utils.listagem import listar, Filtro
+from utils import lote
+from sqlalchemy import insert
 from datetime import date
 # A importação do Swagger e a inicialização (Swagger(app))
 # devem estar no seu arquivo principal (app.py), não aqui.
 
-url = 'http://api_gerenciamento:5000/lista_aluno'
-
 class notasController:
 
+    # Campos das listagens (nome no JSON -> coluna), também aceitos em ?fields=
+    CAMPOS = {
+        'id': Notas.id,
+        'nota': Notas.nota,
+        'id_aluno': Notas.id_aluno,
+        'id_atividade': Notas.id_atividade
+    }
+
+    # Filtros aceitos na listagem (parâmetro da query string -> Filtro), todos com índice
+    FILTROS = {
+        'id_aluno': Filtro(Notas.id_aluno),
+        'id_atividade': Filtro(Notas.id_atividade)
+    }
+
     @staticmethod
     def listar():
         """
@@ -17,9 +35,45 @@ class notasController:
         ---
         tags:
           - Notas
+        parameters:
+          - name: limit
+            in: query
+            type: integer
+            required: false
+            description: Itens por página (padrão 100, máximo 1000).
+          - name: after
+            in: query
+            type: integer
+            required: false
+            description: Cursor da página anterior (id do último item recebido, também enviado em X-Proximo-Cursor).
+          - name: todos
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro, devolve todos os registros sem paginação.
+          - name: stream
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro (ou com Accept application/x-ndjson), envia NDJSON em streaming, um registro por linha.
+          - name: fields
+            in: query
+            type: string
+            required: false
+            description: Lista de campos separados por vírgula (ex. id,nome); só essas colunas são lidas do banco.
+          - name: id_aluno
+            in: query
+            type: integer
+            required: false
+            description: Só as notas deste aluno.
+          - name: id_atividade
+            in: query
+            type: integer
+            required: false
+            description: Só as notas desta atividade.
         responses:
           200:
-            description: Uma lista de todas as notas.
+            description: Uma página da lista de notas, ordenada por id.
             schema:
               type: array
               items:
@@ -39,15 +93,7 @@ class notasController:
                     type: integer
                     description: ID da atividade vinculada à nota.
         """
-        notas = Notas.query.all()
-        return jsonify([
-            {
-                'id': n.id,
-                'nota': n.nota,
-                'id_aluno': n.id_aluno,
-                'id_atividade':n.id_atividade,
-            } for n in notas
-        ])
+        return listar(notasController.CAMPOS, Notas.id, notasController.FILTROS)
 
     @staticmethod
     def criar():
@@ -84,7 +130,7 @@ class notasController:
           400:
             description: Dados inválidos ou faltando no JSON enviado.
           404:
-            description: O 'id_aluno' enviado não foi encontrado no serviço externo.
+            description: A atividade não existe, ou o 'id_aluno' enviado não foi encontrado no serviço externo.
           500:
             description: Falha ao consultar o serviço externo de alunos.
         """
@@ -96,16 +142,17 @@ class notasController:
 
             if not id_aluno_enviado or nota_enviada is None or not id_atividade_enviada:
                 return jsonify({'erro': 'Dados inválidos ou faltando (nota, id_aluno, id_atividade).'}), 400
+            # Mesma conversão dos lotes: ids enviados como texto ("2") viram int, e não ficam fora do resumo das médias
+            try:
+                nota_enviada = lote.numero(data, 'nota')
+                id_aluno_enviado = lote.inteiro(data, 'id_aluno')
+                id_atividade_enviada = lote.inteiro(data, 'id_atividade')
+            except lote.ItemInvalido as e:
+                return jsonify({'erro': str(e)}), 400
 
-            response = requests.get(url)
-            response.raise_for_status()
-            alunos = response.json()
-            recebido = False
-            for i in alunos:
-                if str(i.get('id')) == str(id_aluno_enviado):
-                    recebido = True
-                    break
-            if not recebido:
+            if not atividadeController.ids_existentes([id_atividade_enviada]):
+                return jsonify({'erro': f'A atividade com ID {id_atividade_enviada} não existe.'}), 404
+            if not gerenciamento.existe('aluno', id_aluno_enviado):
                 return jsonify({'erro': f'O aluno com ID {id_aluno_enviado} não existe.'}), 404
             
             nota = Notas(
@@ -121,7 +168,103 @@ class notasController:
             return jsonify({'erro': 'Dados inválidos ou faltando.'}), 400
         except requests.exceptions.RequestException as e:
             return jsonify({'erro': f'Falha ao consultar alunos: {str(e)}'}), 500
-        
+
+    @staticmethod
+    def converter_lote(item):
+        """Converte um item de lote nas colunas de Notas; levanta lote.ItemInvalido se algo estiver errado."""
+        return {
+            'nota': lote.numero(item, 'nota'),
+            'id_aluno': lote.inteiro(item, 'id_aluno'),
+            'id_atividade': lote.inteiro(item, 'id_atividade')
+        }
+
+    @staticmethod
+    def inserir_lote(linhas):
+        """
+        Insere as linhas (já validadas) com um único executemany e soma as notas nos resumos de média.
+        Retorna os ids na ordem das linhas. Não faz commit.
+        """
+        if not linhas:
+            return []
+        ids = db.session.execute(
+            insert(Notas).returning(Notas.id, sort_by_parameter_order=True), linhas
+        ).scalars().all()
+        registrar_notas_inseridas(linhas)
+        return ids
+
+    @staticmethod
+    def validar_lote(itens):
+        """
+        Converte os itens, valida as atividades com uma consulta local e os alunos com uma única validação
+        no gerenciamento. Retorna (linhas, erros); levanta RequestException se o gerenciamento falhar.
+        """
+        linhas, erros = lote.converter_itens(itens, notasController.converter_lote)
+        atividades = {linha['id_atividade'] for linha in linhas.values()}
+        lote.rejeitar_referencias(
+            linhas, erros, 'id_atividade', atividades - atividadeController.ids_existentes(atividades),
+            'A atividade com ID {} não existe.'
+        )
+        faltando = gerenciamento.inexistentes(alunos=sorted({linha['id_aluno'] for linha in linhas.values()}))
+        lote.rejeitar_referencias(
+            linhas, erros, 'id_aluno', {int(id) for id in faltando.get('alunos', [])},
+            'O aluno com ID {} não existe.'
+        )
+        return linhas, erros
+
+    @staticmethod
+    def criar_lote():
+        """
+        Cria várias notas em uma única requisição (ex. as notas de uma turma em uma atividade).
+        Os alunos de todos os itens são validados de uma vez no gerenciamento, as atividades com uma
+        consulta local, e os itens válidos são inseridos em uma única transação.
+        Itens inválidos não impedem a criação dos demais.
+        ---
+        tags:
+          - Notas
+        parameters:
+          - name: body
+            in: body
+            required: true
+            schema:
+              type: array
+              items:
+                type: object
+                required:
+                  - nota
+                  - id_aluno
+                  - id_atividade
+                properties:
+                  nota:
+                    type: number
+                    format: float
+                  id_aluno:
+                    type: integer
+                  id_atividade:
+                    type: integer
+        responses:
+          201:
+            description: Todas as notas foram criadas.
+          207:
+            description: Parte das notas foi criada; veja o status de cada item em 'resultados'.
+          400:
+            description: Corpo inválido ou nenhuma nota pôde ser criada.
+          500:
+            description: Falha ao consultar o serviço externo de alunos.
+        """
+        try:
+            itens = lote.itens_do_corpo()
+        except lote.LoteInvalido as e:
+            return jsonify({'erro': str(e)}), 400
+
+        try:
+            linhas, erros = notasController.validar_lote(itens)
+        except requests.exceptions.RequestException as e:
+            return jsonify({'erro': f'Falha ao consultar alunos: {str(e)}'}), 500
+        indices = list(linhas)
+        ids = notasController.inserir_lote([linhas[indice] for indice in indices])
+        db.session.commit()
+        return lote.responder_lote(len(itens), dict(zip(indices, ids)), erros)
+
     @staticmethod
     def atualizar(id):
         """
@@ -157,30 +300,31 @@ class notasController:
           400:
             description: Dados inválidos no JSON enviado.
           404:
-            description: A nota (pelo ID) não foi encontrada, ou o novo 'id_aluno' não foi encontrado no serviço externo.
+            description: A nota (pelo ID) ou a nova atividade não foi encontrada, ou o novo 'id_aluno' não foi encontrado no serviço externo.
           500:
             description: Falha ao consultar o serviço externo de alunos.
         """
         nota = Notas.query.get_or_404(id) # O 404 aqui é automático se a nota não existir
         data = request.get_json()
         try:
-            if 'id_aluno' in data:
-                id_aluno_novo = data.get('id_aluno')
-                
-                response = requests.get(url)
-                response.raise_for_status()
-                alunos = response.json()
-                recebido = False
-                for i in alunos:
-                    if str(i.get('id')) == str(id_aluno_novo):
-                        recebido = True
-                        break
-                if not recebido:
+            try:
+                valor_novo = lote.numero(data, 'nota', obrigatorio=False)
+                id_aluno_novo = lote.inteiro(data, 'id_aluno', obrigatorio=False)
+                id_atividade_nova = lote.inteiro(data, 'id_atividade', obrigatorio=False)
+            except lote.ItemInvalido as e:
+                return jsonify({'erro': str(e)}), 400
+            if id_atividade_nova is not None and not atividadeController.ids_existentes([id_atividade_nova]):
+                return jsonify({'erro': f'A atividade com ID {id_atividade_nova} não existe.'}), 404
+            if id_aluno_novo is not None:
+                if not gerenciamento.existe('aluno', id_aluno_novo):
                     return jsonify({'erro': f'O aluno com ID {id_aluno_novo} não existe.'}), 404
-            
-            nota.nota = data.get('nota', nota.nota)
-            nota.id_aluno = data.get('id_aluno', nota.id_aluno)
-            nota.id_atividade = data.get('id_atividade', nota.id_atividade)
+
+            if valor_novo is not None:
+                nota.nota = valor_novo
+            if id_aluno_novo is not None:
+                nota.id_aluno = id_aluno_novo
+            if id_atividade_nova is not None:
+                nota.id_atividade = id_atividade_nova
 
             db.session.commit()
             return jsonify({'mensagem':'Nota atualizada com sucesso!'})
@@ -6,9 +6,10 @@ class Atividade(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     nome_atividade = db.Column(db.String, nullable=False)
     descricao= db.Column(db.String, nullable=False)
-    peso_porcento = db.Column(db.Integer, nullable=False)
-    data_entrega = db.Column(db.Date, nullable=False)
-    id_turma= db.Column(db.Integer, nullable = False)
+    # active_history: o resumo das notas (model/resumo_nota.py) precisa do valor antigo no flush
+    peso_porcento = db.column_property(db.Column(db.Integer, nullable=False), active_history=True)
+    data_entrega = db.Column(db.Date, nullable=False, index=True)
+    id_turma = db.column_property(db.Column(db.Integer, nullable=False, index=True), active_history=True)
     id_professor = db.Column(db.Integer, nullable=False)
     def __repr__(self):
         return f"<Atividade {self.descricao}>"
@@ -3,10 +3,14 @@ from model.db import db
 class Notas(db.Model):
     __tablename__ = 'notas'
     id = db.Column(db.Integer, primary_key=True)
-    nota = db.Column(db.Float, nullable=False)
-    id_aluno = db.Column(db.Integer, nullable=False)
+    # active_history: o resumo das notas (model/resumo_nota.py) precisa do valor antigo no flush, mesmo
+    # quando o atributo estava expirado (ex. depois de um commit)
+    nota = db.column_property(db.Column(db.Float, nullable=False), active_history=True)
+    id_aluno = db.column_property(db.Column(db.Integer, nullable=False, index=True), active_history=True)
     #Relacionamento com Atividade
-    id_atividade = db.Column(db.Integer, db.ForeignKey('atividades.id'), nullable=False)
+    id_atividade = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('atividades.id'), nullable=False, index=True), active_history=True
+    )
     atividade = db.relationship('Atividade', backref='notas')
 
     def __repr__(self):
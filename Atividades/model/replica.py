@@ -0,0 +1,25 @@
+from model.db import db
+
+class ReplicaReferencia(db.Model):
+    """
+    Cópia local dos ids de alunos, turmas e professores do gerenciamento, mantida pelo feed /changes.
+    A chave primária (tabela, registro_id) serve de índice para validar referências sem ir à rede.
+    """
+    __tablename__ = 'replica_referencia'
+
+    tabela = db.Column(db.String(20), primary_key=True)
+    registro_id = db.Column(db.Integer, primary_key=True)
+
+    def __repr__(self):
+        return f"<ReplicaReferencia {self.tabela}/{self.registro_id}>"
+
+class EstadoSincronizacao(db.Model):
+    """Último seq do feed aplicado na réplica, para que um reinício continue de onde parou."""
+    __tablename__ = 'estado_sincronizacao'
+
+    origem = db.Column(db.String(50), primary_key=True)
+    ultimo_seq = db.Column(db.Integer, nullable=False, default=0)
+    atualizado_em = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<EstadoSincronizacao {self.origem} {self.ultimo_seq}>"
@@ -0,0 +1,214 @@
+from sqlalchemy import event, select, delete, func, inspect, update, insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from model.db import db
+from model.atividade import Atividade
+from model.notas import Notas
+
+class ResumoNota(db.Model):
+    """
+    Resumo das notas de um aluno em uma turma, mantido por deltas a cada alteração em notas e atividades.
+    A média ponderada é soma_ponderada / soma_pesos, com o peso_porcento de cada atividade.
+    """
+    __tablename__ = 'resumo_notas'
+
+    id_aluno = db.Column(db.Integer, primary_key=True)
+    id_turma = db.Column(db.Integer, primary_key=True, index=True)
+    soma_ponderada = db.Column(db.Float, nullable=False, default=0)  # soma de nota * peso_porcento
+    soma_pesos = db.Column(db.Float, nullable=False, default=0)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def media(self):
+        return round(self.soma_ponderada / self.soma_pesos, 2) if self.soma_pesos else None
+
+    def __repr__(self):
+        return f"<ResumoNota aluno {self.id_aluno} turma {self.id_turma}>"
+
+def _valor_antigo(obj, atributo):
+    """
+    Valor do atributo antes das alterações pendentes do flush. Os atributos usados aqui são declarados com
+    active_history=True nos modelos, para que o valor antigo seja carregado mesmo se estava expirado.
+    """
+    historico = inspect(obj).attrs[atributo].history
+    if historico.deleted:
+        return historico.deleted[0]
+    return getattr(obj, atributo)
+
+def _alterado(obj, *atributos):
+    estado = inspect(obj)
+    return any(estado.attrs[atributo].history.has_changes() for atributo in atributos)
+
+def _somar(deltas, id_aluno, atividade, nota, sinal):
+    """Acumula em `deltas` a contribuição (com sinal) de uma nota, dada a atividade como (peso, turma)."""
+    if atividade is None or nota is None:
+        return
+    peso, id_turma = atividade
+    delta = deltas.setdefault((int(id_aluno), int(id_turma)), [0.0, 0.0, 0])
+    delta[0] += sinal * float(nota) * float(peso)
+    delta[1] += sinal * float(peso)
+    delta[2] += sinal
+
+def aplicar_deltas(conexao, deltas):
+    """
+    Aplica os deltas {(id_aluno, id_turma): [soma_ponderada, soma_pesos, quantidade]} com um upsert atômico
+    (INSERT ... ON CONFLICT DO UPDATE somando ao valor atual) e remove os resumos que ficaram sem notas.
+    """
+    linhas = [
+        {'id_aluno': id_aluno, 'id_turma': id_turma,
+         'soma_ponderada': soma_ponderada, 'soma_pesos': soma_pesos, 'quantidade': quantidade}
+        for (id_aluno, id_turma), (soma_ponderada, soma_pesos, quantidade) in deltas.items()
+        if quantidade or soma_ponderada or soma_pesos
+    ]
+    if not linhas:
+        return
+    tabela = ResumoNota.__table__
+    dialeto = {'sqlite': sqlite, 'postgresql': postgresql}.get(conexao.dialect.name)
+    if dialeto is not None:
+        comando = dialeto.insert(tabela)
+        comando = comando.on_conflict_do_update(
+            index_elements=[tabela.c.id_aluno, tabela.c.id_turma],
+            set_={
+                'soma_ponderada': tabela.c.soma_ponderada + comando.excluded.soma_ponderada,
+                'soma_pesos': tabela.c.soma_pesos + comando.excluded.soma_pesos,
+                'quantidade': tabela.c.quantidade + comando.excluded.quantidade,
+            }
+        )
+        conexao.execute(comando, linhas)
+    else:
+        # Outros bancos: UPDATE e, se a linha ainda não existe, INSERT
+        for linha in linhas:
+            resultado = conexao.execute(
+                update(tabela)
+                .where(tabela.c.id_aluno == linha['id_aluno'], tabela.c.id_turma == linha['id_turma'])
+                .values(
+                    soma_ponderada=tabela.c.soma_ponderada + linha['soma_ponderada'],
+                    soma_pesos=tabela.c.soma_pesos + linha['soma_pesos'],
+                    quantidade=tabela.c.quantidade + linha['quantidade'],
+                )
+            )
+            if resultado.rowcount == 0:
+                conexao.execute(insert(tabela), linha)
+    # Só os resumos que perderam notas podem ter ficado vazios
+    esvaziados = [(linha['id_aluno'], linha['id_turma']) for linha in linhas if linha['quantidade'] < 0]
+    if esvaziados:
+        conexao.execute(delete(tabela).where(
+            tuple_(tabela.c.id_aluno, tabela.c.id_turma).in_(esvaziados), tabela.c.quantidade <= 0
+        ))
+
+def _atividades_atuais(conexao, ids):
+    """Retorna {id: (peso, turma)} das atividades de `ids` que existem; os ids são normalizados para int."""
+    ids = {int(id) for id in ids if id is not None}
+    if not ids:
+        return {}
+    consulta = select(Atividade.id, Atividade.peso_porcento, Atividade.id_turma).where(Atividade.id.in_(ids))
+    return {id: (peso, id_turma) for id, peso, id_turma in conexao.execute(consulta)}
+
+def _atividade_da_nota(atuais, id_atividade):
+    """
+    (peso, turma) da atividade de uma nota que está sendo somada ao resumo. A atividade precisa existir: uma
+    falha aqui é um erro de programação (ex. id que não passou pela validação), e não pode virar um delta
+    perdido em silêncio.
+    """
+    try:
+        return atuais[int(id_atividade)]
+    except KeyError:
+        raise LookupError(f'Atividade {id_atividade} não encontrada ao atualizar o resumo das notas.') from None
+
+def _atividade_antiga(antigas, atuais, id_atividade):
+    """
+    (peso, turma) com que uma nota removida ou alterada tinha sido somada, ou None se a atividade não existe
+    mais: nesse caso a nota também não entra no reconstruir_resumos (JOIN com atividades), então não há o que descontar.
+    """
+    id_atividade = int(id_atividade)
+    return antigas.get(id_atividade, atuais.get(id_atividade))
+
+@event.listens_for(Session, 'after_flush')
+def atualizar_resumos(session, flush_context):
+    """
+    Aplica nos resumos os deltas das notas e atividades inseridas, alteradas ou removidas neste flush,
+    sem reagregar a tabela de notas.
+    Notas usam os valores antigos da atividade para retirar a contribuição antiga e os atuais para somar a nova.
+    Uma atividade com peso ou turma alterados (ou removida) move a contribuição das suas notas que não
+    foram tocadas neste flush; as tocadas já são tratadas individualmente.
+    """
+    notas_novas = [obj for obj in session.new if isinstance(obj, Notas)]
+    notas_removidas = [obj for obj in session.deleted if isinstance(obj, Notas)]
+    notas_alteradas = [
+        obj for obj in session.dirty
+        if isinstance(obj, Notas) and _alterado(obj, 'nota', 'id_aluno', 'id_atividade')
+    ]
+    atividades_alteradas = [
+        obj for obj in session.dirty
+        if isinstance(obj, Atividade) and _alterado(obj, 'peso_porcento', 'id_turma')
+    ]
+    atividades_removidas = [obj for obj in session.deleted if isinstance(obj, Atividade)]
+    if not (notas_novas or notas_removidas or notas_alteradas or atividades_alteradas or atividades_removidas):
+        return
+
+    conexao = session.connection()
+    antigas = {
+        int(obj.id): (_valor_antigo(obj, 'peso_porcento'), _valor_antigo(obj, 'id_turma'))
+        for obj in atividades_alteradas + atividades_removidas
+    }
+    ids_atividades = {obj.id_atividade for obj in notas_novas + notas_alteradas}
+    ids_atividades |= {_valor_antigo(obj, 'id_atividade') for obj in notas_removidas + notas_alteradas}
+    atuais = _atividades_atuais(conexao, ids_atividades | set(antigas))
+
+    deltas = {}
+    for obj in notas_novas:
+        _somar(deltas, obj.id_aluno, _atividade_da_nota(atuais, obj.id_atividade), obj.nota, 1)
+    for obj in notas_removidas + notas_alteradas:
+        _somar(deltas, _valor_antigo(obj, 'id_aluno'),
+               _atividade_antiga(antigas, atuais, _valor_antigo(obj, 'id_atividade')), _valor_antigo(obj, 'nota'), -1)
+    for obj in notas_alteradas:
+        _somar(deltas, obj.id_aluno, _atividade_da_nota(atuais, obj.id_atividade), obj.nota, 1)
+
+    tocadas = [obj.id for obj in notas_novas + notas_alteradas + notas_removidas if obj.id is not None]
+    for id_atividade, antiga in antigas.items():
+        consulta = select(Notas.id_aluno, Notas.nota).where(Notas.id_atividade == id_atividade)
+        if tocadas:
+            consulta = consulta.where(Notas.id.not_in(tocadas))
+        atual = atuais.get(id_atividade)
+        for id_aluno, nota in conexao.execute(consulta):
+            _somar(deltas, id_aluno, antiga, nota, -1)
+            _somar(deltas, id_aluno, atual, nota, 1)
+
+    aplicar_deltas(conexao, deltas)
+
+def registrar_notas_inseridas(linhas):
+    """
+    Soma nos resumos as notas inseridas com DML em massa (executemany), que não passam pelo flush
+    da sessão. Deve ser chamada na mesma transação da inserção.
+    """
+    conexao = db.session.connection()
+    atuais = _atividades_atuais(conexao, {linha['id_atividade'] for linha in linhas})
+    deltas = {}
+    for linha in linhas:
+        _somar(deltas, linha['id_aluno'], _atividade_da_nota(atuais, linha['id_atividade']), linha['nota'], 1)
+    aplicar_deltas(conexao, deltas)
+
+def reconstruir_resumos():
+    """Recalcula todos os resumos a partir de notas e atividades, em uma única transação. Retorna quantos foram gerados."""
+    db.session.execute(delete(ResumoNota))
+    db.session.execute(
+        insert(ResumoNota).from_select(
+            ['id_aluno', 'id_turma', 'soma_ponderada', 'soma_pesos', 'quantidade'],
+            select(
+                Notas.id_aluno, Atividade.id_turma,
+                func.sum(Notas.nota * Atividade.peso_porcento), func.sum(Atividade.peso_porcento), func.count()
+            )
+            .join(Atividade, Atividade.id == Notas.id_atividade)
+            .group_by(Notas.id_aluno, Atividade.id_turma)
+        )
+    )
+    db.session.commit()
+    return db.session.query(func.count()).select_from(ResumoNota).scalar()
+
+def registrar_resumos_iniciais():
+    """Gera os resumos das notas que já existem quando a tabela de resumos ainda está vazia."""
+    if db.session.query(ResumoNota.id_aluno).first() is not None:
+        return
+    if db.session.query(Notas.id).first() is None:
+        return
+    reconstruir_resumos()
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+class CacheReferencia:
+    """
+    Cache LRU com TTL para dados de referência vindos do gerenciamento (turmas, professores, alunos).
+    Cada item guarda o ETag recebido, para que um item vencido seja revalidado com If-None-Match
+    (um 304 custa só os cabeçalhos) em vez de baixar o registro de novo.
+    """
+
+    def __init__(self, ttl, tamanho_maximo):
+        self.ttl = ttl
+        self.tamanho_maximo = tamanho_maximo
+        self._itens = OrderedDict()  # chave -> [etag, expira_em]
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+        self.revalidacoes = 0
+        self.despejos = 0
+
+    def consultar(self, chave):
+        """
+        Retorna (fresco, etag) para a chave, ou None se ela não estiver no cache.
+        Conta acerto só quando o item ainda está dentro do TTL.
+        """
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.faltas += 1
+                return None
+            self._itens.move_to_end(chave)
+            fresco = item[1] > time.monotonic()
+            if fresco:
+                self.acertos += 1
+            else:
+                self.faltas += 1
+            return fresco, item[0]
+
+    def guardar(self, chave, etag=None):
+        with self._lock:
+            anterior = self._itens.get(chave)
+            if etag is None and anterior is not None:
+                etag = anterior[0]
+            self._itens[chave] = [etag, time.monotonic() + self.ttl]
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+                self.despejos += 1
+
+    def renovar(self, chave):
+        """Estende o TTL de um item revalidado pelo servidor (resposta 304)."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                item[1] = time.monotonic() + self.ttl
+                self.revalidacoes += 1
+
+    def remover(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.faltas
+            return {
+                'itens': len(self._itens),
+                'tamanho_maximo': self.tamanho_maximo,
+                'ttl_segundos': self.ttl,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'taxa_acerto': self.acertos / consultas if consultas else None,
+                'revalidacoes_304': self.revalidacoes,
+                'despejos': self.despejos,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def obter_cache():
+    """Retorna o cache do processo, criado na primeira chamada com REFERENCIA_CACHE_TTL e REFERENCIA_CACHE_TAMANHO."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheReferencia(
+                    current_app.config['REFERENCIA_CACHE_TTL'],
+                    current_app.config['REFERENCIA_CACHE_TAMANHO']
+                )
+    return _cache
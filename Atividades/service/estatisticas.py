@@ -0,0 +1,160 @@
+import threading
+from collections import OrderedDict
+from itertools import chain
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+from model.db import db
+from model.atividade import Atividade
+from model.notas import Notas
+
+def resumir(notas, nota_aprovacao, nota_maxima, faixas, percentis):
+    """
+    Estatísticas de um vetor de notas, todas calculadas de forma vetorizada pelo NumPy:
+    média, mediana, desvio padrão, extremos, percentis, histograma em `faixas` faixas iguais de 0 a
+    `nota_maxima` e taxa de aprovação (proporção com nota >= `nota_aprovacao`).
+    """
+    if notas.size == 0:
+        return {'quantidade': 0}
+    valores = np.percentile(notas, percentis)
+    contagens, bordas = np.histogram(np.clip(notas, 0, nota_maxima), bins=faixas, range=(0, nota_maxima))
+    return {
+        'quantidade': int(notas.size),
+        'media': round(float(notas.mean()), 2),
+        'mediana': round(float(np.median(notas)), 2),
+        'desvio_padrao': round(float(notas.std()), 2),
+        'minimo': round(float(notas.min()), 2),
+        'maximo': round(float(notas.max()), 2),
+        'percentis': {f'p{p:g}': round(float(v), 2) for p, v in zip(percentis, valores)},
+        'histograma': [
+            {'de': round(float(de), 2), 'ate': round(float(ate), 2), 'quantidade': int(quantidade)}
+            for de, ate, quantidade in zip(bordas[:-1], bordas[1:], contagens)
+        ],
+        'taxa_aprovacao': round(float(np.count_nonzero(notas >= nota_aprovacao) / notas.size), 4),
+    }
+
+def _carregar(consulta, colunas):
+    """
+    Executa a consulta e devolve o resultado como matriz float64 (uma linha por registro), em uma ida ao banco.
+    Roda pelo exec_driver_sql, na conexão (e transação) da sessão, com os parâmetros ligados (e passando pelos
+    eventos do engine: métricas e log de consultas lentas), mas as linhas são lidas direto do cursor do driver:
+    com 100 mil linhas, montar as Rows do SQLAlchemy custaria mais que todo o cálculo.
+    """
+    conexao = db.session.connection()
+    compilado = consulta.compile(conexao)
+    parametros = compilado.construct_params()
+    if compilado.positional:
+        parametros = tuple(parametros[nome] for nome in compilado.positiontup)
+    resultado = conexao.exec_driver_sql(str(compilado), parametros)
+    try:
+        linhas = resultado.cursor.fetchall()
+    finally:
+        resultado.close()
+    # fromiter sobre os valores achatados evita que o NumPy inspecione cada Row como sequência
+    valores = np.fromiter(chain.from_iterable(linhas), dtype=np.float64, count=len(linhas) * colunas)
+    return valores.reshape(len(linhas), colunas)
+
+def estatisticas_turma(id_turma, parametros):
+    """
+    Distribuição das notas de uma turma: de todas as notas, das médias ponderadas dos alunos e de cada atividade.
+    Todas as notas da turma são lidas com uma única consulta (join com atividades pelo índice de id_turma).
+    """
+    dados = _carregar(
+        select(Notas.id_aluno, Notas.id_atividade, Notas.nota, Atividade.peso_porcento)
+        .join(Atividade, Atividade.id == Notas.id_atividade)
+        .where(Atividade.id_turma == id_turma),
+        4
+    )
+    alunos, atividades, notas, pesos = dados.T
+
+    # Média ponderada de cada aluno: somas por aluno com bincount sobre o índice de np.unique
+    _, por_aluno = np.unique(alunos, return_inverse=True)
+    soma_ponderada = np.bincount(por_aluno, weights=notas * pesos)
+    soma_pesos = np.bincount(por_aluno, weights=pesos)
+    com_peso = soma_pesos > 0
+    medias = soma_ponderada[com_peso] / soma_pesos[com_peso]
+
+    # Notas agrupadas por atividade: ordena uma vez e fatia nos pontos em que a atividade muda
+    ordem = np.argsort(atividades, kind='stable')
+    ids_atividades, inicios = np.unique(atividades[ordem], return_index=True)
+    grupos = np.split(notas[ordem], inicios[1:])
+
+    return {
+        'id_turma': id_turma,
+        'notas': resumir(notas, **parametros),
+        'medias_alunos': resumir(medias, **parametros),
+        'atividades': [
+            {'id_atividade': int(id_atividade), **resumir(grupo, **parametros)}
+            for id_atividade, grupo in zip(ids_atividades, grupos)
+        ],
+    }
+
+def estatisticas_atividade(atividade, parametros):
+    """Distribuição das notas de uma atividade, lidas com uma única consulta pelo índice de id_atividade."""
+    dados = _carregar(select(Notas.nota).where(Notas.id_atividade == atividade.id), 1)
+    return {
+        'id_atividade': atividade.id,
+        'id_turma': atividade.id_turma,
+        **resumir(dados[:, 0], **parametros),
+    }
+
+# Tabelas que determinam os relatórios: as versões delas fazem parte da chave do cache e do ETag
+TABELAS = (Notas.__tablename__, Atividade.__tablename__)
+
+class CacheEstatisticas:
+    """
+    Cache LRU dos relatórios de estatísticas deste processo.
+    A chave de cada relatório inclui as versões das tabelas de notas e atividades (versoes_tabelas):
+    depois de qualquer commit que altere notas ou atividades, em qualquer processo, a chave muda e o
+    relatório é recalculado; os antigos saem pelo LRU.
+    """
+
+    def __init__(self, tamanho_maximo):
+        self.tamanho_maximo = tamanho_maximo
+        self._itens = OrderedDict()  # chave -> resultado
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, chave, calcular):
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.faltas += 1
+        resultado = calcular()
+        with self._lock:
+            self._itens[chave] = resultado
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+        return resultado
+
+    def invalidar(self):
+        """Descarta todos os relatórios guardados."""
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.faltas
+            return {
+                'itens': len(self._itens),
+                'tamanho_maximo': self.tamanho_maximo,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'taxa_acerto': self.acertos / consultas if consultas else None,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def obter_cache_estatisticas():
+    """Retorna o cache de estatísticas do processo, criado na primeira chamada com ESTATISTICAS_CACHE_TAMANHO."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheEstatisticas(current_app.config['ESTATISTICAS_CACHE_TAMANHO'])
+    return _cache
@@ -0,0 +1,112 @@
+import os
+from functools import partial
+from service.cache_referencia import obter_cache
+from service.http_client import obter_cliente
+from service.paralelo import executar_ate_falhar
+from service.sincronizacao import replica_disponivel, ids_replicados
+
+# Endereço do serviço de gerenciamento (alunos, professores e turmas)
+URL_GERENCIAMENTO = os.environ.get('URL_GERENCIAMENTO', 'http://api_gerenciamento:5000')
+
+# Nome da tabela no POST /existem -> nome do recurso no endpoint por ID
+RECURSOS = {
+    'alunos': 'aluno',
+    'turmas': 'turma',
+    'professores': 'professor',
+}
+TABELAS = {recurso: tabela for tabela, recurso in RECURSOS.items()}
+
+def _como_int(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+def _revalidar(cliente, cache, recurso, id, etag=None):
+    """
+    Consulta o registro com HEAD no endpoint por ID, condicional ao ETag quando ele é conhecido.
+    Atualiza o cache e retorna True se o registro existe.
+    """
+    chave = (recurso, str(id))
+    headers = {'If-None-Match': etag} if etag else {}
+    response = cliente.head(f'{URL_GERENCIAMENTO}/{recurso}/{id}', headers=headers)
+    if response.status_code == 304:
+        cache.renovar(chave)
+        return True
+    if response.status_code == 404:
+        cache.remover(chave)
+        return False
+    response.raise_for_status()
+    cache.guardar(chave, response.headers.get('ETag'))
+    return True
+
+def _consultar_lote(cliente, cache, corpo):
+    """Consulta vários ids com POST /existem, guarda os existentes no cache e retorna os inexistentes por tabela."""
+    response = cliente.post(f'{URL_GERENCIAMENTO}/existem', json=corpo)
+    response.raise_for_status()
+    resultado = response.json()
+    for tabela, existentes in resultado['existentes'].items():
+        for valor in existentes:
+            cache.guardar((RECURSOS[tabela], str(valor)))
+    return resultado['inexistentes']
+
+def existe(recurso, id):
+    """
+    Verifica se um registro existe no serviço de gerenciamento.
+    Consulta primeiro a réplica local mantida pelo feed /changes. Se o id não estiver lá (ou a réplica ainda
+    não foi sincronizada), usa HEAD no endpoint por ID (ex: /turma/<id>), então o custo não cresce com o
+    tamanho da tabela.
+    Registros encontrados ficam no cache de referência; depois do TTL são revalidados com If-None-Match.
+    Registros inexistentes não são guardados, para que um cadastro novo seja visto na hora.
+    Retorna False se o registro não existir e levanta RequestException nas demais falhas.
+    """
+    if replica_disponivel() and ids_replicados(TABELAS[recurso], [id]):
+        return True
+    cache = obter_cache()
+    item = cache.consultar((recurso, str(id)))
+    if item is not None and item[0]:
+        return True
+    return _revalidar(obter_cliente(), cache, recurso, id, item[1] if item else None)
+
+def inexistentes(**ids):
+    """
+    Valida várias referências de uma vez no serviço de gerenciamento.
+    Recebe listas de ids por tabela (alunos=, turmas=, professores=) e retorna, para cada tabela,
+    a lista de ids que não existem.
+    Ids presentes na réplica local são aceitos sem chamada nenhuma. Dos restantes, ids frescos no cache
+    também não geram chamada; ids vencidos com ETag são revalidados com HEAD condicional e os desconhecidos
+    vão juntos em um único POST /existem. Essas chamadas rodam em paralelo e, assim que uma delas encontra
+    um id inexistente, as restantes são abandonadas.
+    """
+    cache = obter_cache()
+    cliente = obter_cliente()
+    tarefas = []
+    corpo = {}
+
+    def revalidacao(tabela, valor, etag):
+        existe = _revalidar(cliente, cache, RECURSOS[tabela], valor, etag)
+        return {} if existe else {tabela: [valor]}
+
+    usar_replica = replica_disponivel()
+    for tabela, valores in ids.items():
+        replicados = ids_replicados(tabela, valores) if usar_replica else set()
+        for valor in valores:
+            if _como_int(valor) in replicados:
+                continue
+            item = cache.consultar((RECURSOS[tabela], str(valor)))
+            if item is not None and item[0]:
+                continue
+            if item is not None and item[1]:
+                tarefas.append(partial(revalidacao, tabela, valor, item[1]))
+            else:
+                corpo.setdefault(tabela, []).append(valor)
+    if corpo:
+        tarefas.append(partial(_consultar_lote, cliente, cache, corpo))
+    if not tarefas:
+        return {}
+
+    faltando = {}
+    for resultado in executar_ate_falhar(tarefas, falhou=lambda r: any(r.values())):
+        for tabela, valores in resultado.items():
+            faltando.setdefault(tabela, []).extend(valores)
+    return faltando
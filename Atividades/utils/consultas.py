@@ -0,0 +1,110 @@
+import time
+from flask import g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from model.db import db
+
+EXPLICAVEIS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+PARAMETROS_TAMANHO_MAXIMO = 1000  # caracteres dos parâmetros mostrados no log
+
+_configuracao = None  # (limite em segundos ou None, EXPLAIN ligado, dialeto, logger), definida por configurar_consultas
+
+def _plano(conexao_dbapi, dialeto, sql, parametros):
+    """Plano da consulta (EXPLAIN QUERY PLAN no SQLite, EXPLAIN nos demais), rodado em um cursor à parte da mesma conexão."""
+    explain = ('EXPLAIN QUERY PLAN ' if dialeto == 'sqlite' else 'EXPLAIN ') + sql
+    # Fora do SQLite, um EXPLAIN com erro invalidaria a transação da sessão: ele roda em um savepoint
+    savepoint = dialeto != 'sqlite'
+    cursor = conexao_dbapi.cursor()
+    try:
+        if savepoint:
+            cursor.execute('SAVEPOINT plano_consulta')
+        try:
+            if parametros:
+                cursor.execute(explain, parametros)
+            else:
+                cursor.execute(explain)
+            linhas = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute('ROLLBACK TO SAVEPOINT plano_consulta')
+            raise
+        if savepoint:
+            cursor.execute('RELEASE SAVEPOINT plano_consulta')
+    finally:
+        cursor.close()
+    if dialeto != 'sqlite':
+        return '\n'.join(linha[0] for linha in linhas)
+    # Linhas (id, pai, -, detalhe) do SQLite: o recuo mostra a árvore do plano
+    niveis, plano = {}, []
+    for id_no, pai, _, detalhe in linhas:
+        niveis[id_no] = niveis.get(pai, -1) + 1
+        plano.append('  ' * niveis[id_no] + detalhe)
+    return '\n'.join(plano)
+
+def registrar_consulta(conexao_dbapi, sql, parametros, duracao, executemany=False):
+    """
+    Conta a consulta na requisição atual (X-Query-Count / X-DB-Time) e, se passou de CONSULTA_LENTA_MS,
+    registra no log com os parâmetros e o plano. Chamada pelos eventos do engine.
+    """
+    if _configuracao is None:
+        return
+    if has_app_context() and 'consultas' in g:
+        g.consultas += 1
+        g.tempo_banco += duracao
+    limite, explain, dialeto, logger = _configuracao
+    if limite is None or duracao < limite:
+        return
+    if executemany:
+        parametros = parametros[0] if parametros else None
+    plano = ''
+    if explain and sql.lstrip()[:6].upper().startswith(EXPLICAVEIS):
+        try:
+            texto = _plano(conexao_dbapi, dialeto, sql, parametros)
+            # O SQLite não tem plano para um INSERT ... VALUES
+            plano = '\nPlano:\n' + texto if texto else ''
+        except Exception as erro:
+            plano = f'\nPlano indisponível: {erro}'
+    origem = f'{request.method} {request.path}' if has_request_context() else 'fora de requisição'
+    logger.warning('Consulta lenta (%.1f ms) em %s:\n%s\nParâmetros: %s%s', duracao * 1000, origem, sql,
+                   repr(parametros)[:PARAMETROS_TAMANHO_MAXIMO], plano)
+
+def configurar_consultas(app):
+    """
+    Mede cada consulta do app pelos eventos do engine: as que passam de CONSULTA_LENTA_MS vão para o log
+    com parâmetros e plano, e, com CONSULTAS_CABECALHOS (padrão em modo debug), as respostas trazem
+    X-Query-Count e X-DB-Time (ms) da requisição. Retorna False sem fazer nada se os dois estiverem desligados.
+    """
+    global _configuracao
+    limite_ms = app.config['CONSULTA_LENTA_MS']
+    cabecalhos = app.config['CONSULTAS_CABECALHOS']
+    if not limite_ms and not cabecalhos:
+        return False
+    with app.app_context():
+        engine = db.engine
+    _configuracao = (limite_ms / 1000 if limite_ms else None, app.config['CONSULTA_LENTA_EXPLAIN'],
+                     engine.dialect.name, app.logger)
+
+    # O início fica no contexto da execução, descartado junto com ele se a consulta falhar
+    @event.listens_for(engine, 'before_cursor_execute')
+    def iniciar_consulta(conexao, cursor, sql, parametros, contexto, executemany):
+        contexto._inicio_consultas = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def finalizar_consulta(conexao, cursor, sql, parametros, contexto, executemany):
+        duracao = time.perf_counter() - contexto._inicio_consultas
+        registrar_consulta(conexao.connection, sql, parametros, duracao, executemany)
+
+    @app.before_request
+    def zerar_contagem():
+        g.consultas = 0
+        g.tempo_banco = 0.0
+
+    if cabecalhos:
+        @app.after_request
+        def informar_contagem(resposta):
+            # Nas respostas em streaming as consultas continuam depois do envio dos cabeçalhos: sem os
+            # cabeçalhos, em vez de uma contagem parcial
+            if 'consultas' in g and not resposta.is_streamed:
+                resposta.headers['X-Query-Count'] = str(g.consultas)
+                resposta.headers['X-DB-Time'] = f'{g.tempo_banco * 1000:.2f}'
+            return resposta
+    return True
@@ -0,0 +1,111 @@
+from datetime import date
+from flask import request, jsonify, current_app
+
+class LoteInvalido(ValueError):
+    """O corpo do lote como um todo é inválido (não é uma lista, está vazio ou é grande demais); vira 400."""
+
+class ItemInvalido(ValueError):
+    """Um item do lote é inválido; só ele é rejeitado."""
+
+def itens_do_corpo():
+    """Lê os itens do lote: uma lista JSON de objetos, ou um objeto {"itens": [...]}."""
+    dados = request.get_json(silent=True)
+    if isinstance(dados, dict):
+        dados = dados.get('itens')
+    if not isinstance(dados, list) or not dados:
+        raise LoteInvalido('O corpo deve ser uma lista JSON não vazia de itens.')
+    maximo = current_app.config['LOTE_MAXIMO_ITENS']
+    if len(dados) > maximo:
+        raise LoteInvalido(f'O lote aceita no máximo {maximo} itens; foram enviados {len(dados)}.')
+    return dados
+
+def _campo(item, campo, obrigatorio):
+    if not isinstance(item, dict):
+        raise ItemInvalido('O item deve ser um objeto JSON.')
+    valor = item.get(campo)
+    if valor is None and obrigatorio:
+        raise ItemInvalido(f"O campo '{campo}' é obrigatório.")
+    return valor
+
+def inteiro(item, campo, obrigatorio=True):
+    valor = _campo(item, campo, obrigatorio)
+    if valor is None:
+        return None
+    if isinstance(valor, bool):
+        raise ItemInvalido(f"O campo '{campo}' deve ser um número inteiro.")
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ItemInvalido(f"O campo '{campo}' deve ser um número inteiro.")
+
+def numero(item, campo, obrigatorio=True):
+    valor = _campo(item, campo, obrigatorio)
+    if valor is None:
+        return None
+    if isinstance(valor, bool):
+        raise ItemInvalido(f"O campo '{campo}' deve ser numérico.")
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        raise ItemInvalido(f"O campo '{campo}' deve ser numérico.")
+
+def texto(item, campo, obrigatorio=True):
+    valor = _campo(item, campo, obrigatorio)
+    if valor is None:
+        return None
+    if not isinstance(valor, str) or (obrigatorio and not valor.strip()):
+        raise ItemInvalido(f"O campo '{campo}' deve ser um texto não vazio.")
+    return valor
+
+def booleano(item, campo, obrigatorio=True):
+    valor = _campo(item, campo, obrigatorio)
+    if valor is None or isinstance(valor, bool):
+        return valor
+    if isinstance(valor, str) and valor.lower() in ('1', '0', 'true', 'false', 'sim', 'nao', 'não'):
+        return valor.lower() in ('1', 'true', 'sim')
+    if valor in (0, 1):
+        return bool(valor)
+    raise ItemInvalido(f"O campo '{campo}' deve ser verdadeiro ou falso.")
+
+def data(item, campo, obrigatorio=True):
+    valor = _campo(item, campo, obrigatorio)
+    if valor is None:
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except (TypeError, ValueError):
+        raise ItemInvalido(f"O campo '{campo}' deve ser uma data no formato AAAA-MM-DD.")
+
+def converter_itens(itens, converter):
+    """
+    Aplica `converter` (item -> dict de colunas) em cada item.
+    Retorna ({indice: linha} dos válidos, {indice: (status, erro)} dos rejeitados).
+    """
+    linhas = {}
+    erros = {}
+    for indice, item in enumerate(itens):
+        try:
+            linhas[indice] = converter(item)
+        except ItemInvalido as e:
+            erros[indice] = (400, str(e))
+    return linhas, erros
+
+def rejeitar_referencias(linhas, erros, campo, inexistentes, mensagem):
+    """Move para `erros` (404) as linhas cujo `campo` está em `inexistentes`; `mensagem` recebe o id."""
+    for indice in [i for i, linha in linhas.items() if linha[campo] in inexistentes]:
+        erros[indice] = (404, mensagem.format(linhas.pop(indice)[campo]))
+
+def responder_lote(total, criados, erros):
+    """
+    Monta a resposta com o resultado de cada item, na ordem do corpo.
+    201 se todos foram criados, 207 se só parte deles e 400 se nenhum.
+    """
+    resultados = []
+    for indice in range(total):
+        if indice in criados:
+            resultados.append({'indice': indice, 'status': 201, 'id': criados[indice]})
+        else:
+            status, erro = erros[indice]
+            resultados.append({'indice': indice, 'status': status, 'erro': erro})
+    status = 201 if not erros else 207 if criados else 400
+    return jsonify({'criados': len(criados), 'falhas': len(erros), 'resultados': resultados}), status
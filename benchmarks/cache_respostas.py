@@ -0,0 +1,99 @@
+"""
+Latência das listagens e buscas do gerenciamento com e sem o cache de respostas.
+
+Cria um banco SQLite temporário com `--turmas` turmas de `--alunos` alunos cada e mede, pelo test client do
+Flask, `--repeticoes` requisições de cada URL com CACHE_RESPOSTAS_ATIVO desligado e ligado (com a resposta
+já em cache). No fim, roda uma carga mista de leituras com uma escrita a cada `--escrita-cada` leituras e
+mostra as estatísticas do cache (/diagnostico/cache_respostas).
+
+Uso:
+    python benchmarks/cache_respostas.py [--turmas 50] [--alunos 400] [--repeticoes 50] [--escrita-cada 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'gerenciamento'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--turmas', type=int, default=50)
+    parser.add_argument('--alunos', type=int, default=400)
+    parser.add_argument('--repeticoes', type=int, default=50)
+    parser.add_argument('--escrita-cada', type=int, default=20)
+    args = parser.parse_args()
+
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_cache_'), 'bench.db')}"
+    config.Config.DEBUG = False
+    config.Config.TAREFAS_NA_IMPORTACAO = False
+    from app import app
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from datetime import date
+    from sqlalchemy import insert
+
+    with app.app_context():
+        db.session.execute(insert(Professor), [
+            {'id': i, 'nome': f'Professor {i}', 'idade': 40, 'materia': 'Matemática'} for i in range(1, args.turmas + 1)
+        ])
+        db.session.execute(insert(Turma), [
+            {'id': i, 'descricao': f'Turma {i}', 'professor_id': i, 'ativo': True} for i in range(1, args.turmas + 1)
+        ])
+        db.session.execute(insert(Aluno), [
+            {'nome': f'Aluno {t}-{a}', 'idade': 15, 'turma_id': t, 'data_nascimento': date(2010, 1, 1)}
+            for t in range(1, args.turmas + 1) for a in range(args.alunos)
+        ])
+        db.session.commit()
+
+    cliente = app.test_client()
+    urls = [
+        '/lista_aluno?limit=1000',
+        '/lista_turmas?include=alunos,professor&limit=10',
+        '/turma/1/detalhes',
+        '/aluno/1',
+    ]
+
+    def medir(url):
+        tempos = []
+        for _ in range(args.repeticoes):
+            inicio = time.perf_counter()
+            assert cliente.get(url).status_code == 200
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tempos)
+
+    linhas = []
+    for url in urls:
+        app.config['CACHE_RESPOSTAS_ATIVO'] = False
+        sem_cache = medir(url)
+        app.config['CACHE_RESPOSTAS_ATIVO'] = True
+        cliente.get(url)
+        linhas.append((url, sem_cache, medir(url)))
+
+    print(f"\n{'url':<50}{'sem cache p50 (ms)':>20}{'em cache p50 (ms)':>19}")
+    for url, sem_cache, em_cache in linhas:
+        print(f'{url:<50}{sem_cache:>20.2f}{em_cache:>19.2f}')
+
+    # Carga mista: leituras aleatórias entre as URLs e uma atualização de aluno a cada `--escrita-cada` leituras
+    sorteio = random.Random(42)
+    corpo = {'nome': 'Atualizado', 'idade': 16, 'turma_id': 1, 'data_nascimento': '2010-01-01',
+             'nota_primeiro_semestre': 7, 'nota_segundo_semestre': 8, 'media_final': 7.5}
+    inicio = time.perf_counter()
+    for i in range(1, args.repeticoes * 20 + 1):
+        if i % args.escrita_cada == 0:
+            assert cliente.put(f'/atualiza_aluno/{sorteio.randint(1, args.turmas * args.alunos)}', json=corpo).status_code == 200
+        else:
+            assert cliente.get(sorteio.choice(urls + ['/lista_professor', '/lista_turmas'])).status_code == 200
+    duracao = time.perf_counter() - inicio
+    print(f'\nCarga mista ({args.repeticoes * 20} requisições, 1 escrita a cada {args.escrita_cada}): {duracao:.1f} s')
+    print(cliente.get('/diagnostico/cache_respostas').get_json())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Carga em /lista_aluno no servidor de desenvolvimento e no modo de produção (gunicorn).
+
+Copia o serviço de gerenciamento (com o banco em instance/) para um diretório temporário, sobe o
+servidor em cada modo e dispara `--clientes` processos clientes com keep-alive por `--segundos` segundos:
+  - dev: `python app.py` (app.run com debug=True, reloader e debugger);
+  - gunicorn: `gunicorn -c gunicorn.conf.py app:app` com `--workers` workers e `--threads` threads.
+Mostra requisições por segundo e latências.
+
+Uso:
+    python benchmarks/carga_lista_aluno.py [--segundos 10] [--clientes 8] [--workers 4] [--threads 4]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URL = 'http://127.0.0.1:5000/lista_aluno'
+
+def cliente(fim, fila):
+    sessao = requests.Session()
+    tempos, erros = [], 0
+    while time.time() < fim:
+        inicio = time.perf_counter()
+        try:
+            ok = sessao.get(URL, timeout=10).status_code == 200
+        except requests.RequestException:
+            ok = False
+        if ok:
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        else:
+            erros += 1
+    fila.put((tempos, erros))
+
+def aguardar_servidor(processo):
+    for _ in range(300):
+        if processo.poll() is not None:
+            raise RuntimeError('O servidor terminou antes de responder')
+        try:
+            requests.get(URL, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError('O servidor não respondeu')
+
+def medir(comando, diretorio, ambiente, args):
+    processo = subprocess.Popen(comando, cwd=diretorio, env=ambiente, start_new_session=True,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        aguardar_servidor(processo)
+        fila = multiprocessing.Queue()
+        fim = time.time() + args.segundos
+        clientes = [multiprocessing.Process(target=cliente, args=(fim, fila)) for _ in range(args.clientes)]
+        for c in clientes:
+            c.start()
+        resultados = [fila.get() for _ in clientes]
+        for c in clientes:
+            c.join()
+    finally:
+        # O reloader do modo dev cria um processo filho: encerra o grupo inteiro
+        os.killpg(processo.pid, signal.SIGTERM)
+        processo.wait()
+    tempos = [t for r in resultados for t in r[0]]
+    erros = sum(r[1] for r in resultados)
+    return len(tempos) / args.segundos, statistics.median(tempos), statistics.quantiles(tempos, n=100)[98], erros
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--segundos', type=float, default=10)
+    parser.add_argument('--clientes', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    diretorio = os.path.join(tempfile.mkdtemp(prefix='bench_carga_'), 'gerenciamento')
+    shutil.copytree(os.path.join(RAIZ, 'gerenciamento'), diretorio,
+                    ignore=shutil.ignore_patterns('__pycache__', '*.db-wal', '*.db-shm'))
+    ambiente = dict(os.environ,
+                    GUNICORN_WORKERS=str(args.workers), GUNICORN_THREADS=str(args.threads),
+                    GUNICORN_BIND='127.0.0.1:5000', GUNICORN_LOGLEVEL='warning')
+
+    modos = [
+        ('dev (app.run, debug=True)', [sys.executable, 'app.py']),
+        (f'gunicorn ({args.workers} workers x {args.threads} threads)',
+         [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app']),
+    ]
+    linhas = []
+    for nome, comando in modos:
+        print(f'Medindo {nome} por {args.segundos:g} s com {args.clientes} clientes...')
+        linhas.append((nome, *medir(comando, diretorio, ambiente, args)))
+
+    print(f"\n{'modo':<40}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'erros':>7}")
+    for nome, vazao, p50, p99, erros in linhas:
+        print(f'{nome:<40}{vazao:>10.0f}{p50:>10.1f}{p99:>10.1f}{erros:>7}')
+
+if __name__ == '__main__':
+    main()
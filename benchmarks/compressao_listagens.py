@@ -0,0 +1,126 @@
+"""
+Bytes e latência das listagens grandes sem compressão, com gzip e com brotli.
+
+Para cada serviço, sobe o app em um processo próprio com um banco SQLite temporário:
+  - gerenciamento: `--alunos` alunos, mede /lista_aluno?todos=1 e /lista_aluno?stream=1;
+  - Atividades: `--notas` notas, mede /listar_notas?todos=1 e /listar_notas?stream=1.
+Cada URL é pedida `--repeticoes` vezes pelo test client do Flask com Accept-Encoding identity, gzip e br.
+Mostra os bytes enviados, a latência no servidor (p50) e o tempo estimado de transferência em um link
+de `--banda` Mbit/s.
+
+Uso:
+    python benchmarks/compressao_listagens.py [--alunos 50000] [--notas 200000] [--repeticoes 5] [--banda 100]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODIFICACOES = ('identity', 'gzip', 'br')
+
+def preparar_gerenciamento(args):
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from datetime import date
+    from sqlalchemy import insert
+
+    db.session.add(Professor(id=1, nome='Professor', idade=40, materia='Matemática'))
+    db.session.add(Turma(id=1, descricao='Turma 1', professor_id=1, ativo=True))
+    db.session.flush()
+    db.session.execute(insert(Aluno), [
+        {'nome': f'Aluno {i}', 'idade': 15, 'turma_id': 1, 'data_nascimento': date(2010, 1, 1),
+         'nota_primeiro_semestre': 7.5, 'nota_segundo_semestre': 8.0, 'media_final': 7.75}
+        for i in range(args.alunos)
+    ])
+    db.session.commit()
+    return ['/lista_aluno?todos=1', '/lista_aluno?stream=1']
+
+def preparar_atividades(args):
+    from model.db import db
+    from model.atividade import Atividade
+    from model.notas import Notas
+    from datetime import date
+    from sqlalchemy import insert
+
+    aleatorio = random.Random(42)
+    db.session.execute(insert(Atividade), [
+        {'nome_atividade': f'Atividade {i}', 'descricao': '-', 'peso_porcento': 10,
+         'data_entrega': date(2025, 1, 1), 'id_turma': i % 20 + 1, 'id_professor': 1}
+        for i in range(200)
+    ])
+    db.session.execute(insert(Notas), [
+        {'nota': round(aleatorio.uniform(0, 10), 1), 'id_aluno': aleatorio.randint(1, 5000),
+         'id_atividade': aleatorio.randint(1, 200)}
+        for _ in range(args.notas)
+    ])
+    db.session.commit()
+    return ['/listar_notas?todos=1', '/listar_notas?stream=1']
+
+def rodar_servico(args):
+    """Executado no processo filho: mede as listagens de um serviço e imprime o resultado em JSON."""
+    sys.path.insert(0, os.path.join(RAIZ, args.servico))
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_compressao_'), 'bench.db')}"
+    config.Config.SINCRONIZACAO_INTERVALO = 0
+    config.Config.TAREFAS_NA_IMPORTACAO = False
+    config.Config.DEBUG = False
+    from app import app
+
+    with app.app_context():
+        urls = (preparar_gerenciamento if args.servico == 'gerenciamento' else preparar_atividades)(args)
+
+    cliente = app.test_client()
+    resultados = []
+    for url in urls:
+        for codificacao in CODIFICACOES:
+            tempos, tamanho = [], 0
+            for _ in range(args.repeticoes):
+                inicio = time.perf_counter()
+                resposta = cliente.get(url, headers={'Accept-Encoding': codificacao})
+                tamanho = len(resposta.data)
+                tempos.append((time.perf_counter() - inicio) * 1000)
+                assert resposta.status_code == 200
+                assert resposta.headers.get('Content-Encoding', 'identity') == codificacao
+            resultados.append({'url': url, 'codificacao': codificacao, 'bytes': tamanho, 'p50': statistics.median(tempos)})
+    print(json.dumps(resultados))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alunos', type=int, default=50_000)
+    parser.add_argument('--notas', type=int, default=200_000)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--banda', type=float, default=100, help='Mbit/s do link usado na estimativa de transferência')
+    parser.add_argument('--servico', choices=('gerenciamento', 'Atividades'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.servico:
+        rodar_servico(args)
+        return
+
+    linhas = []
+    for servico in ('gerenciamento', 'Atividades'):
+        print(f'Medindo {servico}...')
+        saida = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--servico', servico] +
+            [f'--{opcao}={getattr(args, opcao)}' for opcao in ('alunos', 'notas', 'repeticoes')],
+            cwd=os.path.join(RAIZ, servico), capture_output=True, text=True, check=True
+        ).stdout
+        linhas += json.loads(saida.strip().splitlines()[-1])
+
+    print(f"\n{'url':<26}{'codificação':<13}{'bytes':>12}{'razão':>8}{'servidor p50 (ms)':>19}"
+          f"{f'rede a {args.banda:g} Mbit/s (ms)':>26}{'total (ms)':>12}")
+    for linha in linhas:
+        original = next(l['bytes'] for l in linhas if l['url'] == linha['url'] and l['codificacao'] == 'identity')
+        rede = linha['bytes'] * 8 / (args.banda * 1e6) * 1000
+        print(f"{linha['url']:<26}{linha['codificacao']:<13}{linha['bytes']:>12}{original / linha['bytes']:>8.1f}"
+              f"{linha['p50']:>19.1f}{rede:>26.1f}{linha['p50'] + rede:>12.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Conta as consultas SQL de /lista_turmas?include=alunos,professor e /turma/<id>/detalhes.
+
+Para cada quantidade de turmas em `--turmas` (cada uma com `--alunos` alunos e um professor próprio),
+cria um banco SQLite temporário e conta, pelo test client do Flask, as consultas emitidas por:
+  - antes: listar as turmas e acessar turma.alunos e turma.professor de cada uma (carregamento preguiçoso);
+  - /lista_turmas?include=alunos,professor (uma página com todas as turmas);
+  - /turma/<id>/detalhes.
+Termina com código 1 se o número de consultas dos endpoints mudar com a quantidade de turmas.
+
+Uso:
+    python benchmarks/consultas_turmas.py [--turmas 10 100 400] [--alunos 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'gerenciamento'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--turmas', type=int, nargs='+', default=[10, 100, 400])
+    parser.add_argument('--alunos', type=int, default=20)
+    args = parser.parse_args()
+    if max(args.turmas) > 500:
+        parser.error('Use no máximo 500 turmas: acima disso o selectinload divide o IN em mais consultas.')
+
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_turmas_'), 'bench.db')}"
+    config.Config.DEBUG = False
+    config.Config.TAREFAS_NA_IMPORTACAO = False
+    from app import app
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from datetime import date
+    from sqlalchemy import event, insert, delete
+
+    with app.app_context():
+        engine = db.engine
+    consultas = [0]
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def contar(conexao, cursor, sql, parametros, contexto, executemany):
+        consultas[0] += 1
+
+    def medir(funcao):
+        consultas[0] = 0
+        inicio = time.perf_counter()
+        funcao()
+        return consultas[0], (time.perf_counter() - inicio) * 1000
+
+    cliente = app.test_client()
+    linhas = []
+    for quantidade in args.turmas:
+        with app.app_context():
+            for modelo in (Aluno, Turma, Professor):
+                db.session.execute(delete(modelo))
+            db.session.execute(insert(Professor), [
+                {'id': i, 'nome': f'Professor {i}', 'idade': 40, 'materia': 'Matemática'} for i in range(1, quantidade + 1)
+            ])
+            db.session.execute(insert(Turma), [
+                {'id': i, 'descricao': f'Turma {i}', 'professor_id': i, 'ativo': True} for i in range(1, quantidade + 1)
+            ])
+            db.session.execute(insert(Aluno), [
+                {'nome': f'Aluno {t}-{a}', 'idade': 15, 'turma_id': t, 'data_nascimento': date(2010, 1, 1)}
+                for t in range(1, quantidade + 1) for a in range(args.alunos)
+            ])
+            db.session.commit()
+
+        def preguicoso():
+            with app.app_context():
+                for turma in Turma.query.order_by(Turma.id).all():
+                    len(turma.alunos), turma.professor.nome
+                db.session.remove()
+
+        def lista():
+            resposta = cliente.get(f'/lista_turmas?include=alunos,professor&limit={quantidade}')
+            assert resposta.status_code == 200 and len(resposta.get_json()) == quantidade
+
+        def detalhes():
+            assert cliente.get(f'/turma/{quantidade}/detalhes').status_code == 200
+
+        linhas.append((quantidade, medir(preguicoso), medir(lista), medir(detalhes)))
+
+    print(f"\n{'turmas':>7}{'antes: consultas':>18}{'ms':>8}{'include: consultas':>20}{'ms':>8}{'detalhes: consultas':>21}{'ms':>8}")
+    for quantidade, (c1, t1), (c2, t2), (c3, t3) in linhas:
+        print(f'{quantidade:>7}{c1:>18}{t1:>8.1f}{c2:>20}{t2:>8.1f}{c3:>21}{t3:>8.1f}')
+
+    fixas = len({linha[2][0] for linha in linhas}) == 1 and len({linha[3][0] for linha in linhas}) == 1
+    print('\nOK: número de consultas fixo.' if fixas else '\nFALHA: o número de consultas cresce com as turmas.')
+    sys.exit(0 if fixas else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Consultas ao banco por requisição (X-Query-Count / X-DB-Time) nas leituras do gerenciamento.
+
+Cria dois bancos SQLite temporários, um com `--turmas` turmas de `--alunos` alunos cada e outro com o dobro
+de turmas, e faz cada requisição nos dois com o cache de respostas desligado. Uma contagem que cresce com o
+volume de dados indica consultas N+1; o script termina com erro se isso acontecer ou se alguma URL passar
+de `--orcamento` consultas.
+
+Uso:
+    python benchmarks/contagem_consultas.py [--turmas 20] [--alunos 30] [--orcamento 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'gerenciamento'))
+
+URLS = [
+    '/lista_aluno?limit=1000',
+    '/lista_aluno?todos=1',
+    '/aluno/1',
+    '/lista_professor',
+    '/lista_turmas',
+    '/lista_turmas?include=alunos,professor',
+    '/turma/1',
+    '/turma/1/detalhes',
+]
+
+def contar(turmas, alunos):
+    """Roda no processo filho: retorna {url: (consultas, ms no banco)}."""
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_consultas_'), 'bench.db')}"
+    config.Config.DEBUG = False
+    config.Config.TAREFAS_NA_IMPORTACAO = False
+    config.Config.CACHE_RESPOSTAS_ATIVO = False
+    config.Config.CONSULTAS_CABECALHOS = True
+    config.Config.CONSULTA_LENTA_MS = 0
+    from app import app
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from datetime import date
+    from sqlalchemy import insert
+
+    with app.app_context():
+        db.session.execute(insert(Professor), [
+            {'id': i, 'nome': f'Professor {i}', 'idade': 40, 'materia': 'Matemática'} for i in range(1, turmas + 1)
+        ])
+        db.session.execute(insert(Turma), [
+            {'id': i, 'descricao': f'Turma {i}', 'professor_id': i, 'ativo': True} for i in range(1, turmas + 1)
+        ])
+        db.session.execute(insert(Aluno), [
+            {'nome': f'Aluno {t}-{a}', 'idade': 15, 'turma_id': t, 'data_nascimento': date(2010, 1, 1)}
+            for t in range(1, turmas + 1) for a in range(alunos)
+        ])
+        db.session.commit()
+
+    cliente = app.test_client()
+    resultado = {}
+    for url in URLS:
+        resposta = cliente.get(url)
+        assert resposta.status_code == 200, f'{url}: {resposta.status_code}'
+        resultado[url] = (int(resposta.headers['X-Query-Count']), float(resposta.headers['X-DB-Time']))
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--turmas', type=int, default=20)
+    parser.add_argument('--alunos', type=int, default=30)
+    parser.add_argument('--orcamento', type=int, default=5)
+    parser.add_argument('--filho', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho is not None:
+        print(json.dumps(contar(args.filho, args.alunos)))
+        return
+
+    # Cada volume em um processo próprio, já que o banco é escolhido ao importar o app
+    volumes = [args.turmas, args.turmas * 2]
+    resultados = []
+    for turmas in volumes:
+        saida = subprocess.run([sys.executable, __file__, '--filho', str(turmas), '--alunos', str(args.alunos)],
+                               capture_output=True, text=True, check=True).stdout
+        resultados.append(json.loads(saida.strip().splitlines()[-1]))
+
+    problemas = []
+    print(f"\n{'url':<42}{f'{volumes[0]} turmas':>14}{f'{volumes[1]} turmas':>14}{'ms no banco':>13}")
+    for url in URLS:
+        (menor, _), (maior, tempo) = resultados[0][url], resultados[1][url]
+        print(f'{url:<42}{menor:>14}{maior:>14}{tempo:>13.2f}')
+        if maior > menor:
+            problemas.append(f'{url}: consultas crescem com os dados ({menor} -> {maior}), possível N+1')
+        if maior > args.orcamento:
+            problemas.append(f'{url}: {maior} consultas, acima do orçamento de {args.orcamento}')
+    if problemas:
+        print('\n' + '\n'.join(problemas))
+        sys.exit(1)
+    print(f'\nNenhuma URL passou de {args.orcamento} consultas nem cresceu com o volume de dados.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark de /disponibilidade com anos de histórico de reservas.
+
+Cria um banco SQLite temporário com `--anos` anos de reservas para `--salas` salas (cada sala ocupada
+em ~`--ocupacao` dos dias) e mede, pelo test client do Flask:
+  - antes: baixar /lista_reserva?todos=1 e calcular as salas livres no cliente;
+  - /disponibilidade para um dia, uma semana e um mês.
+Mostra também o plano de execução das consultas, para conferir que elas usam os índices.
+
+Uso:
+    python benchmarks/disponibilidade_reservas.py [--anos 5] [--salas 200] [--repeticoes 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'reservas'))
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), max(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--anos', type=int, default=5)
+    parser.add_argument('--salas', type=int, default=200)
+    parser.add_argument('--ocupacao', type=float, default=0.7)
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix='bench_disponibilidade_')
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(diretorio, 'bench.db')}"
+    config.Config.SINCRONIZACAO_INTERVALO = 0
+    config.Config.DEBUG = False
+    from app import app
+    from model.db import db
+    from model.reservas import Reserva
+    from sqlalchemy import insert, text
+
+    aleatorio = random.Random(42)
+    primeiro_dia = date(2020, 1, 1)
+    dias = args.anos * 365
+    print(f'Populando {args.anos} anos x {args.salas} salas em {diretorio}...')
+    with app.app_context():
+        total = 0
+        for deslocamento in range(dias):
+            dia = primeiro_dia + timedelta(days=deslocamento)
+            linhas = [
+                {'num_sala': sala, 'lab': sala % 5 == 0, 'data': dia, 'id_turma': aleatorio.randint(1, 50)}
+                for sala in range(100, 100 + args.salas) if aleatorio.random() < args.ocupacao
+            ]
+            db.session.execute(insert(Reserva), linhas)
+            total += len(linhas)
+        db.session.commit()
+        print(f'{total} reservas.')
+
+        for consulta in (
+            "SELECT num_sala, data FROM reserva WHERE data BETWEEN '2024-06-01' AND '2024-06-30' ORDER BY data",
+            'WITH RECURSIVE salas(n) AS (SELECT min(num_sala) FROM reserva UNION ALL '
+            'SELECT (SELECT min(num_sala) FROM reserva WHERE num_sala > n) FROM salas WHERE n IS NOT NULL) '
+            'SELECT n FROM salas WHERE n IS NOT NULL',
+            "SELECT id FROM reserva WHERE num_sala = 150 AND data = '2024-06-03'",
+        ):
+            plano = db.session.execute(text(f'EXPLAIN QUERY PLAN {consulta}')).all()
+            print(f'\n{consulta}\n  -> ' + '; '.join(linha[-1] for linha in plano))
+
+    cliente = app.test_client()
+    meio = primeiro_dia + timedelta(days=dias // 2)
+
+    def lista_completa():
+        reservas = cliente.get('/lista_reserva?todos=1').get_json()
+        ocupadas = {r['num_sala'] for r in reservas if r['data'] == meio.isoformat()}
+        salas = {r['num_sala'] for r in reservas}
+        return salas - ocupadas
+
+    casos = [
+        ('1 dia', meio, meio),
+        ('1 semana', meio, meio + timedelta(days=6)),
+        ('1 mês', meio, meio + timedelta(days=30)),
+    ]
+    resultados = [('antes: lista_reserva?todos=1 + cálculo no cliente', *medir(lista_completa, 1))]
+    for nome, inicio, fim in casos:
+        url = f'/disponibilidade?inicio={inicio.isoformat()}&fim={fim.isoformat()}'
+        resultados.append((f'/disponibilidade, {nome}', *medir(lambda: cliente.get(url), args.repeticoes)))
+
+    print(f"\n{'cenário':<55}{'mediana (ms)':>14}{'máximo (ms)':>14}")
+    for nome, mediana, maximo in resultados:
+        print(f'{nome:<55}{mediana:>14.1f}{maximo:>14.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark de /estatisticas/turma com uma turma grande.
+
+Cria um banco SQLite temporário com uma turma de `--notas` notas (padrão 100.000, `--alunos` alunos em
+`--atividades` atividades) e mede, pelo test client do Flask:
+  - antes: baixar /listar_notas?todos=1 e /listar_atividade?todos=1 e calcular as estatísticas no cliente;
+  - /estatisticas/turma sem cache (o cache é invalidado antes de cada requisição);
+  - /estatisticas/turma com o resultado em cache.
+
+Uso:
+    python benchmarks/estatisticas_turma.py [--notas 100000] [--repeticoes 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'Atividades'))
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), max(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notas', type=int, default=100_000)
+    parser.add_argument('--alunos', type=int, default=2_000)
+    parser.add_argument('--atividades', type=int, default=50)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix='bench_estatisticas_')
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(diretorio, 'bench.db')}"
+    config.Config.SINCRONIZACAO_INTERVALO = 0
+    config.Config.DEBUG = False
+    from app import app
+    from model.db import db
+    from model.atividade import Atividade
+    from model.notas import Notas
+    from service.estatisticas import obter_cache_estatisticas
+    from datetime import date
+    from sqlalchemy import insert
+
+    print(f'Populando {args.notas} notas da turma 1 (e o mesmo tanto em outras turmas) em {diretorio}...')
+    aleatorio = random.Random(42)
+    with app.app_context():
+        # Metade das atividades é da turma medida; a outra metade, de outras turmas
+        db.session.execute(insert(Atividade), [
+            {'id': i, 'nome_atividade': f'Atividade {i}', 'descricao': '-', 'peso_porcento': aleatorio.randint(5, 30),
+             'data_entrega': date(2025, 1, 1), 'id_turma': 1 if i <= args.atividades else i % 20 + 2, 'id_professor': 1}
+            for i in range(1, 2 * args.atividades + 1)
+        ])
+        lote = 50_000
+        for deslocamento, total in ((0, args.notas), (args.atividades, args.notas)):
+            for inicio in range(0, total, lote):
+                db.session.execute(insert(Notas), [
+                    {'nota': round(min(10, max(0, aleatorio.gauss(6.5, 2))), 1),
+                     'id_aluno': aleatorio.randint(1, args.alunos),
+                     'id_atividade': deslocamento + aleatorio.randint(1, args.atividades)}
+                    for _ in range(min(lote, total - inicio))
+                ])
+        db.session.commit()
+
+    cliente = app.test_client()
+
+    def no_cliente():
+        notas = cliente.get('/listar_notas?todos=1').get_json()
+        atividades = {a['id']: a for a in cliente.get('/listar_atividade?todos=1').get_json()}
+        da_turma = sorted(n['nota'] for n in notas if atividades[n['id_atividade']]['turma_id'] == 1)
+        return statistics.mean(da_turma), statistics.median(da_turma), statistics.pstdev(da_turma)
+
+    def sem_cache():
+        with app.app_context():
+            obter_cache_estatisticas().invalidar()
+        resposta = cliente.get('/estatisticas/turma/1')
+        assert resposta.status_code == 200
+
+    resultados = [('antes: listas completas + cálculo no cliente', *medir(no_cliente, max(1, args.repeticoes // 10)))]
+    resultados.append(('/estatisticas/turma/1, sem cache', *medir(sem_cache, args.repeticoes)))
+    resultados.append(('/estatisticas/turma/1, em cache', *medir(lambda: cliente.get('/estatisticas/turma/1'), args.repeticoes)))
+
+    resumo = cliente.get('/estatisticas/turma/1').get_json()
+    print(f"\nnotas: {resumo['notas']['quantidade']}, alunos: {resumo['medias_alunos']['quantidade']}, "
+          f"atividades: {len(resumo['atividades'])}, média: {resumo['notas']['media']}, "
+          f"aprovação dos alunos: {resumo['medias_alunos']['taxa_aprovacao']}")
+    print(f"\n{'cenário':<55}{'mediana (ms)':>14}{'máximo (ms)':>14}")
+    for nome, mediana, maximo in resultados:
+        print(f'{nome:<55}{mediana:>14.1f}{maximo:>14.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark das listagens de notas com e sem filtro no servidor.
+
+Cria um banco SQLite temporário com N notas (padrão 1.000.000) e mede, pelo test client do Flask:
+  - sem filtro: o cliente baixa a tabela inteira (?todos=1) e filtra localmente, como era antes;
+  - filtro com índice: ?id_aluno=X e ?id_atividade=Y resolvidos no banco;
+  - filtro sem índice: os mesmos filtros depois de remover os índices, para mostrar o ganho do índice.
+
+Uso:
+    python benchmarks/filtros_notas.py [--notas 1000000] [--repeticoes 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'Atividades'))
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), max(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notas', type=int, default=1_000_000)
+    parser.add_argument('--alunos', type=int, default=10_000)
+    parser.add_argument('--atividades', type=int, default=500)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix='bench_filtros_')
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(diretorio, 'bench.db')}"
+    config.Config.SINCRONIZACAO_INTERVALO = 0
+    config.Config.DEBUG = False
+    from app import app
+    from model.db import db, criar_indices
+    from model.atividade import Atividade
+    from model.notas import Notas
+    from datetime import date
+    from sqlalchemy import insert
+
+    print(f'Populando {args.notas} notas em {diretorio}...')
+    aleatorio = random.Random(42)
+    with app.app_context():
+        db.session.execute(insert(Atividade), [
+            {'id': i, 'nome_atividade': f'Atividade {i}', 'descricao': '-', 'peso_porcento': 10,
+             'data_entrega': date(2025, 1, 1), 'id_turma': i % 20 + 1, 'id_professor': 1}
+            for i in range(1, args.atividades + 1)
+        ])
+        lote = 50_000
+        for inicio in range(0, args.notas, lote):
+            db.session.execute(insert(Notas), [
+                {'nota': aleatorio.uniform(0, 10), 'id_aluno': aleatorio.randint(1, args.alunos),
+                 'id_atividade': aleatorio.randint(1, args.atividades)}
+                for _ in range(min(lote, args.notas - inicio))
+            ])
+        db.session.commit()
+
+    cliente = app.test_client()
+    aluno = aleatorio.randint(1, args.alunos)
+    atividade = aleatorio.randint(1, args.atividades)
+
+    def sem_filtro():
+        notas = cliente.get('/listar_notas?todos=1').get_json()
+        return [nota for nota in notas if nota['id_aluno'] == aluno]
+
+    casos = [
+        (f'filtro id_aluno={aluno}', lambda: cliente.get(f'/listar_notas?id_aluno={aluno}&limit=1000')),
+        (f'filtro id_atividade={atividade}', lambda: cliente.get(f'/listar_notas?id_atividade={atividade}&limit=1000')),
+    ]
+
+    resultados = [('sem filtro (todos=1 + filtro no cliente)', *medir(sem_filtro, max(1, args.repeticoes // 10)))]
+    resultados += [(f'{nome}, com índice', *medir(funcao, args.repeticoes)) for nome, funcao in casos]
+
+    with app.app_context():
+        for tabela in db.metadata.sorted_tables:
+            for indice in tabela.indexes:
+                indice.drop(db.engine)
+    resultados += [(f'{nome}, sem índice', *medir(funcao, max(1, args.repeticoes // 4))) for nome, funcao in casos]
+    with app.app_context():
+        criar_indices()
+
+    print(f"\n{'cenário':<55}{'mediana (ms)':>14}{'máximo (ms)':>14}")
+    for nome, mediana, maximo in resultados:
+        print(f'{nome:<55}{mediana:>14.1f}{maximo:>14.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark de leituras e escritas simultâneas no SQLite, antes e depois do perfil SQLITE_PRAGMAS.
+
+Para cada perfil, sobe o app do gerenciamento em um processo próprio, com um banco temporário de
+`--alunos` alunos, e roda por `--segundos` segundos:
+  - `--leitores` threads lendo páginas de /lista_aluno;
+  - `--escritores` threads criando alunos com /criar_aluno.
+Mede requisições por segundo, latência das leituras e erros ('database is locked' e afins).
+
+Perfis:
+  - antes: SQLITE_PRAGMAS vazio (journal rollback, synchronous=FULL, cache padrão);
+  - depois: SQLITE_PRAGMAS do config.py (WAL, synchronous=NORMAL, mmap, cache, busy_timeout).
+
+Uso:
+    python benchmarks/leitura_escrita_sqlite.py [--segundos 10] [--leitores 4] [--escritores 2]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def rodar_perfil(args):
+    """Executado no processo filho: mede um perfil e imprime o resultado em JSON."""
+    sys.path.insert(0, os.path.join(RAIZ, 'gerenciamento'))
+    diretorio = tempfile.mkdtemp(prefix='bench_sqlite_')
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(diretorio, 'bench.db')}"
+    config.Config.DEBUG = False
+    config.Config.SQLITE_MANUTENCAO_INTERVALO = 0
+    if args.perfil == 'antes':
+        config.Config.SQLITE_PRAGMAS = {}
+    from app import app
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from datetime import date
+    from sqlalchemy import insert
+
+    with app.app_context():
+        db.session.add(Professor(id=1, nome='Professor', idade=40, materia='Matemática'))
+        db.session.add(Turma(id=1, descricao='Turma 1', professor_id=1, ativo=True))
+        db.session.flush()
+        db.session.execute(insert(Aluno), [
+            {'nome': f'Aluno {i}', 'idade': 15, 'turma_id': 1, 'data_nascimento': date(2010, 1, 1)}
+            for i in range(args.alunos)
+        ])
+        db.session.commit()
+        modo = db.session.connection().exec_driver_sql('PRAGMA journal_mode').scalar()
+
+    fim = time.perf_counter() + args.segundos
+    leituras, escritas, erros = [], [0], [0]
+    trava = threading.Lock()
+
+    def leitor(numero):
+        cliente = app.test_client()
+        cursor = numero * 997 % args.alunos
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            resposta = cliente.get(f'/lista_aluno?limit=100&after={cursor}')
+            duracao = (time.perf_counter() - inicio) * 1000
+            cursor = (cursor + 100) % args.alunos
+            with trava:
+                if resposta.status_code == 200:
+                    leituras.append(duracao)
+                else:
+                    erros[0] += 1
+
+    def escritor():
+        cliente = app.test_client()
+        corpo = {'nome': 'Novo', 'idade': 16, 'turma_id': 1, 'data_nascimento': '2009-05-01',
+                 'nota_primeiro_semestre': 7, 'nota_segundo_semestre': 8, 'media_final': 7.5}
+        while time.perf_counter() < fim:
+            try:
+                ok = cliente.post('/criar_aluno', json=corpo).status_code == 201
+            except Exception:
+                ok = False
+            with trava:
+                if ok:
+                    escritas[0] += 1
+                else:
+                    erros[0] += 1
+
+    threads = [threading.Thread(target=leitor, args=(i,)) for i in range(args.leitores)]
+    threads += [threading.Thread(target=escritor) for _ in range(args.escritores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps({
+        'journal_mode': modo,
+        'leituras_s': len(leituras) / args.segundos,
+        'escritas_s': escritas[0] / args.segundos,
+        'erros': erros[0],
+        'leitura_p50': statistics.median(leituras) if leituras else None,
+        'leitura_p99': statistics.quantiles(leituras, n=100)[98] if len(leituras) > 1 else None,
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--segundos', type=float, default=10)
+    parser.add_argument('--leitores', type=int, default=4)
+    parser.add_argument('--escritores', type=int, default=2)
+    parser.add_argument('--alunos', type=int, default=20_000)
+    parser.add_argument('--perfil', choices=('antes', 'depois'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.perfil:
+        rodar_perfil(args)
+        return
+
+    resultados = []
+    for perfil in ('antes', 'depois'):
+        print(f'Medindo perfil {perfil} por {args.segundos:g} s...')
+        saida = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--perfil', perfil, '--segundos', str(args.segundos),
+             '--leitores', str(args.leitores), '--escritores', str(args.escritores), '--alunos', str(args.alunos)],
+            cwd=os.path.join(RAIZ, 'gerenciamento'), capture_output=True, text=True, check=True
+        ).stdout
+        resultados.append((perfil, json.loads(saida.strip().splitlines()[-1])))
+
+    print(f"\n{'perfil':<10}{'journal':>9}{'leituras/s':>12}{'escritas/s':>12}{'erros':>7}"
+          f"{'leitura p50 (ms)':>18}{'leitura p99 (ms)':>18}")
+    for perfil, r in resultados:
+        print(f"{perfil:<10}{r['journal_mode']:>9}{r['leituras_s']:>12.0f}{r['escritas_s']:>12.0f}{r['erros']:>7}"
+              f"{r['leitura_p50'] or 0:>18.1f}{r['leitura_p99'] or 0:>18.1f}")
+
+if __name__ == '__main__':
+    main()
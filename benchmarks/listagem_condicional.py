@@ -0,0 +1,80 @@
+"""
+Custo de /lista_aluno com e sem If-None-Match (respostas 200 e 304).
+
+Cria um banco SQLite temporário com `--alunos` alunos e mede, pelo test client do Flask, `--repeticoes`
+requisições de cada tipo:
+  - 200: /lista_aluno?limit=`--limite` sem cabeçalho condicional (consulta e serializa a página);
+  - 304: a mesma URL reenviando o ETag recebido (só lê a versão da tabela).
+Depois cria um aluno e confere que o ETag antigo volta a receber 200.
+
+Uso:
+    python benchmarks/listagem_condicional.py [--alunos 20000] [--limite 1000] [--repeticoes 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'gerenciamento'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alunos', type=int, default=20_000)
+    parser.add_argument('--limite', type=int, default=1000)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    args = parser.parse_args()
+
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_condicional_'), 'bench.db')}"
+    config.Config.DEBUG = False
+    config.Config.TAREFAS_NA_IMPORTACAO = False
+    from app import app
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from datetime import date
+    from sqlalchemy import insert
+
+    with app.app_context():
+        db.session.add(Professor(id=1, nome='Professor', idade=40, materia='Matemática'))
+        db.session.add(Turma(id=1, descricao='Turma 1', professor_id=1, ativo=True))
+        db.session.flush()
+        db.session.execute(insert(Aluno), [
+            {'nome': f'Aluno {i}', 'idade': 15, 'turma_id': 1, 'data_nascimento': date(2010, 1, 1)}
+            for i in range(args.alunos)
+        ])
+        db.session.commit()
+
+    cliente = app.test_client()
+    url = f'/lista_aluno?limit={args.limite}'
+    etag = cliente.get(url).headers['ETag']
+
+    def medir(cabecalhos, esperado):
+        tempos, tamanho = [], 0
+        for _ in range(args.repeticoes):
+            inicio = time.perf_counter()
+            resposta = cliente.get(url, headers=cabecalhos)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+            assert resposta.status_code == esperado, resposta.status_code
+            tamanho = len(resposta.data)
+        return statistics.median(tempos), statistics.quantiles(tempos, n=100)[98], tamanho
+
+    linhas = [('200 (sem ETag)', *medir({}, 200)), ('304 (If-None-Match)', *medir({'If-None-Match': etag}, 304))]
+
+    print(f"\n{'resposta':<22}{'p50 (ms)':>10}{'p99 (ms)':>10}{'bytes':>10}")
+    for nome, p50, p99, tamanho in linhas:
+        print(f'{nome:<22}{p50:>10.2f}{p99:>10.2f}{tamanho:>10}')
+
+    cliente.post('/criar_aluno', json={'nome': 'Novo', 'idade': 16, 'turma_id': 1, 'data_nascimento': '2009-05-01',
+                                       'nota_primeiro_semestre': 7, 'nota_segundo_semestre': 8, 'media_final': 7.5})
+    invalidado = cliente.get(url, headers={'If-None-Match': etag}).status_code == 200
+    print('\nOK: o ETag antigo deixou de valer após criar um aluno.' if invalidado
+          else '\nFALHA: o ETag antigo continua valendo após criar um aluno.')
+    sys.exit(0 if invalidado else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Custo da coleta de métricas (/metrics) por requisição no gerenciamento.
+
+Cria um banco SQLite temporário com `--alunos` alunos e mede, pelo test client do Flask, `--repeticoes`
+requisições de cada URL com METRICAS desligado e ligado (cada configuração em um processo próprio, já que
+a instrumentação é feita ao importar o app). O cache de respostas fica desligado para que cada requisição
+chegue ao banco. No fim, mostra um trecho do /metrics do processo com as métricas ligadas.
+
+Uso:
+    python benchmarks/metricas_overhead.py [--alunos 200] [--repeticoes 2000] [--rodadas 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'gerenciamento'))
+
+URLS = ['/aluno/1', '/lista_aluno?limit=50', '/nao_existe']
+
+def medir(metricas, alunos, repeticoes):
+    """Roda no processo filho: retorna as medianas (µs) de cada URL e, com métricas, um trecho do /metrics."""
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_metricas_'), 'bench.db')}"
+    config.Config.DEBUG = False
+    config.Config.TAREFAS_NA_IMPORTACAO = False
+    config.Config.CACHE_RESPOSTAS_ATIVO = False
+    config.Config.METRICAS_ATIVAS = metricas
+    from app import app
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from datetime import date
+    from sqlalchemy import insert
+
+    with app.app_context():
+        db.session.add(Professor(id=1, nome='Professor', idade=40, materia='Matemática'))
+        db.session.add(Turma(id=1, descricao='Turma 1', professor_id=1, ativo=True))
+        db.session.flush()
+        db.session.execute(insert(Aluno), [
+            {'nome': f'Aluno {i}', 'idade': 15, 'turma_id': 1, 'data_nascimento': date(2010, 1, 1)} for i in range(alunos)
+        ])
+        db.session.commit()
+
+    cliente = app.test_client()
+    medianas = {}
+    for url in URLS:
+        for _ in range(50):
+            cliente.get(url)
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            cliente.get(url)
+            tempos.append((time.perf_counter() - inicio) * 1e6)
+        medianas[url] = statistics.median(tempos)
+    amostra = ''
+    if metricas:
+        linhas = cliente.get('/metrics').get_data(as_text=True).splitlines()
+        amostra = '\n'.join(l for l in linhas if l.startswith(('http_requests_total', 'db_query_duration_seconds_count')))
+    return {'medianas': medianas, 'amostra': amostra}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alunos', type=int, default=200)
+    parser.add_argument('--repeticoes', type=int, default=2000)
+    parser.add_argument('--rodadas', type=int, default=3)
+    parser.add_argument('--filho', choices=['0', '1'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho is not None:
+        print(json.dumps(medir(args.filho == '1', args.alunos, args.repeticoes)))
+        return
+
+    ambiente = {chave: valor for chave, valor in os.environ.items() if chave != 'PROMETHEUS_MULTIPROC_DIR'}
+    resultados = {}
+    # Rodadas alternadas, ficando com a menor mediana de cada URL, para tirar o ruído da ordem de execução
+    for _ in range(args.rodadas):
+        for metricas in ('0', '1'):
+            saida = subprocess.run([sys.executable, __file__, '--filho', metricas, '--alunos', str(args.alunos),
+                                    '--repeticoes', str(args.repeticoes)], env=ambiente, capture_output=True,
+                                   text=True, check=True).stdout
+            rodada = json.loads(saida.strip().splitlines()[-1])
+            anterior = resultados.setdefault(metricas, rodada)
+            for url, mediana in rodada['medianas'].items():
+                anterior['medianas'][url] = min(anterior['medianas'][url], mediana)
+
+    print(f"\n{'url':<28}{'sem métricas p50 (µs)':>23}{'com métricas p50 (µs)':>23}{'custo (µs)':>12}")
+    for url in URLS:
+        sem, com = resultados['0']['medianas'][url], resultados['1']['medianas'][url]
+        print(f'{url:<28}{sem:>23.0f}{com:>23.0f}{com - sem:>12.0f}')
+    print('\nTrecho do /metrics:')
+    print(resultados['1']['amostra'])
+
+if __name__ == '__main__':
+    main()
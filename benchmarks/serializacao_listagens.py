@@ -0,0 +1,94 @@
+"""
+Custo de CPU por linha das listagens: leitura do banco + montagem dos dicts + JSON.
+
+Cria um banco SQLite temporário com `--alunos` alunos e mede, pelo test client do Flask, o tempo de CPU
+(time.process_time) de /lista_aluno?todos=1 e /lista_aluno?stream=1 dividido pelo número de linhas, em:
+  - antes: consulta pelo db.session.execute (ORM), datas convertidas para date e de volta com isoformat,
+    JSON pelo provider padrão do Flask (json da stdlib);
+  - leitura Core: executar_core + colunas_leitura, ainda com o json da stdlib;
+  - leitura Core + orjson: o caminho atual, com o OrjsonProvider.
+A saída das três configurações é comparada e deve ser idêntica (depois de decodificar o JSON).
+
+Uso:
+    python benchmarks/serializacao_listagens.py [--alunos 50000] [--repeticoes 5]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'gerenciamento'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alunos', type=int, default=50_000)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_serializacao_'), 'bench.db')}"
+    config.Config.DEBUG = False
+    config.Config.TAREFAS_NA_IMPORTACAO = False
+    config.Config.COMPRESSAO_ATIVA = False
+    from app import app
+    from models.db import db
+    from models.professor import Professor
+    from models.turma import Turma
+    from models.aluno import Aluno
+    from utils import listagem
+    from utils.json_rapido import OrjsonProvider, orjson
+    from flask.json.provider import DefaultJSONProvider
+    from datetime import date
+    from sqlalchemy import insert
+
+    if orjson is None:
+        parser.error('O orjson não está instalado (pip install orjson).')
+
+    with app.app_context():
+        db.session.add(Professor(id=1, nome='Professor', idade=40, materia='Matemática'))
+        db.session.add(Turma(id=1, descricao='Turma 1', professor_id=1, ativo=True))
+        db.session.flush()
+        db.session.execute(insert(Aluno), [
+            {'nome': f'Aluno {i}', 'idade': 15, 'turma_id': 1, 'data_nascimento': date(2010, 1, i % 28 + 1),
+             'nota_primeiro_semestre': 7.5, 'nota_segundo_semestre': 8.0, 'media_final': 7.75}
+            for i in range(args.alunos)
+        ])
+        db.session.commit()
+
+    executar_core, colunas_leitura = listagem.executar_core, listagem.colunas_leitura
+    configuracoes = [
+        ('antes (ORM + stdlib json)', lambda consulta: db.session.execute(consulta), lambda campos: campos, DefaultJSONProvider),
+        ('leitura Core + stdlib json', executar_core, colunas_leitura, DefaultJSONProvider),
+        ('leitura Core + orjson', executar_core, colunas_leitura, OrjsonProvider),
+    ]
+    urls = ['/lista_aluno?todos=1', '/lista_aluno?stream=1']
+    cliente = app.test_client()
+    linhas, corpos = [], {}
+    for nome, executar, colunas, provider in configuracoes:
+        listagem.executar_core, listagem.colunas_leitura = executar, colunas
+        app.json = provider(app)
+        custos = []
+        for url in urls:
+            melhor = None
+            for _ in range(args.repeticoes):
+                inicio = time.process_time()
+                resposta = cliente.get(url)
+                corpo = resposta.data
+                duracao = time.process_time() - inicio
+                assert resposta.status_code == 200
+                melhor = duracao if melhor is None else min(melhor, duracao)
+            decodificado = [json.loads(l) for l in corpo.splitlines()] if 'stream' in url else json.loads(corpo)
+            assert corpos.setdefault(url, decodificado) == decodificado, f'saída diferente em {url} com {nome}'
+            custos.append(melhor * 1e6 / args.alunos)
+        linhas.append((nome, *custos))
+
+    print(f"\n{'configuração':<30}{'todos=1 (µs/linha)':>20}{'stream=1 (µs/linha)':>21}")
+    for nome, todos, stream in linhas:
+        print(f'{nome:<30}{todos:>20.2f}{stream:>21.2f}')
+    print(f'\nGanho: {linhas[0][1] / linhas[-1][1]:.1f}x (todos=1), {linhas[0][2] / linhas[-1][2]:.1f}x (stream=1); saídas idênticas.')
+
+if __name__ == '__main__':
+    main()
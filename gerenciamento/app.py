@@ -1,42 +1,104 @@
 import os
+import threading
 from models.aluno import Aluno
 from models.turma import Turma
 from models.professor import Professor
+from models.alteracao import Alteracao, registrar_estado_inicial
+from models.versao import VersaoTabela, registrar_versoes
 from flask import Flask
 from config import Config
 from controller.turma_controller import TurmaController
 from flasgger import Swagger
 from controller.aluno_controller import AlunoController
 from controller.professor_controller import ProfessorController
+from controller.validacao_controller import ValidacaoController
+from controller.alteracao_controller import AlteracaoController
+from controller.diagnostico_controller import DiagnosticoController
+from utils.importacao import registrar_comando_importacao
+from utils.compressao import configurar_compressao
+from utils.json_rapido import configurar_json
+from utils.cache_respostas import em_cache
+from utils.metricas import configurar_metricas
+from utils.consultas import configurar_consultas
+from utils.tarefas import iniciar_tarefa_periodica
 
-from models.db import db
+from models.db import db, configurar_sqlite, manutencao_sqlite
 
 app = Flask(__name__)
 app.config.from_object(Config)
+configurar_json(app)
 db.init_app(app)
+sqlite = configurar_sqlite(app)
 swagger = Swagger(app)
+configurar_compressao(app)
+configurar_metricas(app)
+configurar_consultas(app)
 
 with app.app_context():
     db.create_all()
+    registrar_estado_inicial()
+    registrar_versoes(Aluno, Turma, Professor)
 
-app.add_url_rule('/lista_aluno', view_func=AlunoController.listar,methods = ['GET'],endpoint='listar_alunos')
+app.add_url_rule('/lista_aluno', view_func=em_cache(AlunoController.listar, Aluno),methods = ['GET'],endpoint='listar_alunos')
+
+app.add_url_rule('/aluno/<int:id>', view_func=em_cache(AlunoController.buscar, Aluno),methods = ['GET', 'HEAD'],endpoint='busca_aluno')
 
 app.add_url_rule('/atualiza_aluno/<int:id>', view_func=AlunoController.atualizar,methods = ['PUT'],endpoint='atualiza_aluno')
 
 app.add_url_rule('/deleta_aluno/<int:id>', view_func=AlunoController.deletar,methods = ['DELETE'],endpoint='deleta_aluno')
 
 app.add_url_rule('/criar_aluno', view_func=AlunoController.criar,methods = ['POST'],endpoint='criar_alunos')
+app.add_url_rule('/criar_alunos_lote', view_func=AlunoController.criar_lote,methods = ['POST'],endpoint='criar_alunos_lote')
 
-app.add_url_rule('/lista_professor', view_func = ProfessorController.listar,methods = ['GET'],endpoint = 'listar_professores')
+app.add_url_rule('/lista_professor', view_func = em_cache(ProfessorController.listar, Professor),methods = ['GET'],endpoint = 'listar_professores')
+app.add_url_rule('/professor/<int:id>', view_func = em_cache(ProfessorController.buscar, Professor),methods = ['GET', 'HEAD'],endpoint = 'busca_professor')
 
 app.add_url_rule('/adiciona_professor', view_func = ProfessorController.criar,methods = ['POST'],endpoint = 'adiciona_professores')
 app.add_url_rule('/deleta_professor/<int:id>', view_func = ProfessorController.deletar,methods = ['DELETE'],endpoint = 'deleta_professores')
 app.add_url_rule('/atualiza_professor/<int:id>', view_func = ProfessorController.atualizar,methods = ['PUT'],endpoint = 'atualiza_professores')
 
-app.add_url_rule('/lista_turmas', view_func=TurmaController.listar, methods=['GET'], endpoint='lista_turmas')
+app.add_url_rule('/lista_turmas', view_func=em_cache(TurmaController.listar, Turma, tabelas_extras=TurmaController.tabelas_incluidas), methods=['GET'], endpoint='lista_turmas')
+app.add_url_rule('/turma/<int:id>', view_func=em_cache(TurmaController.buscar, Turma), methods=['GET', 'HEAD'], endpoint='busca_turma')
+app.add_url_rule('/turma/<int:id>/detalhes', view_func=em_cache(TurmaController.detalhes, Turma, Aluno, Professor), methods=['GET'], endpoint='detalhes_turma')
 app.add_url_rule('/cria_turmas', view_func=TurmaController.criar, methods=['POST'], endpoint='cria_turmas')
 app.add_url_rule('/atualiza_turmas/<int:id>', view_func=TurmaController.atualizar, methods=['PUT'], endpoint='atualiza_turmas')
 app.add_url_rule('/deleta_turmas/<int:id>', view_func=TurmaController.deletar, methods=['DELETE'], endpoint='deleta_turmas')
 
+app.add_url_rule('/existem', view_func=ValidacaoController.existem, methods=['POST'], endpoint='existem')
+app.add_url_rule('/changes', view_func=AlteracaoController.listar, methods=['GET'], endpoint='changes')
+app.add_url_rule('/diagnostico/cache_respostas', view_func=DiagnosticoController.cache_respostas, methods=['GET'], endpoint='cache_respostas')
+app.add_url_rule('/metrics', view_func=DiagnosticoController.metricas, methods=['GET'], endpoint='metrics')
+
+registrar_comando_importacao(app, 'importar_professores', ProfessorController.validar_lote, ProfessorController.inserir_lote,
+                             'Importa professores de um arquivo CSV ou NDJSON.')
+registrar_comando_importacao(app, 'importar_turmas', TurmaController.validar_lote, TurmaController.inserir_lote,
+                             'Importa turmas de um arquivo CSV ou NDJSON (os professores já devem existir).')
+registrar_comando_importacao(app, 'importar_alunos', AlunoController.validar_lote, AlunoController.inserir_lote,
+                             'Importa alunos de um arquivo CSV ou NDJSON (as turmas já devem existir).')
+
+_tarefas_iniciadas = False
+_tarefas_lock = threading.Lock()
+
+def iniciar_tarefas():
+    """
+    Inicia as tarefas periódicas do serviço, uma única vez por processo.
+    No gunicorn elas rodam em um único worker (gunicorn.conf.py).
+    """
+    global _tarefas_iniciadas
+    with _tarefas_lock:
+        if _tarefas_iniciadas:
+            return
+        _tarefas_iniciadas = True
+    if sqlite and app.config['SQLITE_MANUTENCAO_INTERVALO']:
+        iniciar_tarefa_periodica(app, 'manutencao_sqlite', app.config['SQLITE_MANUTENCAO_INTERVALO'], manutencao_sqlite)
+
+if app.config['TAREFAS_NA_IMPORTACAO']:
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        # Pela CLI do Flask o app é importado também pelos comandos (flask sincronizar, flask importar_*...),
+        # que rodariam junto com as tarefas: elas só começam na primeira requisição, o que só acontece no flask run
+        app.before_request(iniciar_tarefas)
+    else:
+        iniciar_tarefas()
+
 if __name__ == '__main__':
     app.run(host= '0.0.0.0', port = '5000', debug = True)
\ No newline at end of file
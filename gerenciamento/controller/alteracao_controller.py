@@ -0,0 +1,78 @@
+from flask import request, jsonify
+from sqlalchemy import select
+from models.db import db
+from models.alteracao import Alteracao
+
+LIMITE_PADRAO = 1000
+LIMITE_MAXIMO = 5000
+
+class AlteracaoController:
+
+    @staticmethod
+    def listar():
+        """
+        Feed de alterações de alunos, turmas e professores, em ordem de sequência.
+        Os outros serviços guardam o 'ultimo_seq' recebido e pedem a próxima página com ?since=.
+        ---
+        tags:
+          - Alterações
+        parameters:
+          - name: since
+            in: query
+            type: integer
+            required: false
+            description: Retorna apenas as alterações com seq maior que este valor (padrão 0).
+          - name: limit
+            in: query
+            type: integer
+            required: false
+            description: Quantidade máxima de alterações na resposta (padrão 1000, máximo 5000).
+        responses:
+          200:
+            description: Uma página do feed.
+            schema:
+              type: object
+              properties:
+                alteracoes:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      seq: {type: integer}
+                      tabela: {type: string}
+                      id: {type: integer}
+                      operacao: {type: string}
+                ultimo_seq:
+                  type: integer
+                tem_mais:
+                  type: boolean
+          400:
+            description: Parâmetros inválidos.
+        """
+        # Sem o type=int do request.args.get, que trocaria um valor inválido pelo padrão: ?since=abc
+        # viraria 0 e o consumidor receberia o outbox inteiro de novo
+        try:
+            since = int(request.args.get('since', 0))
+            limite = int(request.args.get('limit', LIMITE_PADRAO))
+        except ValueError:
+            since = limite = None
+        if since is None or limite is None or since < 0 or limite < 1:
+            return jsonify({'erro': "Os parâmetros 'since' e 'limit' devem ser inteiros (since >= 0, limit >= 1)."}), 400
+        limite = min(limite, LIMITE_MAXIMO)
+
+        linhas = db.session.execute(
+            select(Alteracao.seq, Alteracao.tabela, Alteracao.registro_id, Alteracao.operacao)
+            .where(Alteracao.seq > since)
+            .order_by(Alteracao.seq)
+            .limit(limite + 1)
+        ).all()
+        tem_mais = len(linhas) > limite
+        linhas = linhas[:limite]
+        return jsonify({
+            'alteracoes': [
+                {'seq': seq, 'tabela': tabela, 'id': registro_id, 'operacao': operacao}
+                for seq, tabela, registro_id, operacao in linhas
+            ],
+            'ultimo_seq': linhas[-1].seq if linhas else since,
+            'tem_mais': tem_mais
+        })
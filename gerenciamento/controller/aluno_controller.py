@@ -2,10 +2,27 @@ from flask import request, jsonify
 from models.db import db
 from models.aluno import Aluno
 from models.turma import Turma
+from models.alteracao import publicar_alteracoes
+from controller.validacao_controller import ValidacaoController
+from utils.listagem import listar
+from utils import lote
+from sqlalchemy import insert
 from datetime import datetime
 
 class AlunoController:
 
+    # Campos das listagens (nome no JSON -> coluna), também aceitos em ?fields=
+    CAMPOS = {
+        'id': Aluno.id,
+        'nome': Aluno.nome,
+        'idade': Aluno.idade,
+        'turma_id': Aluno.turma_id,
+        'data_nascimento': Aluno.data_nascimento,
+        'nota_primeiro_semestre': Aluno.nota_primeiro_semestre,
+        'nota_segundo_semestre': Aluno.nota_segundo_semestre,
+        'media_final': Aluno.media_final
+    }
+
     @staticmethod
     def listar():
         """
@@ -13,9 +30,35 @@ class AlunoController:
         ---
         tags:
           - Aluno
+        parameters:
+          - name: limit
+            in: query
+            type: integer
+            required: false
+            description: Itens por página (padrão 100, máximo 1000).
+          - name: after
+            in: query
+            type: integer
+            required: false
+            description: Cursor da página anterior (id do último item recebido, também enviado em X-Proximo-Cursor).
+          - name: todos
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro, devolve todos os registros sem paginação.
+          - name: stream
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro (ou com Accept application/x-ndjson), envia NDJSON em streaming, um registro por linha.
+          - name: fields
+            in: query
+            type: string
+            required: false
+            description: Lista de campos separados por vírgula (ex. id,nome); só essas colunas são lidas do banco.
         responses:
           200:
-            description: Uma lista de alunos.
+            description: Uma página da lista de alunos, ordenada por id.
             schema:
               type: array
               items:
@@ -39,8 +82,11 @@ class AlunoController:
                   media_final:
                     type: number
         """
-        alunos = Aluno.query.all()
-        return jsonify([{
+        return listar(AlunoController.CAMPOS, Aluno.id)
+
+    @staticmethod
+    def serializar(aluno):
+        return {
             'id': aluno.id,
             'nome': aluno.nome,
             'idade': aluno.idade,
@@ -49,7 +95,36 @@ class AlunoController:
             'nota_primeiro_semestre': aluno.nota_primeiro_semestre,
             'nota_segundo_semestre': aluno.nota_segundo_semestre,
             'media_final': aluno.media_final
-        } for aluno in alunos])
+        }
+
+    @staticmethod
+    def buscar(id):
+        """
+        Busca um aluno pelo ID.
+        Também responde a HEAD, para que outros serviços validem a existência do aluno sem baixar a lista inteira.
+        ---
+        tags:
+          - Aluno
+        parameters:
+          - name: id
+            in: path
+            type: integer
+            required: true
+            description: ID do aluno.
+        responses:
+          200:
+            description: O aluno encontrado.
+          304:
+            description: O aluno não mudou desde o ETag enviado em If-None-Match.
+          404:
+            description: Aluno não encontrado.
+        """
+        aluno = Aluno.query.get(id)
+        if not aluno:
+            return jsonify({'erro': f"O aluno com id {id} não foi encontrado"}), 404
+        response = jsonify(AlunoController.serializar(aluno))
+        response.add_etag()
+        return response.make_conditional(request)
 
     @staticmethod
     def criar():
@@ -127,6 +202,101 @@ class AlunoController:
         except (KeyError, TypeError):
             return jsonify({'erro': 'Dados inválidos ou faltando.'}), 400
 
+    @staticmethod
+    def converter_lote(item):
+        """Converte um item de lote nas colunas de Aluno; levanta lote.ItemInvalido se algo estiver errado."""
+        return {
+            'nome': lote.texto(item, 'nome'),
+            'idade': lote.inteiro(item, 'idade'),
+            'turma_id': lote.inteiro(item, 'turma_id'),
+            'data_nascimento': lote.data(item, 'data_nascimento'),
+            'nota_primeiro_semestre': lote.numero(item, 'nota_primeiro_semestre', obrigatorio=False),
+            'nota_segundo_semestre': lote.numero(item, 'nota_segundo_semestre', obrigatorio=False),
+            'media_final': lote.numero(item, 'media_final', obrigatorio=False)
+        }
+
+    @staticmethod
+    def inserir_lote(linhas):
+        """
+        Insere as linhas (já validadas) com um único executemany e publica as inserções no feed /changes.
+        Retorna os ids na ordem das linhas. Não faz commit.
+        """
+        if not linhas:
+            return []
+        ids = db.session.execute(
+            insert(Aluno).returning(Aluno.id, sort_by_parameter_order=True), linhas
+        ).scalars().all()
+        publicar_alteracoes(Aluno, ids)
+        return ids
+
+    @staticmethod
+    def validar_lote(itens):
+        """Converte os itens e valida as turmas de todos eles com uma consulta só. Retorna (linhas, erros)."""
+        linhas, erros = lote.converter_itens(itens, AlunoController.converter_lote)
+        turmas = {linha['turma_id'] for linha in linhas.values()}
+        lote.rejeitar_referencias(
+            linhas, erros, 'turma_id', turmas - ValidacaoController.ids_existentes(Turma, turmas),
+            'A turma com id {} não foi encontrada.'
+        )
+        return linhas, erros
+
+    @staticmethod
+    def criar_lote():
+        """
+        Cria vários alunos em uma única requisição.
+        As turmas de todos os itens são validadas com uma consulta só e os válidos são inseridos
+        em uma única transação. Itens inválidos não impedem a criação dos demais.
+        ---
+        tags:
+          - Aluno
+        parameters:
+          - name: body
+            in: body
+            required: true
+            schema:
+              type: array
+              items:
+                type: object
+                required:
+                  - nome
+                  - idade
+                  - turma_id
+                  - data_nascimento
+                properties:
+                  nome:
+                    type: string
+                  idade:
+                    type: integer
+                  turma_id:
+                    type: integer
+                  data_nascimento:
+                    type: string
+                    format: date
+                  nota_primeiro_semestre:
+                    type: number
+                  nota_segundo_semestre:
+                    type: number
+                  media_final:
+                    type: number
+        responses:
+          201:
+            description: Todos os alunos foram criados.
+          207:
+            description: Parte dos alunos foi criada; veja o status de cada item em 'resultados'.
+          400:
+            description: Corpo inválido ou nenhum aluno pôde ser criado.
+        """
+        try:
+            itens = lote.itens_do_corpo()
+        except lote.LoteInvalido as e:
+            return jsonify({'erro': str(e)}), 400
+
+        linhas, erros = AlunoController.validar_lote(itens)
+        indices = list(linhas)
+        ids = AlunoController.inserir_lote([linhas[indice] for indice in indices])
+        db.session.commit()
+        return lote.responder_lote(len(itens), dict(zip(indices, ids)), erros)
+
     @staticmethod
     def atualizar(id):
         """
@@ -0,0 +1,35 @@
+from flask import jsonify, Response
+from utils.cache_respostas import obter_cache_respostas
+from utils.metricas import exportar
+
+class DiagnosticoController:
+
+    @staticmethod
+    def cache_respostas():
+        """
+        Estatísticas do cache de respostas das listagens e buscas deste processo.
+        ---
+        tags:
+          - Diagnóstico
+        responses:
+          200:
+            description: Itens e bytes guardados, limite de memória, acertos, faltas, taxa de acerto, despejos e invalidações.
+        """
+        return jsonify(obter_cache_respostas().estatisticas())
+
+    @staticmethod
+    def metricas():
+        """
+        Métricas no formato de texto do Prometheus: requisições, latência e requisições em andamento por
+        endpoint, tempo das consultas ao banco. Com o gunicorn, somadas entre os workers.
+        ---
+        tags:
+          - Diagnóstico
+        produces:
+          - text/plain
+        responses:
+          200:
+            description: Métricas no formato de exposição de texto do Prometheus.
+        """
+        corpo, tipo = exportar()
+        return Response(corpo, content_type=tipo)
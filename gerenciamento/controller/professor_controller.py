@@ -1,9 +1,22 @@
 from flask import request, jsonify
 from models.db import db
 from models.professor import Professor
+from models.alteracao import publicar_alteracoes
+from utils.listagem import listar
+from utils import lote
+from sqlalchemy import insert
 
 class ProfessorController:
     
+    # Campos das listagens (nome no JSON -> coluna), também aceitos em ?fields=
+    CAMPOS = {
+        'id': Professor.id,
+        'nome': Professor.nome,
+        'idade': Professor.idade,
+        'materia': Professor.materia,
+        'observacoes': Professor.observacoes
+    }
+
     @staticmethod
     def listar():
         """
@@ -11,9 +24,35 @@ class ProfessorController:
         ---
         tags:
           - Professor
+        parameters:
+          - name: limit
+            in: query
+            type: integer
+            required: false
+            description: Itens por página (padrão 100, máximo 1000).
+          - name: after
+            in: query
+            type: integer
+            required: false
+            description: Cursor da página anterior (id do último item recebido, também enviado em X-Proximo-Cursor).
+          - name: todos
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro, devolve todos os registros sem paginação.
+          - name: stream
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro (ou com Accept application/x-ndjson), envia NDJSON em streaming, um registro por linha.
+          - name: fields
+            in: query
+            type: string
+            required: false
+            description: Lista de campos separados por vírgula (ex. id,nome); só essas colunas são lidas do banco.
         responses:
           200:
-            description: Uma lista de professores.
+            description: Uma página da lista de professores, ordenada por id.
             schema:
               type: array
               items:
@@ -30,14 +69,46 @@ class ProfessorController:
                   observacoes:
                     type: string
         """
-        professores = Professor.query.all()
-        return jsonify([{
+        return listar(ProfessorController.CAMPOS, Professor.id)
+
+    @staticmethod
+    def serializar(p):
+        return {
             'id': p.id,
             'nome': p.nome,
             'idade': p.idade,
             'materia': p.materia,
             'observacoes': p.observacoes
-        } for p in professores])
+        }
+
+    @staticmethod
+    def buscar(id):
+        """
+        Busca um professor pelo ID.
+        Também responde a HEAD, para que outros serviços validem a existência do professor sem baixar a lista inteira.
+        ---
+        tags:
+          - Professor
+        parameters:
+          - name: id
+            in: path
+            type: integer
+            required: true
+            description: ID do professor.
+        responses:
+          200:
+            description: O professor encontrado.
+          304:
+            description: O professor não mudou desde o ETag enviado em If-None-Match.
+          404:
+            description: Professor não encontrado.
+        """
+        professor = Professor.query.get(id)
+        if not professor:
+            return jsonify({'erro': f"O professor com id {id} não foi encontrado"}), 404
+        response = jsonify(ProfessorController.serializar(professor))
+        response.add_etag()
+        return response.make_conditional(request)
         
     @staticmethod
     def criar():
@@ -89,6 +160,35 @@ class ProfessorController:
         db.session.add(novo)
         db.session.commit()
         return jsonify({'mensagem': 'Professor criado com sucesso!'}), 201
+
+    @staticmethod
+    def converter_lote(item):
+        """Converte um item de lote nas colunas de Professor; levanta lote.ItemInvalido se algo estiver errado."""
+        return {
+            'nome': lote.texto(item, 'nome'),
+            'idade': lote.inteiro(item, 'idade'),
+            'materia': lote.texto(item, 'materia'),
+            'observacoes': lote.texto(item, 'observacoes', obrigatorio=False)
+        }
+
+    @staticmethod
+    def validar_lote(itens):
+        """Converte os itens; professores não têm referências a validar. Retorna (linhas, erros)."""
+        return lote.converter_itens(itens, ProfessorController.converter_lote)
+
+    @staticmethod
+    def inserir_lote(linhas):
+        """
+        Insere as linhas (já validadas) com um único executemany e publica as inserções no feed /changes.
+        Retorna os ids na ordem das linhas. Não faz commit.
+        """
+        if not linhas:
+            return []
+        ids = db.session.execute(
+            insert(Professor).returning(Professor.id, sort_by_parameter_order=True), linhas
+        ).scalars().all()
+        publicar_alteracoes(Professor, ids)
+        return ids
     
     @staticmethod
     def atualizar(id):
@@ -2,9 +2,67 @@ from flask import request, jsonify
 from models.db import db
 from models.turma import Turma
 from models.professor import Professor
+from models.alteracao import publicar_alteracoes
+from controller.validacao_controller import ValidacaoController
+from controller.aluno_controller import AlunoController
+from controller.professor_controller import ProfessorController
+from utils.listagem import listar, listar_objetos
+from utils import lote
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload, joinedload, raiseload
 
 class TurmaController:
     
+    # Campos das listagens (nome no JSON -> coluna), também aceitos em ?fields=
+    CAMPOS = {
+        'id': Turma.id,
+        'descricao': Turma.descricao,
+        'professor_id': Turma.professor_id,
+        'ativo': Turma.ativo
+    }
+
+    # Relações aceitas em ?include= e como cada uma é carregada: alunos (coleção) com um SELECT ... IN
+    # para a página inteira; professor (muitos-para-um) no mesmo SELECT das turmas, com JOIN
+    RELACOES = {
+        'alunos': (Turma.alunos, selectinload),
+        'professor': (Turma.professor, joinedload),
+    }
+
+    @staticmethod
+    def relacoes_pedidas(padrao=''):
+        """Lê ?include=alunos,professor; levanta ValueError com a mensagem de erro se houver nomes inválidos."""
+        nomes = [nome.strip() for nome in request.args.get('include', padrao).split(',') if nome.strip()]
+        invalidos = [nome for nome in nomes if nome not in TurmaController.RELACOES]
+        if invalidos:
+            raise ValueError(
+                f"Relações inválidas em 'include': {', '.join(invalidos)}. "
+                f"Disponíveis: {', '.join(TurmaController.RELACOES)}."
+            )
+        return list(dict.fromkeys(nomes))
+
+    @staticmethod
+    def opcoes_carregamento(incluir):
+        # raiseload('*') garante que nenhuma outra relação seja carregada preguiçosamente (uma consulta por turma)
+        return [estrategia(relacao) for relacao, estrategia in map(TurmaController.RELACOES.get, incluir)] + [raiseload('*')]
+
+    @staticmethod
+    def tabelas_relacoes(incluir):
+        return [TurmaController.RELACOES[nome][0].property.mapper.local_table.name for nome in incluir]
+
+    @staticmethod
+    def tabelas_incluidas():
+        """Tabelas das relações pedidas em ?include= nesta requisição (lidas a mais pela listagem)."""
+        return TurmaController.tabelas_relacoes(TurmaController.relacoes_pedidas())
+
+    @staticmethod
+    def serializar_com_relacoes(turma, incluir):
+        item = TurmaController.serializar(turma)
+        if 'professor' in incluir:
+            item['professor'] = ProfessorController.serializar(turma.professor) if turma.professor else None
+        if 'alunos' in incluir:
+            item['alunos'] = [AlunoController.serializar(aluno) for aluno in turma.alunos]
+        return item
+
     @staticmethod
     def listar():
         """
@@ -12,9 +70,42 @@ class TurmaController:
         ---
         tags:
           - Turma
+        parameters:
+          - name: limit
+            in: query
+            type: integer
+            required: false
+            description: Itens por página (padrão 100, máximo 1000).
+          - name: after
+            in: query
+            type: integer
+            required: false
+            description: Cursor da página anterior (id do último item recebido, também enviado em X-Proximo-Cursor).
+          - name: todos
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro, devolve todos os registros sem paginação.
+          - name: stream
+            in: query
+            type: boolean
+            required: false
+            description: Se verdadeiro (ou com Accept application/x-ndjson), envia NDJSON em streaming, um registro por linha.
+          - name: fields
+            in: query
+            type: string
+            required: false
+            description: Lista de campos separados por vírgula (ex. id,nome); só essas colunas são lidas do banco.
+          - name: include
+            in: query
+            type: string
+            required: false
+            description: >
+              Relações incluídas em cada turma (alunos, professor), carregadas com um número fixo de consultas
+              por página. Não pode ser combinado com fields.
         responses:
           200:
-            description: Uma lista de turmas.
+            description: Uma página da lista de turmas, ordenada por id.
             schema:
               type: array
               items:
@@ -28,16 +119,112 @@ class TurmaController:
                     type: integer
                   ativo:
                     type: boolean
+                  professor:
+                    type: object
+                    description: Só com include=professor.
+                  alunos:
+                    type: array
+                    description: Só com include=alunos, ordenados por id.
+                    items:
+                      type: object
+          400:
+            description: Parâmetros inválidos.
         """
-        turmas = Turma.query.all()
-        return jsonify([
-            {
-                'id': t.id,
-                'descricao': t.descricao,
-                'professor_id': t.professor_id,
-                'ativo': t.ativo
-            } for t in turmas
-        ])
+        if 'include' not in request.args:
+            return listar(TurmaController.CAMPOS, Turma.id)
+        try:
+            incluir = TurmaController.relacoes_pedidas()
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
+        if 'fields' in request.args:
+            return jsonify({'erro': "Os parâmetros 'include' e 'fields' não podem ser usados juntos."}), 400
+        return listar_objetos(
+            Turma, Turma.id,
+            lambda turma: TurmaController.serializar_com_relacoes(turma, incluir),
+            TurmaController.opcoes_carregamento(incluir),
+            tabelas=TurmaController.tabelas_relacoes(incluir)
+        )
+
+    @staticmethod
+    def serializar(t):
+        return {
+            'id': t.id,
+            'descricao': t.descricao,
+            'professor_id': t.professor_id,
+            'ativo': t.ativo
+        }
+
+    @staticmethod
+    def buscar(id):
+        """
+        Busca uma turma pelo ID.
+        Também responde a HEAD, para que outros serviços validem a existência da turma sem baixar a lista inteira.
+        ---
+        tags:
+          - Turma
+        parameters:
+          - name: id
+            in: path
+            type: integer
+            required: true
+            description: ID da turma.
+        responses:
+          200:
+            description: A turma encontrada.
+          304:
+            description: A turma não mudou desde o ETag enviado em If-None-Match.
+          404:
+            description: Turma não encontrada.
+        """
+        turma = Turma.query.get(id)
+        if not turma:
+            return jsonify({'erro': f"A turma com id {id} não foi encontrada"}), 404
+        response = jsonify(TurmaController.serializar(turma))
+        response.add_etag()
+        return response.make_conditional(request)
+
+    @staticmethod
+    def detalhes(id):
+        """
+        Detalhes de uma turma com o professor e os alunos.
+        Tudo é lido em duas consultas (turma com professor via JOIN e alunos via SELECT ... IN),
+        qualquer que seja o tamanho da turma.
+        ---
+        tags:
+          - Turma
+        parameters:
+          - name: id
+            in: path
+            type: integer
+            required: true
+            description: ID da turma.
+          - name: include
+            in: query
+            type: string
+            required: false
+            description: Relações incluídas (padrão alunos,professor).
+        responses:
+          200:
+            description: A turma, com 'professor' e 'alunos' (ordenados por id).
+          304:
+            description: A turma não mudou desde o ETag enviado em If-None-Match.
+          400:
+            description: Parâmetros inválidos.
+          404:
+            description: Turma não encontrada.
+        """
+        try:
+            incluir = TurmaController.relacoes_pedidas(padrao=','.join(TurmaController.RELACOES))
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
+        turma = db.session.execute(
+            select(Turma).where(Turma.id == id).options(*TurmaController.opcoes_carregamento(incluir))
+        ).scalar_one_or_none()
+        if not turma:
+            return jsonify({'erro': f"A turma com id {id} não foi encontrada"}), 404
+        response = jsonify(TurmaController.serializar_com_relacoes(turma, incluir))
+        response.add_etag()
+        return response.make_conditional(request)
 
     @staticmethod
     def criar():
@@ -89,6 +276,41 @@ class TurmaController:
         db.session.commit()
         return jsonify({'mensagem': 'Turma criada com sucesso!'})
 
+    @staticmethod
+    def converter_lote(item):
+        """Converte um item de lote nas colunas de Turma; levanta lote.ItemInvalido se algo estiver errado."""
+        ativo = lote.booleano(item, 'ativo', obrigatorio=False)
+        return {
+            'descricao': lote.texto(item, 'descricao'),
+            'professor_id': lote.inteiro(item, 'professor_id'),
+            'ativo': True if ativo is None else ativo
+        }
+
+    @staticmethod
+    def validar_lote(itens):
+        """Converte os itens e valida os professores de todos eles com uma consulta só. Retorna (linhas, erros)."""
+        linhas, erros = lote.converter_itens(itens, TurmaController.converter_lote)
+        professores = {linha['professor_id'] for linha in linhas.values()}
+        lote.rejeitar_referencias(
+            linhas, erros, 'professor_id', professores - ValidacaoController.ids_existentes(Professor, professores),
+            'O professor com o id {} não existe.'
+        )
+        return linhas, erros
+
+    @staticmethod
+    def inserir_lote(linhas):
+        """
+        Insere as linhas (já validadas) com um único executemany e publica as inserções no feed /changes.
+        Retorna os ids na ordem das linhas. Não faz commit.
+        """
+        if not linhas:
+            return []
+        ids = db.session.execute(
+            insert(Turma).returning(Turma.id, sort_by_parameter_order=True), linhas
+        ).scalars().all()
+        publicar_alteracoes(Turma, ids)
+        return ids
+
     @staticmethod
     def atualizar(id):
         """
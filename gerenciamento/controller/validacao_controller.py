@@ -0,0 +1,95 @@
+from flask import request, jsonify
+from models.db import db
+from models.aluno import Aluno
+from models.turma import Turma
+from models.professor import Professor
+
+# Quantidade máxima de ids por consulta IN (o SQLite limita o número de parâmetros)
+TAMANHO_LOTE_IN = 500
+
+MODELOS = {
+    'alunos': Aluno,
+    'turmas': Turma,
+    'professores': Professor,
+}
+
+class ValidacaoController:
+
+    @staticmethod
+    def converter_id(id_enviado):
+        try:
+            return int(id_enviado)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def ids_existentes(modelo, ids):
+        """Retorna o conjunto de ids (int) de `ids` que existem na tabela do modelo, com uma consulta IN por lote."""
+        ids = list(ids)
+        encontrados = set()
+        for inicio in range(0, len(ids), TAMANHO_LOTE_IN):
+            lote = ids[inicio:inicio + TAMANHO_LOTE_IN]
+            encontrados.update(
+                id for (id,) in db.session.query(modelo.id).filter(modelo.id.in_(lote))
+            )
+        return encontrados
+
+    @staticmethod
+    def existem():
+        """
+        Verifica em uma única chamada quais ids de alunos, turmas e professores existem.
+        Feito para os outros serviços validarem várias referências com uma requisição só.
+        ---
+        tags:
+          - Validação
+        parameters:
+          - name: body
+            in: body
+            required: true
+            schema:
+              type: object
+              properties:
+                alunos:
+                  type: array
+                  items: {type: integer}
+                turmas:
+                  type: array
+                  items: {type: integer}
+                professores:
+                  type: array
+                  items: {type: integer}
+              example:
+                turmas: [1, 2]
+                professores: [1]
+        responses:
+          200:
+            description: Ids existentes e inexistentes de cada tabela consultada.
+            schema:
+              type: object
+              properties:
+                existentes:
+                  type: object
+                inexistentes:
+                  type: object
+          400:
+            description: Dados inválidos.
+        """
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'erro': 'Dados inválidos ou faltando.'}), 400
+
+        existentes = {}
+        inexistentes = {}
+        for nome, modelo in MODELOS.items():
+            if nome not in data:
+                continue
+            enviados = data[nome]
+            if not isinstance(enviados, list):
+                return jsonify({'erro': f"O campo '{nome}' deve ser uma lista de ids."}), 400
+
+            convertidos = [ValidacaoController.converter_id(i) for i in enviados]
+            encontrados = ValidacaoController.ids_existentes(modelo, {i for i in convertidos if i is not None})
+            existentes[nome] = [e for e, c in zip(enviados, convertidos) if c in encontrados]
+            inexistentes[nome] = [e for e, c in zip(enviados, convertidos) if c not in encontrados]
+
+        return jsonify({'existentes': existentes, 'inexistentes': inexistentes})
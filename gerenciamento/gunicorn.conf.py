@@ -0,0 +1,61 @@
+# Configuração do gunicorn (modo de produção): gunicorn -c gunicorn.conf.py app:app
+# Todos os valores podem ser trocados por variáveis de ambiente GUNICORN_*.
+import fcntl
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))  # threads por worker
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))  # segundos com a conexão ociosa aberta
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))  # segundos sem resposta até o worker ser reiniciado
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 20))  # segundos para terminar as requisições no shutdown
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))  # reinicia o worker depois de N requisições; 0 desliga
+max_requests_jitter = max_requests // 10
+# Importa o app uma vez no processo principal, antes do fork: os workers sobem mais rápido e
+# compartilham a memória do código já carregado
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+# Sem modo debug e sem tarefas periódicas no import: elas são iniciadas em um só worker, em post_fork
+raw_env = ['FLASK_DEBUG=0', 'TAREFAS_NA_IMPORTACAO=0']
+
+# Métricas do Prometheus somadas entre os workers: cada processo grava as suas em arquivos deste
+# diretório (utils/metricas.py). Precisa existir antes de o app ser importado; por padrão um diretório
+# novo a cada start, para não somar contadores de execuções anteriores
+if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='metricas-')
+
+_trava_tarefas = None
+
+def _obter_trava_tarefas():
+    """Trava de arquivo que elege o worker das tarefas periódicas; se ele morrer, o substituto a herda."""
+    global _trava_tarefas
+    caminho = os.path.join(tempfile.gettempdir(), f'{os.path.basename(os.getcwd())}-{bind.replace(":", "_")}-tarefas.lock')
+    arquivo = open(caminho, 'w')
+    try:
+        fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        arquivo.close()
+        return False
+    _trava_tarefas = arquivo
+    return True
+
+def post_fork(server, worker):
+    from app import app, iniciar_tarefas
+    from models.db import db
+    # As conexões abertas pelo processo principal (create_all) não podem ser usadas pelos filhos
+    with app.app_context():
+        db.engine.dispose(close=False)
+    if _obter_trava_tarefas():
+        server.log.info('Worker %s executa as tarefas periódicas', worker.pid)
+        iniciar_tarefas()
+
+def child_exit(server, worker):
+    # Os medidores (gauges) do worker que saiu deixam de contar; os contadores e histogramas continuam somados
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
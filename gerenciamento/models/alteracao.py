@@ -0,0 +1,119 @@
+from datetime import datetime
+from sqlalchemy import event, insert, literal, select, text
+from sqlalchemy.orm import Session
+from models.db import db
+from models.aluno import Aluno
+from models.turma import Turma
+from models.professor import Professor
+
+# Tabelas publicadas no feed /changes (modelo -> nome usado pelos outros serviços)
+TABELAS_PUBLICADAS = {
+    Aluno: 'alunos',
+    Turma: 'turmas',
+    Professor: 'professores',
+}
+
+class Alteracao(db.Model):
+    """
+    Outbox das alterações em alunos, turmas e professores.
+    Cada linha é gravada na mesma transação da alteração, e o `seq` crescente permite
+    que os outros serviços leiam o feed a partir do último ponto aplicado.
+    O `seq` segue a ordem dos commits (ver _gravar_alteracoes): um leitor que já viu o seq N nunca
+    recebe depois uma linha com seq menor que N, o que faria o feed pular alterações.
+    """
+    __tablename__ = 'alteracoes'
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    seq = db.Column(db.Integer, primary_key=True)
+    tabela = db.Column(db.String(20), nullable=False)
+    registro_id = db.Column(db.Integer, nullable=False)
+    operacao = db.Column(db.String(10), nullable=False)  # 'upsert' ou 'delete'
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Alteracao {self.seq} {self.operacao} {self.tabela}/{self.registro_id}>"
+
+# Chave do advisory lock do PostgreSQL que ordena as gravações no outbox
+TRAVA_OUTBOX = 7203001
+
+def _pendentes(session):
+    return session.info.setdefault('alteracoes_pendentes', [])
+
+@event.listens_for(Session, 'after_flush')
+def registrar_alteracoes(session, flush_context):
+    """
+    Anota as inserções, atualizações e remoções de alunos, turmas e professores deste flush; elas são
+    gravadas no outbox no commit (_gravar_alteracoes).
+    """
+    linhas = []
+    agora = datetime.utcnow()
+    for obj in session.new:
+        tabela = TABELAS_PUBLICADAS.get(type(obj))
+        if tabela:
+            linhas.append({'tabela': tabela, 'registro_id': obj.id, 'operacao': 'upsert', 'criado_em': agora})
+    for obj in session.dirty:
+        tabela = TABELAS_PUBLICADAS.get(type(obj))
+        if tabela and session.is_modified(obj, include_collections=False):
+            linhas.append({'tabela': tabela, 'registro_id': obj.id, 'operacao': 'upsert', 'criado_em': agora})
+    for obj in session.deleted:
+        tabela = TABELAS_PUBLICADAS.get(type(obj))
+        if tabela:
+            linhas.append({'tabela': tabela, 'registro_id': obj.id, 'operacao': 'delete', 'criado_em': agora})
+    if linhas:
+        _pendentes(session).extend(linhas)
+
+@event.listens_for(Session, 'before_commit')
+def _gravar_alteracoes(session):
+    """
+    Grava no outbox as alterações da transação logo antes do commit. Se os `seq` fossem alocados em cada
+    flush, duas transações simultâneas podiam confirmar fora de ordem (a de seq maior primeiro) e um
+    leitor do feed avançaria o `since` para além da outra, sem nunca recebê-la. No PostgreSQL a gravação
+    é feita sob um advisory lock da transação, liberado pelo próprio commit, então quem aloca um seq
+    maior só o faz depois que o anterior confirmou; a espera se limita a este INSERT e ao COMMIT.
+    No SQLite a transação de escrita já é exclusiva até o commit.
+    """
+    session.flush()
+    linhas = session.info.pop('alteracoes_pendentes', None)
+    if not linhas:
+        return
+    conexao = session.connection()
+    if conexao.dialect.name == 'postgresql':
+        conexao.execute(text('SELECT pg_advisory_xact_lock(:chave)'), {'chave': TRAVA_OUTBOX})
+    conexao.execute(insert(Alteracao.__table__), linhas)
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_alteracoes(session):
+    session.info.pop('alteracoes_pendentes', None)
+
+def publicar_alteracoes(modelo, ids, operacao='upsert'):
+    """
+    Anota para o outbox alterações feitas com DML em massa (insert/update/delete com executemany),
+    que não passam pelo flush da sessão e por isso não são vistas por registrar_alteracoes.
+    Deve ser chamada na mesma transação da alteração; a gravação acontece no commit.
+    """
+    if not ids:
+        return
+    agora = datetime.utcnow()
+    _pendentes(db.session()).extend(
+        {'tabela': TABELAS_PUBLICADAS[modelo], 'registro_id': id, 'operacao': operacao, 'criado_em': agora}
+        for id in ids
+    )
+
+def registrar_estado_inicial():
+    """
+    Publica um 'upsert' para cada registro já existente quando o outbox ainda está vazio,
+    para que um serviço que leia o feed desde o início receba a tabela inteira.
+    """
+    if db.session.query(Alteracao.seq).first() is not None:
+        return
+    agora = datetime.utcnow()
+    if db.session.connection().dialect.name == 'postgresql':
+        db.session.execute(text('SELECT pg_advisory_xact_lock(:chave)'), {'chave': TRAVA_OUTBOX})
+    for modelo, tabela in TABELAS_PUBLICADAS.items():
+        db.session.execute(
+            insert(Alteracao).from_select(
+                ['tabela', 'registro_id', 'operacao', 'criado_em'],
+                select(literal(tabela), modelo.id, literal('upsert'), literal(agora, db.DateTime)).order_by(modelo.id)
+            )
+        )
+    db.session.commit()
@@ -0,0 +1,17 @@
+from models.db import db
+
+class ProgressoImportacao(db.Model):
+    """
+    Progresso de uma importação em lotes (utils/importacao.py). É atualizado na mesma transação que grava
+    cada lote, então o lote e o avanço são confirmados juntos ou não são confirmados.
+    """
+    __tablename__ = 'progresso_importacoes'
+
+    chave = db.Column(db.String(1000), primary_key=True)  # por padrão, o caminho absoluto do arquivo importado
+    tamanho = db.Column(db.BigInteger, nullable=False)  # tamanho do arquivo, para não retomar a partir de outro
+    processados = db.Column(db.Integer, nullable=False, default=0)
+    criados = db.Column(db.Integer, nullable=False, default=0)
+    falhas = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ProgressoImportacao {self.chave} {self.processados}>"
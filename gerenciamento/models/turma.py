@@ -12,7 +12,7 @@ class Turma(db.Model):
     professor = db.relationship('Professor', backref='turmas')
 
     # Relacionamento com a tabela Aluno
-    alunos = db.relationship('Aluno', back_populates='turma', lazy=True)
+    alunos = db.relationship('Aluno', back_populates='turma', lazy=True, order_by='Aluno.id')
 
     def __repr__(self):
         return f"<Reserva {self.id}>"
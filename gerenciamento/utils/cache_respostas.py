@@ -0,0 +1,143 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, make_response
+from models.versao import versoes_tabelas, ao_confirmar_alteracoes
+
+class CacheRespostas:
+    """
+    Cache LRU das respostas já serializadas (status, cabeçalhos e corpo) deste processo, limitado em bytes.
+    Cada resposta guarda as versões das tabelas que leu (versoes_tabelas): quando alguma muda, por um
+    commit em qualquer processo, a resposta deixa de valer na próxima consulta. Os commits deste processo
+    também descartam na hora as respostas das tabelas alteradas (invalidar_tabelas).
+    """
+
+    def __init__(self, bytes_maximo, item_maximo):
+        self.bytes_maximo = bytes_maximo
+        self.item_maximo = item_maximo
+        self._itens = OrderedDict()  # chave -> (versões, status, cabeçalhos, corpo)
+        self._por_tabela = {}  # tabela -> chaves das respostas que a leram
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.despejos = 0
+        self.invalidacoes = 0
+
+    def obter(self, chave, versoes):
+        """Retorna (status, cabeçalhos, corpo) guardados para `chave` se foram gerados com as mesmas `versoes`."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] == versoes:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return item[1:]
+            if item is not None:
+                self._remover(chave)
+                self.invalidacoes += 1
+            self.faltas += 1
+            return None
+
+    def guardar(self, chave, versoes, status, cabecalhos, corpo):
+        """Guarda uma resposta; as maiores que item_maximo não são guardadas. Retorna se guardou."""
+        if len(corpo) > self.item_maximo:
+            return False
+        with self._lock:
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = (versoes, status, cabecalhos, corpo)
+            for tabela, _ in versoes:
+                self._por_tabela.setdefault(tabela, set()).add(chave)
+            self.bytes += len(corpo)
+            while self.bytes > self.bytes_maximo:
+                self._remover(next(iter(self._itens)))
+                self.despejos += 1
+        return True
+
+    def _remover(self, chave):
+        versoes, _, _, corpo = self._itens.pop(chave)
+        self.bytes -= len(corpo)
+        for tabela, _ in versoes:
+            chaves = self._por_tabela[tabela]
+            chaves.discard(chave)
+            if not chaves:
+                del self._por_tabela[tabela]
+
+    def invalidar_tabelas(self, tabelas):
+        """Descarta as respostas que leram alguma das `tabelas`."""
+        with self._lock:
+            for tabela in tabelas:
+                for chave in list(self._por_tabela.get(tabela, ())):
+                    self._remover(chave)
+                    self.invalidacoes += 1
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.faltas
+            return {
+                'itens': len(self._itens),
+                'bytes': self.bytes,
+                'bytes_maximo': self.bytes_maximo,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'taxa_acerto': self.acertos / consultas if consultas else None,
+                'despejos': self.despejos,
+                'invalidacoes': self.invalidacoes,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def obter_cache_respostas():
+    """Retorna o cache de respostas do processo, criado na primeira chamada com CACHE_RESPOSTAS_BYTES e CACHE_RESPOSTAS_ITEM_MAXIMO."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = current_app.config
+                _cache = CacheRespostas(config['CACHE_RESPOSTAS_BYTES'], config['CACHE_RESPOSTAS_ITEM_MAXIMO'])
+    return _cache
+
+@ao_confirmar_alteracoes
+def _invalidar(tabelas):
+    if _cache is not None:
+        _cache.invalidar_tabelas(tabelas)
+
+def em_cache(view, *modelos, tabelas_extras=None):
+    """
+    Envolve `view` com o cache de respostas. `modelos` são os modelos cujas tabelas a resposta lê;
+    `tabelas_extras`, se informada, retorna as tabelas lidas a mais nesta requisição (ex. relações de ?include=)
+    e pode levantar ValueError, caso em que a view responde sem cache.
+    A chave é o endpoint com os parâmetros da rota, a query string e o Accept; só respostas 200 completas
+    (sem streaming) são guardadas. Fica desligado com CACHE_RESPOSTAS=0 ou para os endpoints em
+    CACHE_RESPOSTAS_DESLIGADOS.
+    """
+    tabelas_fixas = [modelo.__tablename__ for modelo in modelos]
+
+    @wraps(view)
+    def view_em_cache(**kwargs):
+        config = current_app.config
+        if not config['CACHE_RESPOSTAS_ATIVO'] or request.endpoint in config['CACHE_RESPOSTAS_DESLIGADOS']:
+            return view(**kwargs)
+        try:
+            tabelas = sorted(set(tabelas_fixas).union(tabelas_extras() if tabelas_extras else ()))
+        except ValueError:
+            return view(**kwargs)
+        versoes = versoes_tabelas(tabelas)
+        if len(versoes) < len(tabelas):
+            return view(**kwargs)
+        versoes = tuple((tabela, versoes[tabela][0]) for tabela in tabelas)
+        chave = (request.endpoint, tuple(sorted(kwargs.items())), tuple(sorted(request.args.items(multi=True))),
+                 request.headers.get('Accept', ''))
+
+        cache = obter_cache_respostas()
+        guardada = cache.obter(chave, versoes)
+        if guardada is not None:
+            status, cabecalhos, corpo = guardada
+            return current_app.response_class(corpo, status=status, headers=cabecalhos).make_conditional(request)
+
+        resposta = make_response(view(**kwargs))
+        if resposta.status_code == 200 and not resposta.is_streamed:
+            cache.guardar(chave, versoes, resposta.status_code, list(resposta.headers.items()), resposta.get_data())
+        return resposta
+    return view_em_cache
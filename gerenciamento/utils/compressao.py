@@ -0,0 +1,64 @@
+import zlib
+import brotli
+from flask import request
+
+def _compressor(codificacao, config):
+    """Retorna (comprimir, esvaziar, finalizar) de um compressor novo de `codificacao` ('br' ou 'gzip')."""
+    if codificacao == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESSAO_NIVEL_BROTLI'])
+        return compressor.process, compressor.flush, compressor.finish
+    # wbits=31: formato gzip (cabeçalho e CRC), não o deflate puro
+    compressor = zlib.compressobj(config['COMPRESSAO_NIVEL_GZIP'], zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def _comprimir_stream(partes, codificacao, config):
+    # Cada pedaço do stream é comprimido e enviado na hora (flush), sem esperar o fim da resposta
+    comprimir, esvaziar, finalizar = _compressor(codificacao, config)
+    for parte in partes:
+        if parte:
+            yield comprimir(parte) + esvaziar()
+    yield finalizar()
+
+def _codificacao_aceita(config):
+    # Respeita os pesos q= do Accept-Encoding; em empate vale a ordem de COMPRESSAO_ALGORITMOS
+    return request.accept_encodings.best_match(config['COMPRESSAO_ALGORITMOS'])
+
+def configurar_compressao(app):
+    """
+    Comprime as respostas com brotli ou gzip conforme o Accept-Encoding da requisição.
+    Só são comprimidos os tipos de COMPRESSAO_TIPOS com pelo menos COMPRESSAO_TAMANHO_MINIMO bytes;
+    listagens em streaming (NDJSON) são comprimidas pedaço a pedaço.
+    """
+    config = app.config
+
+    @app.after_request
+    def comprimir_resposta(resposta):
+        if not config['COMPRESSAO_ATIVA'] or resposta.mimetype not in config['COMPRESSAO_TIPOS']:
+            return resposta
+        resposta.vary.add('Accept-Encoding')
+        if (resposta.status_code < 200 or resposta.status_code in (204, 206, 304)
+                or resposta.direct_passthrough or 'Content-Encoding' in resposta.headers):
+            return resposta
+        codificacao = _codificacao_aceita(config)
+        if codificacao is None:
+            return resposta
+
+        if resposta.is_streamed:
+            original = resposta.response
+            resposta.response = _comprimir_stream(resposta.iter_encoded(), codificacao, config)
+            if hasattr(original, 'close'):
+                resposta.call_on_close(original.close)
+            resposta.headers.pop('Content-Length', None)
+        else:
+            dados = resposta.get_data()
+            if len(dados) < config['COMPRESSAO_TAMANHO_MINIMO']:
+                return resposta
+            comprimir, _, finalizar = _compressor(codificacao, config)
+            resposta.set_data(comprimir(dados) + finalizar())
+
+        resposta.headers['Content-Encoding'] = codificacao
+        # O corpo muda com a codificação: um ETag forte deixaria de identificar os bytes enviados
+        etag, fraco = resposta.get_etag()
+        if etag and not fraco:
+            resposta.set_etag(etag, weak=True)
+        return resposta
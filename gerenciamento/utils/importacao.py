@@ -0,0 +1,164 @@
+import csv
+import json
+import os
+from itertools import islice
+import click
+from flask import current_app
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from models.db import db
+from models.importacao import ProgressoImportacao
+
+class ArquivoInvalido(ValueError):
+    """O arquivo de importação não pode ser lido (formato desconhecido ou linha que não é JSON)."""
+
+def ler_registros(caminho, formato):
+    """
+    Lê o arquivo registro a registro, sem carregar tudo em memória.
+    CSV usa a primeira linha como cabeçalho; células vazias viram None. NDJSON tem um objeto JSON por linha.
+    Produz (número da linha no arquivo, registro).
+    """
+    with open(caminho, newline='', encoding='utf-8-sig') as arquivo:
+        if formato == 'csv':
+            leitor = csv.DictReader(arquivo)
+            for registro in leitor:
+                yield leitor.line_num, {campo: (valor if valor != '' else None) for campo, valor in registro.items()}
+        else:
+            for numero, linha in enumerate(arquivo, start=1):
+                if not linha.strip():
+                    continue
+                try:
+                    yield numero, json.loads(linha)
+                except json.JSONDecodeError as e:
+                    raise ArquivoInvalido(f'Linha {numero} não é um JSON válido: {e}')
+
+def _formato(caminho, formato):
+    if formato:
+        return formato
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.csv':
+        return 'csv'
+    if extensao in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    raise ArquivoInvalido(f"Não foi possível deduzir o formato de '{caminho}'; use --formato csv|ndjson.")
+
+class Progresso:
+    """
+    Progresso de uma importação, guardado na tabela progresso_importacoes (ProgressoImportacao).
+    salvar() só altera a linha na sessão: ela é gravada pelo mesmo commit do lote, então uma interrupção
+    em qualquer ponto nunca deixa um lote gravado sem o progresso correspondente (nem o contrário), e a
+    próxima execução pula exatamente os registros já gravados.
+    O tamanho do arquivo importado é guardado para não retomar a partir de um arquivo diferente.
+    """
+
+    def __init__(self, chave, caminho_arquivo):
+        self.chave = chave
+        self.tamanho = os.path.getsize(caminho_arquivo)
+        self.processados = 0
+        self.criados = 0
+        self.falhas = 0
+
+    def carregar(self):
+        registro = db.session.get(ProgressoImportacao, self.chave)
+        if registro is None:
+            return False
+        if registro.tamanho != self.tamanho:
+            raise click.ClickException(
+                f"O progresso salvo para '{self.chave}' é de outro arquivo (tamanho diferente); use --reiniciar."
+            )
+        self.processados = registro.processados
+        self.criados = registro.criados
+        self.falhas = registro.falhas
+        return True
+
+    def salvar(self):
+        db.session.merge(ProgressoImportacao(
+            chave=self.chave, tamanho=self.tamanho, processados=self.processados,
+            criados=self.criados, falhas=self.falhas
+        ))
+
+    def remover(self):
+        db.session.execute(delete(ProgressoImportacao).where(ProgressoImportacao.chave == self.chave))
+        db.session.commit()
+
+def importar(caminho, validar_lote, inserir_lote, tamanho_lote, formato=None, chave_progresso=None,
+             reiniciar=False, caminho_erros=None):
+    """
+    Importa o arquivo em lotes de `tamanho_lote` registros.
+    Para cada lote, `validar_lote(itens)` retorna ({indice: linha} válidas, {indice: (status, erro)}) resolvendo
+    as referências do lote inteiro de uma vez, e `inserir_lote(linhas)` grava as válidas. Cada lote é um commit,
+    que grava também o progresso. Registros rejeitados vão para o arquivo de erros (NDJSON), se informado.
+    A memória usada depende só do tamanho do lote, não do tamanho do arquivo.
+    """
+    formato = _formato(caminho, formato)
+    progresso = Progresso(chave_progresso or os.path.abspath(caminho), caminho)
+    if reiniciar:
+        progresso.remover()
+    if progresso.carregar():
+        click.echo(f'Retomando depois de {progresso.processados} registros.')
+
+    registros = ler_registros(caminho, formato)
+    # Pula os registros já gravados em uma execução anterior
+    for _ in islice(registros, progresso.processados):
+        pass
+
+    erros = open(caminho_erros, 'a', encoding='utf-8') if caminho_erros else None
+    try:
+        while True:
+            lote = list(islice(registros, tamanho_lote))
+            if not lote:
+                break
+            linhas, rejeitados = validar_lote([registro for _, registro in lote])
+            indices = list(linhas)
+            inserir_lote([linhas[indice] for indice in indices])
+            progresso.processados += len(lote)
+            progresso.criados += len(indices)
+            progresso.falhas += len(rejeitados)
+            progresso.salvar()
+            db.session.commit()
+
+            if erros:
+                for indice, (status, erro) in sorted(rejeitados.items()):
+                    numero, registro = lote[indice]
+                    erros.write(json.dumps({'linha': numero, 'erro': erro, 'registro': registro}, default=str) + '\n')
+                erros.flush()
+            click.echo(f'{progresso.processados} registros lidos, {progresso.criados} criados, {progresso.falhas} rejeitados.')
+    finally:
+        if erros:
+            erros.close()
+        db.session.rollback()
+    return progresso
+
+def registrar_comando_importacao(app, nome, validar_lote, inserir_lote, descricao):
+    """Registra `flask <nome> ARQUIVO` para importar um CSV/NDJSON com as funções de lote de um controller."""
+
+    @app.cli.command(nome, help=descricao)
+    @click.argument('arquivo', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--formato', type=click.Choice(['csv', 'ndjson']), help='Formato do arquivo (padrão: pela extensão).')
+    @click.option('--lote', 'tamanho_lote', type=click.IntRange(min=1), help='Registros por commit (padrão: IMPORTACAO_LOTE).')
+    @click.option('--progresso', 'chave_progresso', help='Nome do progresso salvo no banco (padrão: caminho absoluto do ARQUIVO).')
+    @click.option('--reiniciar', is_flag=True, help='Ignora o progresso salvo e importa desde o início.')
+    @click.option('--erros', 'caminho_erros', type=click.Path(dir_okay=False), help='Grava os registros rejeitados neste arquivo NDJSON.')
+    def comando(arquivo, formato, tamanho_lote, chave_progresso, reiniciar, caminho_erros):
+        try:
+            progresso = importar(
+                arquivo, validar_lote, inserir_lote,
+                tamanho_lote or current_app.config['IMPORTACAO_LOTE'],
+                formato=formato, chave_progresso=chave_progresso,
+                reiniciar=reiniciar, caminho_erros=caminho_erros
+            )
+        except ArquivoInvalido as e:
+            raise click.ClickException(str(e))
+        except OSError as e:
+            # Inclui as falhas de rede ao validar referências (RequestException é um OSError)
+            raise click.ClickException(f'Importação interrompida: {e}. Rode o comando de novo para continuar de onde parou.')
+        except IntegrityError as e:
+            # Conflito com uma gravação concorrente (ex. reserva criada entre a validação e o commit do lote):
+            # o lote e o seu progresso foram desfeitos juntos, e na próxima execução ele é validado de novo
+            raise click.ClickException(
+                f'Importação interrompida: conflito ao gravar um lote ({e.orig}). '
+                'Rode o comando de novo para continuar de onde parou.'
+            )
+        click.echo(f'Importação concluída: {progresso.criados} criados, {progresso.falhas} rejeitados.')
+
+    return comando
@@ -0,0 +1,74 @@
+import os
+import time
+from flask import g, request
+from sqlalchemy import event
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+from models.db import db
+
+# Com o gunicorn, cada worker grava as métricas em arquivos de PROMETHEUS_MULTIPROC_DIR (definido no
+# gunicorn.conf.py) e o /metrics soma as de todos os workers
+REQUISICOES = Counter('http_requests_total', 'Requisições HTTP atendidas, por endpoint, método e status.',
+                      ['endpoint', 'method', 'status'])
+LATENCIA = Histogram('http_request_duration_seconds', 'Tempo até a resposta HTTP ficar pronta (sem o envio de streams), por endpoint.',
+                     ['endpoint', 'method'])
+EM_ANDAMENTO = Gauge('http_requests_in_progress', 'Requisições HTTP sendo atendidas agora.',
+                     multiprocess_mode='livesum')
+CONSULTAS = Histogram('db_query_duration_seconds', 'Tempo das consultas ao banco, por operação (SELECT, INSERT...).',
+                      ['operation'], buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5))
+
+OPERACOES = {'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH'}
+
+def observar_consulta(sql, duracao):
+    """Registra uma consulta ao banco; chamada pelos eventos do engine."""
+    operacao = sql.lstrip()[:6].upper()
+    CONSULTAS.labels(operacao if operacao in OPERACOES else 'OTHER').observe(duracao)
+
+def _instrumentar_banco(engine):
+    # O início fica no contexto da execução, descartado junto com ele se a consulta falhar
+    @event.listens_for(engine, 'before_cursor_execute')
+    def iniciar_consulta(conexao, cursor, sql, parametros, contexto, executemany):
+        contexto._inicio_metricas = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def finalizar_consulta(conexao, cursor, sql, parametros, contexto, executemany):
+        observar_consulta(sql, time.perf_counter() - contexto._inicio_metricas)
+
+def configurar_metricas(app):
+    """
+    Coleta as métricas das requisições (contagem, latência e em andamento, por endpoint) e das consultas
+    ao banco do app. Retorna False sem fazer nada se METRICAS_ATIVAS estiver desligado.
+    """
+    if not app.config['METRICAS_ATIVAS']:
+        return False
+    with app.app_context():
+        _instrumentar_banco(db.engine)
+
+    @app.before_request
+    def iniciar_requisicao():
+        g.inicio_metricas = time.perf_counter()
+        EM_ANDAMENTO.inc()
+
+    @app.after_request
+    def registrar_requisicao(resposta):
+        inicio = g.get('inicio_metricas')
+        if inicio is not None:
+            # Rotas inexistentes (404) ficam todas no mesmo endpoint, para não criar uma série por URL
+            endpoint = request.endpoint or 'nao_encontrado'
+            LATENCIA.labels(endpoint, request.method).observe(time.perf_counter() - inicio)
+            REQUISICOES.labels(endpoint, request.method, resposta.status_code).inc()
+        return resposta
+
+    @app.teardown_request
+    def finalizar_requisicao(erro):
+        if g.pop('inicio_metricas', None) is not None:
+            EM_ANDAMENTO.dec()
+    return True
+
+def exportar():
+    """Retorna (corpo, content type) das métricas no formato de texto do Prometheus."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return generate_latest(registro), CONTENT_TYPE_LATEST
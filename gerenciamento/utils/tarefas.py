@@ -0,0 +1,24 @@
+import threading
+import time
+from models.db import db
+
+def iniciar_tarefa_periodica(app, nome, intervalo, funcao):
+    """
+    Roda `funcao` a cada `intervalo` segundos em uma thread daemon, dentro do contexto da aplicação.
+    Erros são registrados no log e não interrompem a tarefa.
+    """
+    def executar():
+        while True:
+            with app.app_context():
+                try:
+                    funcao()
+                except Exception:
+                    app.logger.exception('Falha na tarefa periódica %s', nome)
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            time.sleep(intervalo)
+
+    thread = threading.Thread(target=executar, name=nome, daemon=True)
+    thread.start()
+    return thread
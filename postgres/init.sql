@@ -0,0 +1,5 @@
+-- Executado pelo container do PostgreSQL na primeira inicialização (docker-compose.postgres.yml):
+-- um banco para cada serviço.
+CREATE DATABASE gerenciamento;
+CREATE DATABASE reservas;
+CREATE DATABASE atividades;
@@ -1,26 +1,89 @@
 import os
+import threading
 from model.reservas import Reserva
-from model.db import db
+from model.db import db, criar_indices, configurar_sqlite, manutencao_sqlite
+from model.replica import ReplicaReferencia, EstadoSincronizacao
+from model.versao import VersaoTabela, registrar_versoes
 from controller.reservas_controller import reservaController
+from controller.diagnostico_controller import diagnosticoController
 from flask import Flask
+from service.sincronizacao import sincronizar
+from service.tarefas import iniciar_tarefa_periodica
+from utils.importacao import registrar_comando_importacao
+from utils.compressao import configurar_compressao
+from utils.json_rapido import configurar_json
+from utils.cache_respostas import em_cache
+from utils.metricas import configurar_metricas
+from utils.consultas import configurar_consultas
 from config import Config
 from flasgger import Swagger
 
 app = Flask(__name__)
 app.config.from_object(Config)
+configurar_json(app)
 db.init_app(app)
+sqlite = configurar_sqlite(app)
 swagger = Swagger(app)
+configurar_compressao(app)
+configurar_metricas(app)
+configurar_consultas(app)
 
 with app.app_context():
     db.create_all()
+    criar_indices()
+    registrar_versoes(Reserva)
 
 app.add_url_rule('/criar_reserva', view_func=reservaController.criar,methods = ['POST'],endpoint='criar_reserva')
 
-app.add_url_rule('/lista_reserva', view_func = reservaController.listar,methods = ['GET'],endpoint = 'listar_reserva')
+app.add_url_rule('/lista_reserva', view_func = em_cache(reservaController.listar, Reserva),methods = ['GET'],endpoint = 'listar_reserva')
 
 app.add_url_rule('/atualiza_reserva/<int:id>', view_func=reservaController.atualizar,methods = ['PUT'],endpoint= 'atualiza_reserva')
 
 app.add_url_rule('/deletar_reserva/<int:id>', view_func=reservaController.deletar,methods = ['DELETE'],endpoint= 'deletar_reserva')
 
+app.add_url_rule('/disponibilidade', view_func=reservaController.disponibilidade,methods = ['GET'],endpoint= 'disponibilidade')
+
+app.add_url_rule('/diagnostico/cache_referencia', view_func=diagnosticoController.cache_referencia,methods = ['GET'],endpoint= 'cache_referencia')
+
+app.add_url_rule('/diagnostico/upstreams', view_func=diagnosticoController.upstreams,methods = ['GET'],endpoint= 'upstreams')
+
+app.add_url_rule('/diagnostico/cache_respostas', view_func=diagnosticoController.cache_respostas,methods = ['GET'],endpoint= 'cache_respostas')
+
+app.add_url_rule('/metrics', view_func=diagnosticoController.metricas,methods = ['GET'],endpoint= 'metrics')
+
+@app.cli.command('sincronizar')
+def sincronizar_comando():
+    """Aplica na réplica local o feed de alterações do gerenciamento, uma vez."""
+    print(f'{sincronizar()} alterações aplicadas.')
+
+registrar_comando_importacao(app, 'importar_reservas', reservaController.validar_lote, reservaController.inserir_lote,
+                             'Importa reservas de um arquivo CSV ou NDJSON, validando as turmas no gerenciamento.')
+
+_tarefas_iniciadas = False
+_tarefas_lock = threading.Lock()
+
+def iniciar_tarefas():
+    """
+    Inicia as tarefas periódicas do serviço, uma única vez por processo.
+    No gunicorn elas rodam em um único worker (gunicorn.conf.py).
+    """
+    global _tarefas_iniciadas
+    with _tarefas_lock:
+        if _tarefas_iniciadas:
+            return
+        _tarefas_iniciadas = True
+    if app.config['SINCRONIZACAO_INTERVALO']:
+        iniciar_tarefa_periodica(app, 'sincronizacao', app.config['SINCRONIZACAO_INTERVALO'], sincronizar)
+    if sqlite and app.config['SQLITE_MANUTENCAO_INTERVALO']:
+        iniciar_tarefa_periodica(app, 'manutencao_sqlite', app.config['SQLITE_MANUTENCAO_INTERVALO'], manutencao_sqlite)
+
+if app.config['TAREFAS_NA_IMPORTACAO']:
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        # Pela CLI do Flask o app é importado também pelos comandos (flask sincronizar, flask importar_*...),
+        # que rodariam junto com as tarefas: elas só começam na primeira requisição, o que só acontece no flask run
+        app.before_request(iniciar_tarefas)
+    else:
+        iniciar_tarefas()
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
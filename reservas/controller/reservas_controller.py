@@ -1,15 +1,35 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from model.db import db
 from model.reservas import Reserva
-import requests
+from service import gerenciamento
+from utils.listagem import listar, Filtro
+from utils import lote
+from sqlalchemy import insert, select, func, tuple_
+from sqlalchemy.exc import IntegrityError
 from datetime import date
-from requests.exceptions import RequestException, HTTPError, JSONDecodeError, ConnectionError
+from requests.exceptions import RequestException, HTTPError
 
-url = 'http://api_gerenciamento:5000/lista_turmas'
-url_reserva = 'http://api_reserva:5001/lista_reserva'
+# Quantidade máxima de pares (sala, data) por consulta IN (o SQLite limita o número de parâmetros)
+TAMANHO_LOTE_IN = 400
 
 class reservaController:
 
+    # Campos das listagens (nome no JSON -> coluna), também aceitos em ?fields=
+    CAMPOS = {
+        'id': Reserva.id,
+        'num_sala': Reserva.num_sala,
+        'lab': Reserva.lab,
+        'data': Reserva.data,
+        'id_turma': Reserva.id_turma
+    }
+
+    # Filtros aceitos na listagem (parâmetro da query string -> Filtro), todos com índice
+    FILTROS = {
+        'num_sala': Filtro(Reserva.num_sala),
+        'data_inicio': Filtro(Reserva.data, '>='),
+        'data_fim': Filtro(Reserva.data, '<=')
+    }
+
     @staticmethod
     def listar():
         """
@@ -17,9 +37,52 @@ class reservaController:
     ---
     tags:
       - Reservas
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Itens por página (padrão 100, máximo 1000).
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor da página anterior (id do último item recebido, também enviado em X-Proximo-Cursor).
+      - name: todos
+        in: query
+        type: boolean
+        required: false
+        description: Se verdadeiro, devolve todos os registros sem paginação.
+      - name: stream
+        in: query
+        type: boolean
+        required: false
+        description: Se verdadeiro (ou com Accept application/x-ndjson), envia NDJSON em streaming, um registro por linha.
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Lista de campos separados por vírgula (ex. id,nome); só essas colunas são lidas do banco.
+      - name: num_sala
+        in: query
+        type: integer
+        required: false
+        description: Só as reservas desta sala.
+      - name: data_inicio
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Só reservas a partir deste dia (AAAA-MM-DD).
+      - name: data_fim
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Só reservas até este dia, inclusive (AAAA-MM-DD).
     responses:
       200:
-        description: Uma lista de todas as reservas.
+        description: Uma página da lista de reservas, ordenada por id.
         schema:
           type: array
           items:
@@ -45,16 +108,7 @@ class reservaController:
               type: string
         """
         try:
-            reservas = Reserva.query.all()
-            return jsonify([
-                {
-                    'id': t.id,
-                    'num_sala': t.num_sala,
-                    'lab': t.lab,
-                    'data': t.data.isoformat(),
-                    'id_turma': t.id_turma
-                } for t in reservas
-            ])
+            return listar(reservaController.CAMPOS, Reserva.id, reservaController.FILTROS)
         except Exception as e:
             return jsonify({'erro': f'Falha ao listar reservas: Erro interno do servidor local. Detalhes: {str(e)}'}), 500
 
@@ -102,6 +156,8 @@ class reservaController:
         description: Dados inválidos ou faltando verifique formato da data ou campos.
       404:
         description: A turma id_turma não foi encontrada no serviço externo.
+      409:
+        description: A sala já está reservada nessa data.
       500:
         description: Erro interno do servidor falha de conexão com serviço externo, etc..
     """
@@ -115,20 +171,12 @@ class reservaController:
             }
         except (KeyError, TypeError, ValueError):
             return jsonify({'erro': 'Dados inválidos ou faltando (verifique a presença de num_sala, lab, data, id_turma e o formato da data AAAA-MM-DD).'}), 400
+        conflito = reservaController.conflito(reserva_data['num_sala'], reserva_data['data'])
+        if conflito is not None:
+            return reservaController.responder_conflito(reserva_data['num_sala'], reserva_data['data'], conflito)
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status() 
-          
-            turmas = response.json()
-            
             id_turma_enviada = reserva_data['id_turma']
-            recebido = False
-            for i in turmas:
-                if str(i.get('id')) == str(id_turma_enviada): 
-                    recebido = True
-                    break
-            
-            if not recebido:
+            if not gerenciamento.existe('turma', id_turma_enviada):
                 return jsonify({'erro': f'A turma com ID {id_turma_enviada} não existe.'}), 404
             reserva = Reserva(
                 num_sala = reserva_data['num_sala'],
@@ -139,11 +187,12 @@ class reservaController:
             db.session.add(reserva)
             db.session.commit()
             return jsonify({'mensagem': 'reserva adicionada com sucesso!'}), 201
-        
-        except JSONDecodeError:
-            status = response.status_code if 'response' in locals() else 'N/A'
-            return jsonify({'erro': f'Falha no serviço de turmas. O servidor {url} retornou o status {status}, mas o conteúdo não é JSON válido.'}), 500
-        
+
+        except IntegrityError:
+            # Outra requisição reservou a mesma sala e data entre a verificação e o commit
+            db.session.rollback()
+            return reservaController.responder_conflito(reserva_data['num_sala'], reserva_data['data'])
+
         except HTTPError as e:
             return jsonify({'erro': f'Falha na validação da turma: O serviço externo retornou um erro HTTP {e.response.status_code}.'}), 500
         
@@ -153,12 +202,86 @@ class reservaController:
         except Exception as e:
             return jsonify({'erro': f'Erro interno desconhecido ao tentar criar a reserva: {str(e)}'}), 500
 
+    @staticmethod
+    def conflito(num_sala, data, ignorar_id=None):
+        """Retorna o id da reserva que já ocupa a sala na data (busca pelo índice único), ou None."""
+        consulta = select(Reserva.id).where(Reserva.num_sala == num_sala, Reserva.data == data)
+        if ignorar_id is not None:
+            consulta = consulta.where(Reserva.id != ignorar_id)
+        return db.session.execute(consulta.limit(1)).scalar()
+
+    @staticmethod
+    def responder_conflito(num_sala, data, id_conflito=None):
+        resposta = {'erro': f'A sala {num_sala} já está reservada em {data.isoformat()}.'}
+        if id_conflito is not None:
+            resposta['reserva_existente'] = id_conflito
+        return jsonify(resposta), 409
+
+    @staticmethod
+    def ocupadas(chaves):
+        """Dos pares (num_sala, data) informados, retorna o conjunto dos que já têm reserva, com uma consulta IN por lote."""
+        chaves = list(chaves)
+        encontradas = set()
+        for inicio in range(0, len(chaves), TAMANHO_LOTE_IN):
+            consulta = select(Reserva.num_sala, Reserva.data).where(
+                tuple_(Reserva.num_sala, Reserva.data).in_(chaves[inicio:inicio + TAMANHO_LOTE_IN])
+            )
+            encontradas.update(tuple(linha) for linha in db.session.execute(consulta))
+        return encontradas
+
+    @staticmethod
+    def converter_lote(item):
+        """Converte um item de lote nas colunas de Reserva; levanta lote.ItemInvalido se algo estiver errado."""
+        return {
+            'num_sala': lote.inteiro(item, 'num_sala'),
+            'lab': lote.booleano(item, 'lab'),
+            'data': lote.data(item, 'data'),
+            'id_turma': lote.inteiro(item, 'id_turma')
+        }
+
+    @staticmethod
+    def validar_lote(itens):
+        """
+        Converte os itens, rejeita (409) as salas já reservadas na mesma data e valida as turmas de todos
+        eles com uma única validação no gerenciamento. Retorna (linhas, erros); levanta RequestException se o gerenciamento falhar.
+        """
+        linhas, erros = lote.converter_itens(itens, reservaController.converter_lote)
+
+        # Conflitos de sala e data dentro do próprio lote e com as reservas já gravadas
+        chaves = {}
+        for indice in list(linhas):
+            chave = (linhas[indice]['num_sala'], linhas[indice]['data'])
+            if chave in chaves:
+                linhas.pop(indice)
+                erros[indice] = (409, f'A sala {chave[0]} já está reservada em {chave[1].isoformat()} (item {chaves[chave]} do lote).')
+            else:
+                chaves[chave] = indice
+        for chave in reservaController.ocupadas(chaves):
+            linhas.pop(chaves[chave])
+            erros[chaves[chave]] = (409, f'A sala {chave[0]} já está reservada em {chave[1].isoformat()}.')
+
+        faltando = gerenciamento.inexistentes(turmas=sorted({linha['id_turma'] for linha in linhas.values()}))
+        lote.rejeitar_referencias(
+            linhas, erros, 'id_turma', {int(id) for id in faltando.get('turmas', [])},
+            'A turma com ID {} não existe.'
+        )
+        return linhas, erros
+
+    @staticmethod
+    def inserir_lote(linhas):
+        """Insere as linhas (já validadas) com um único executemany e retorna os ids na ordem das linhas. Não faz commit."""
+        if not linhas:
+            return []
+        return db.session.execute(
+            insert(Reserva).returning(Reserva.id, sort_by_parameter_order=True), linhas
+        ).scalars().all()
+
 
     @staticmethod
     def atualizar(id):
         """
     Atualiza uma reserva existente pelo seu ID.
-    Valida a turma e a reserva em serviços externos.
+    Valida a turma no serviço de gerenciamento.
     ---
     tags:
       - Reservas
@@ -194,7 +317,9 @@ class reservaController:
       400:
         description: Dados inválidos (ex formato de data).
       404:
-        description: Reserva, Turma ou ID externo não encontrado.
+        description: Reserva ou Turma não encontrada.
+      409:
+        description: A sala já está reservada nessa data por outra reserva.
       500:
         description: Erro interno ou falha de comunicação com serviços externos.
     """
@@ -202,33 +327,10 @@ class reservaController:
         data = request.get_json()
         
         try:
-            response_turma = requests.get(url, timeout=5)
-            response_turma.raise_for_status()
-            turmas = response_turma.json()
-            
             id_turma_enviada = data.get('id_turma', reserva.id_turma) 
-            recebido_turma = False
-            for i in turmas:
-                if str(i.get('id')) == str(id_turma_enviada):
-                    recebido_turma = True
-                    break
-            
-            if not recebido_turma:
+            if not gerenciamento.existe('turma', id_turma_enviada):
                 return jsonify({'erro': f'Não foi possível atualizar a reserva, a turma com ID {id_turma_enviada} não existe.'}), 404
 
-            response_reserva = requests.get(url_reserva, timeout=5)
-            response_reserva.raise_for_status()
-            reservas = response_reserva.json()
-            
-            recebido_reserva = False
-            for r in reservas:
-                if r.get('id') == id:
-                    recebido_reserva = True
-                    break
-            
-            if not recebido_reserva:
-                return jsonify({'erro': f'Não foi possível atualizar a reserva, o ID {id} não existe no serviço externo.'}), 404
-
             reserva.num_sala = data.get('num_sala', reserva.num_sala)
             reserva.lab = data.get('lab', reserva.lab)
             
@@ -236,16 +338,24 @@ class reservaController:
                  reserva.data = date.fromisoformat(data['data'])
             
             reserva.id_turma = data.get('id_turma', reserva.id_turma)
-            
+
+            # Guarda os valores novos: depois de um rollback o objeto volta aos valores do banco
+            num_sala, dia = reserva.num_sala, reserva.data
+            with db.session.no_autoflush:
+                conflito = reservaController.conflito(num_sala, dia, ignorar_id=id)
+            if conflito is not None:
+                db.session.rollback()
+                return reservaController.responder_conflito(num_sala, dia, conflito)
             db.session.commit()
             return jsonify({'mensagem': 'Reserva atualizada com sucesso!'})
-        
+
+        except IntegrityError:
+            db.session.rollback()
+            return reservaController.responder_conflito(num_sala, dia)
+
         except (KeyError, TypeError, ValueError) as e:
             return jsonify({'erro': f'Dados inválidos ou faltando (verifique o formato da data AAAA-MM-DD e se o JSON está completo): {str(e)}'}), 400
         
-        except JSONDecodeError as e:
-            return jsonify({'erro': f'Falha ao processar a resposta de um serviço externo. O conteúdo retornado não é JSON válido. Detalhes: {str(e)}'}), 500
-        
         except HTTPError as e:
             return jsonify({'erro': f'Falha na validação: Um serviço externo retornou um erro HTTP {e.response.status_code}.'}), 500
         
@@ -280,3 +390,95 @@ class reservaController:
             return jsonify({'mensagem': 'Reserva deletada com sucesso!'})
         except Exception as e:
             return jsonify({'erro': f'Falha ao deletar reserva: {str(e)}'}), 500
+
+    @staticmethod
+    def salas_conhecidas():
+        """
+        Salas que já tiveram alguma reserva.
+        Em vez de um DISTINCT sobre o histórico inteiro, pula de sala em sala pelo índice (num_sala, data) com
+        uma CTE recursiva: cada "menor sala maior que a anterior" é uma busca no índice, então o custo depende
+        do número de salas e não do número de reservas.
+        """
+        salas = select(func.min(Reserva.num_sala).label('num_sala')).cte('salas', recursive=True)
+        proxima = select(func.min(Reserva.num_sala)).where(Reserva.num_sala > salas.c.num_sala).scalar_subquery()
+        salas = salas.union_all(select(proxima).where(salas.c.num_sala.is_not(None)))
+        return db.session.execute(select(salas.c.num_sala).where(salas.c.num_sala.is_not(None))).scalars().all()
+
+    @staticmethod
+    def disponibilidade():
+        """
+        Salas livres em um período.
+        Lê só as reservas do período, pelo índice (data, num_sala), então o custo não cresce com o histórico.
+    ---
+    tags:
+      - Reservas
+    parameters:
+      - name: inicio
+        in: query
+        type: string
+        format: date
+        required: true
+        description: Primeiro dia do período (AAAA-MM-DD).
+      - name: fim
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Último dia do período, inclusive (padrão, o próprio início).
+      - name: salas
+        in: query
+        type: string
+        required: false
+        description: Salas a considerar, separadas por vírgula (padrão, todas as salas que já tiveram reserva).
+    responses:
+      200:
+        description: Salas livres no período inteiro e dias ocupados das demais.
+        schema:
+          type: object
+          properties:
+            inicio:
+              type: string
+              format: date
+            fim:
+              type: string
+              format: date
+            salas_livres:
+              type: array
+              items:
+                type: integer
+            ocupadas:
+              type: object
+              description: Para cada sala com reserva no período, a lista de dias ocupados.
+      400:
+        description: Datas ou salas inválidas, ou período maior que o permitido.
+        """
+        try:
+            inicio = date.fromisoformat(request.args['inicio'])
+            fim = date.fromisoformat(request.args.get('fim', request.args['inicio']))
+            salas = request.args.get('salas')
+            salas = [int(sala) for sala in salas.split(',') if sala.strip()] if salas else None
+        except KeyError:
+            return jsonify({'erro': "O parâmetro 'inicio' é obrigatório (AAAA-MM-DD)."}), 400
+        except ValueError:
+            return jsonify({'erro': 'Parâmetros inválidos (datas no formato AAAA-MM-DD e salas como números separados por vírgula).'}), 400
+        if fim < inicio:
+            return jsonify({'erro': "O parâmetro 'fim' deve ser igual ou posterior a 'inicio'."}), 400
+        maximo = current_app.config['DISPONIBILIDADE_MAXIMO_DIAS']
+        if (fim - inicio).days + 1 > maximo:
+            return jsonify({'erro': f'O período pode ter no máximo {maximo} dias.'}), 400
+
+        consulta = select(Reserva.num_sala, Reserva.data).where(Reserva.data.between(inicio, fim))
+        if salas is not None:
+            consulta = consulta.where(Reserva.num_sala.in_(salas))
+        ocupadas = {}
+        for num_sala, dia in db.session.execute(consulta.order_by(Reserva.data)):
+            ocupadas.setdefault(num_sala, []).append(dia.isoformat())
+
+        if salas is None:
+            salas = reservaController.salas_conhecidas()
+        return jsonify({
+            'inicio': inicio.isoformat(),
+            'fim': fim.isoformat(),
+            'salas_livres': sorted(sala for sala in set(salas) if sala not in ocupadas),
+            'ocupadas': {str(sala): dias for sala, dias in sorted(ocupadas.items())}
+        })
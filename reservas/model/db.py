@@ -1,4 +1,61 @@
-
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+db = SQLAlchemy()
+
+def criar_indices():
+    """
+    Cria os índices declarados nos modelos que ainda não existem no banco.
+    O create_all só cria índices junto com tabelas novas; em um banco que já existia, os índices
+    adicionados depois precisam ser criados aqui.
+    Um índice único que esbarra em dados duplicados não é criado: o serviço sobe mesmo assim e avisa no log.
+    """
+    for tabela in db.metadata.sorted_tables:
+        for indice in tabela.indexes:
+            try:
+                indice.create(db.engine, checkfirst=True)
+            except IntegrityError:
+                current_app.logger.warning(
+                    'Índice único %s não foi criado: a tabela %s tem linhas duplicadas. '
+                    'Remova as duplicatas e reinicie o serviço.', indice.name, tabela.name
+                )
+
+
+def configurar_sqlite(app):
+    """
+    Aplica o perfil SQLITE_PRAGMAS (WAL, synchronous, cache, mmap, busy_timeout...) a cada conexão nova
+    do engine. Deve ser chamada logo depois de db.init_app, antes de qualquer conexão ser aberta.
+    Retorna False (e não faz nada) se o banco configurado não for SQLite.
+    """
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return False
+    pragmas = app.config['SQLITE_PRAGMAS']
+
+    @event.listens_for(engine, 'connect')
+    def aplicar_pragmas(conexao_dbapi, registro):
+        cursor = conexao_dbapi.cursor()
+        try:
+            for nome, valor in pragmas.items():
+                cursor.execute(f'PRAGMA {nome} = {valor}')
+        finally:
+            cursor.close()
+
+    # Conexões abertas antes do listener (se houver) são descartadas para receberem o perfil
+    engine.dispose()
+    return True
 
-db = SQLAlchemy()
\ No newline at end of file
+def manutencao_sqlite():
+    """
+    Manutenção periódica do SQLite: checkpoint do WAL, para o arquivo -wal não crescer sem limite quando
+    sempre há leitores, e PRAGMA optimize, que atualiza as estatísticas do planejador quando necessário.
+    """
+    with db.engine.connect() as conexao:
+        bloqueado, paginas, copiadas = conexao.exec_driver_sql(
+            f"PRAGMA wal_checkpoint({current_app.config['SQLITE_CHECKPOINT_MODO']})"
+        ).one()
+        conexao.exec_driver_sql('PRAGMA optimize')
+    current_app.logger.debug('Checkpoint do WAL: %s de %s páginas copiadas (bloqueado=%s)', copiadas, paginas, bloqueado)
@@ -2,6 +2,12 @@ from model.db import db
 
 class Reserva(db.Model):
     __tablename__ = 'reserva'
+    __table_args__ = (
+        # Uma sala só pode ter uma reserva por dia; o índice também atende as buscas por sala
+        db.Index('ix_reserva_sala_data', 'num_sala', 'data', unique=True),
+        # Buscas por período (disponibilidade e filtros data_inicio/data_fim) só com o índice
+        db.Index('ix_reserva_data_sala', 'data', 'num_sala'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     num_sala = db.Column(db.Integer, nullable=False)
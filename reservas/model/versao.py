@@ -0,0 +1,131 @@
+from datetime import datetime, timezone
+from itertools import chain
+from flask import current_app
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.orm import Session
+from model.db import db
+
+class VersaoTabela(db.Model):
+    """
+    Versão de uma tabela: incrementada (com o horário) logo depois de toda transação que altera a tabela.
+    Serve de ETag/Last-Modified das listagens sem precisar consultar a tabela em si.
+    """
+    __tablename__ = 'versoes_tabelas'
+
+    tabela = db.Column(db.String(100), primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=1)
+    atualizado_em = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<VersaoTabela {self.tabela} v{self.versao}>"
+
+# Tabelas com versão, definidas por registrar_versoes
+_versionadas = set()
+# Funções chamadas com as tabelas alteradas depois de cada commit (ver ao_confirmar_alteracoes)
+_ouvintes_commit = []
+
+def _agora():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def registrar_versoes(*modelos):
+    """Passa a versionar as tabelas dos modelos e cria a linha de versão das que ainda não têm."""
+    nomes = {modelo.__tablename__ for modelo in modelos}
+    _versionadas.update(nomes)
+    existentes = set(db.session.execute(select(VersaoTabela.tabela).where(VersaoTabela.tabela.in_(nomes))).scalars())
+    faltando = sorted(nomes - existentes)
+    if faltando:
+        db.session.execute(insert(VersaoTabela), [
+            {'tabela': nome, 'versao': 1, 'atualizado_em': _agora()} for nome in faltando
+        ])
+    db.session.commit()
+
+def versoes_tabelas(nomes):
+    """Retorna {tabela: (versão, atualizado_em)} das tabelas pedidas, com uma consulta pela chave primária."""
+    return {
+        tabela: (versao, atualizado_em)
+        for tabela, versao, atualizado_em in db.session.execute(
+            select(VersaoTabela.tabela, VersaoTabela.versao, VersaoTabela.atualizado_em)
+            .where(VersaoTabela.tabela.in_(nomes))
+        )
+    }
+
+def ao_confirmar_alteracoes(funcao):
+    """
+    Registra `funcao(tabelas)`, chamada neste processo depois de cada commit que alterou tabelas versionadas.
+    Outros processos só percebem a alteração pela versão no banco (versoes_tabelas).
+    """
+    _ouvintes_commit.append(funcao)
+    return funcao
+
+def _marcar(session, tabelas):
+    tabelas = {tabela for tabela in tabelas if tabela in _versionadas}
+    if tabelas:
+        session.info.setdefault('tabelas_alteradas', set()).update(tabelas)
+
+@event.listens_for(Session, 'after_flush')
+def _alteracoes_do_flush(session, flush_context):
+    _marcar(session, (
+        obj.__table__.name for obj in chain(session.new, session.deleted, session.dirty)
+        if hasattr(obj, '__table__') and (obj not in session.dirty or session.is_modified(obj))
+    ))
+
+@event.listens_for(Session, 'do_orm_execute')
+def _alteracoes_em_massa(estado):
+    # INSERT/UPDATE/DELETE em massa (executemany, bulk update) não passam pelo flush
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        tabela = getattr(estado.statement, 'table', None)
+        if tabela is not None:
+            _marcar(estado.session, [tabela.name])
+
+@event.listens_for(Session, 'before_commit')
+def _separar_alteracoes(session):
+    """
+    Separa as tabelas alteradas na transação que vai ser confirmada. O flush é feito aqui para que as
+    alterações pendentes também sejam contadas.
+    """
+    session.flush()
+    tabelas = session.info.pop('tabelas_alteradas', None)
+    if tabelas:
+        session.info['tabelas_confirmadas'] = tabelas
+
+def _incrementar_versoes(engine, tabelas):
+    """
+    Incrementa as versões das `tabelas` em uma transação curta e própria, depois do commit dos dados.
+    Dentro do commit, o UPDATE na linha da tabela segurava o lock dela até o fim da transação e
+    serializava no Postgres todas as escritas na mesma tabela. Como a versão só muda depois que os dados
+    ficam visíveis, quem lê a versão antes dos dados nunca associa dados antigos a uma versão nova.
+    """
+    agora = _agora()
+    with engine.begin() as conexao:
+        resultado = conexao.execute(
+            update(VersaoTabela.__table__)
+            .where(VersaoTabela.__table__.c.tabela.in_(tabelas))
+            .values(versao=VersaoTabela.__table__.c.versao + 1, atualizado_em=agora)
+        )
+        if resultado.rowcount != len(tabelas):
+            # Tabela sem linha de versão (ex. apagada à mão): recria
+            existentes = set(conexao.execute(
+                select(VersaoTabela.__table__.c.tabela).where(VersaoTabela.__table__.c.tabela.in_(tabelas))
+            ).scalars())
+            conexao.execute(insert(VersaoTabela.__table__), [
+                {'tabela': nome, 'versao': 1, 'atualizado_em': agora} for nome in sorted(tabelas - existentes)
+            ])
+
+@event.listens_for(Session, 'after_commit')
+def _notificar_alteracoes(session):
+    tabelas = session.info.pop('tabelas_confirmadas', None)
+    if not tabelas:
+        return
+    try:
+        _incrementar_versoes(session.get_bind(), tabelas)
+    except Exception:
+        # Os dados já foram confirmados: uma falha aqui não pode parecer falha do commit para quem o chamou.
+        # As respostas dessas tabelas em cache nos outros processos só mudam na próxima alteração delas.
+        current_app.logger.exception('Falha ao incrementar as versões de %s', ', '.join(sorted(tabelas)))
+    for funcao in _ouvintes_commit:
+        funcao(tabelas)
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_alteracoes(session):
+    session.info.pop('tabelas_alteradas', None)
+    session.info.pop('tabelas_confirmadas', None)
@@ -0,0 +1,207 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+from utils.metricas import observar_upstream
+
+class CircuitoAbertoError(requests.exceptions.ConnectionError):
+    """Levantada sem tocar na rede enquanto o circuito do upstream está aberto."""
+
+class Circuito:
+    """
+    Circuit breaker simples por upstream.
+    Depois de `limite_falhas` falhas seguidas o circuito abre e as chamadas falham na hora;
+    passado `tempo_aberto`, uma única chamada de teste é liberada (meio-aberto) para decidir se fecha de novo.
+    """
+
+    def __init__(self, limite_falhas, tempo_aberto):
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.falhas_seguidas = 0
+        self.aberto_ate = None
+        self.testando = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self):
+        if self.aberto_ate is None:
+            return 'fechado'
+        if self.testando or time.monotonic() >= self.aberto_ate:
+            return 'meio-aberto'
+        return 'aberto'
+
+    def permitir(self):
+        with self._lock:
+            if self.aberto_ate is None:
+                return True
+            if time.monotonic() < self.aberto_ate or self.testando:
+                return False
+            self.testando = True
+            return True
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self.falhas_seguidas = 0
+            self.aberto_ate = None
+            self.testando = False
+
+    def registrar_falha(self):
+        with self._lock:
+            self.falhas_seguidas += 1
+            if self.testando or self.falhas_seguidas >= self.limite_falhas:
+                self.aberto_ate = time.monotonic() + self.tempo_aberto
+            self.testando = False
+
+class EstatisticasUpstream:
+    """Contadores das chamadas a um upstream, atualizados pelas threads que chamam o cliente (sob _lock)."""
+
+    def __init__(self):
+        self.requisicoes = 0
+        self.sucessos = 0
+        self.falhas = 0
+        self.retentativas = 0
+        self.rejeitadas_circuito = 0
+        self.tempo_total = 0.0
+        self._lock = threading.Lock()
+
+    def registrar_tentativa(self, duracao, sucesso):
+        with self._lock:
+            self.requisicoes += 1
+            self.tempo_total += duracao
+            if sucesso:
+                self.sucessos += 1
+            else:
+                self.falhas += 1
+
+    def registrar_retentativa(self):
+        with self._lock:
+            self.retentativas += 1
+
+    def registrar_rejeicao(self):
+        with self._lock:
+            self.rejeitadas_circuito += 1
+
+    def como_dict(self, circuito):
+        with self._lock:
+            return {
+                'requisicoes': self.requisicoes,
+                'sucessos': self.sucessos,
+                'falhas': self.falhas,
+                'retentativas': self.retentativas,
+                'rejeitadas_circuito': self.rejeitadas_circuito,
+                'latencia_media_ms': round(self.tempo_total * 1000 / self.requisicoes, 2) if self.requisicoes else None,
+                'circuito': circuito.estado,
+            }
+
+class ClienteHttp:
+    """
+    Cliente para as chamadas entre serviços.
+    Mantém uma requests.Session com pool de conexões keep-alive, aplica timeout em toda chamada,
+    repete falhas de conexão, timeouts e respostas 5xx com backoff exponencial e jitter, e usa um
+    circuit breaker por upstream para falhar rápido enquanto o serviço remoto está fora.
+    Só deve ser usado para chamadas idempotentes, já que elas podem ser repetidas.
+    """
+
+    def __init__(self, pool_conexoes, pool_maximo, timeout, tentativas, espera_base, limite_falhas, tempo_aberto):
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_conexoes, pool_maxsize=pool_maximo, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._circuitos = {}
+        self._estatisticas = {}
+        self._lock = threading.Lock()
+
+    def _upstream(self, upstream):
+        with self._lock:
+            if upstream not in self._circuitos:
+                self._circuitos[upstream] = Circuito(self.limite_falhas, self.tempo_aberto)
+                self._estatisticas[upstream] = EstatisticasUpstream()
+            return self._circuitos[upstream], self._estatisticas[upstream]
+
+    def requisitar(self, metodo, url, **kwargs):
+        upstream = urlsplit(url).netloc
+        circuito, estatisticas = self._upstream(upstream)
+        if not circuito.permitir():
+            estatisticas.registrar_rejeicao()
+            observar_upstream(upstream, 'circuito_aberto')
+            raise CircuitoAbertoError(f'Circuito aberto para {upstream}: serviço indisponível, tente novamente mais tarde.')
+
+        kwargs.setdefault('timeout', self.timeout)
+        for tentativa in range(self.tentativas + 1):
+            if tentativa:
+                estatisticas.registrar_retentativa()
+                # Backoff exponencial com "full jitter" para não sincronizar as retentativas dos workers
+                time.sleep(random.uniform(0, self.espera_base * 2 ** tentativa))
+            erro = None
+            response = None
+            inicio = time.perf_counter()
+            try:
+                response = self.session.request(metodo, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                erro = e
+            except Exception:
+                # Outros erros (ChunkedEncodingError, TooManyRedirects, InvalidURL...) não são repetidos, mas
+                # contam como falha: sem isso, uma chamada de teste do circuito meio-aberto nunca o liberaria
+                duracao = time.perf_counter() - inicio
+                estatisticas.registrar_tentativa(duracao, False)
+                observar_upstream(upstream, 'falha', duracao)
+                circuito.registrar_falha()
+                raise
+            duracao = time.perf_counter() - inicio
+            sucesso = response is not None and response.status_code < 500
+            estatisticas.registrar_tentativa(duracao, sucesso)
+            if sucesso:
+                observar_upstream(upstream, 'sucesso', duracao)
+                circuito.registrar_sucesso()
+                return response
+            observar_upstream(upstream, 'falha', duracao)
+
+        circuito.registrar_falha()
+        if erro is not None:
+            raise erro
+        return response
+
+    def get(self, url, **kwargs):
+        return self.requisitar('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.requisitar('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.requisitar('POST', url, **kwargs)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                upstream: self._estatisticas[upstream].como_dict(self._circuitos[upstream])
+                for upstream in self._circuitos
+            }
+
+_cliente = None
+_cliente_lock = threading.Lock()
+
+def obter_cliente():
+    """Retorna o cliente HTTP do processo, criado na primeira chamada a partir das configurações HTTP_* e CIRCUITO_*."""
+    global _cliente
+    if _cliente is None:
+        with _cliente_lock:
+            if _cliente is None:
+                config = current_app.config
+                _cliente = ClienteHttp(
+                    pool_conexoes=config['HTTP_POOL_CONEXOES'],
+                    pool_maximo=config['HTTP_POOL_MAXIMO'],
+                    timeout=(config['HTTP_TIMEOUT_CONEXAO'], config['HTTP_TIMEOUT_LEITURA']),
+                    tentativas=config['HTTP_TENTATIVAS'],
+                    espera_base=config['HTTP_ESPERA_BASE'],
+                    limite_falhas=config['CIRCUITO_LIMITE_FALHAS'],
+                    tempo_aberto=config['CIRCUITO_TEMPO_ABERTO']
+                )
+    return _cliente
@@ -0,0 +1,45 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from flask import current_app
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def obter_executor():
+    """Retorna o pool de threads do processo para chamadas a upstreams, com VALIDACAO_THREADS threads."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config['VALIDACAO_THREADS'],
+                    thread_name_prefix='validacao'
+                )
+    return _executor
+
+def executar_ate_falhar(tarefas, falhou):
+    """
+    Executa as tarefas (funções sem argumentos) ao mesmo tempo e retorna a lista dos seus resultados.
+    Assim que um resultado satisfaz `falhou(resultado)`, ou uma tarefa levanta exceção, as tarefas que ainda
+    não começaram são canceladas e a função retorna (ou levanta) sem esperar as que estão em andamento.
+    A latência total fica próxima da tarefa mais lenta, e não da soma de todas.
+    As tarefas rodam fora do contexto da aplicação Flask: não podem usar current_app nem db.session.
+    """
+    if len(tarefas) == 1:
+        return [tarefas[0]()]
+
+    executor = obter_executor()
+    pendentes = {executor.submit(tarefa) for tarefa in tarefas}
+    resultados = []
+    try:
+        while pendentes:
+            concluidas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                resultado = futuro.result()
+                resultados.append(resultado)
+                if falhou(resultado):
+                    return resultados
+        return resultados
+    finally:
+        for futuro in pendentes:
+            futuro.cancel()
@@ -0,0 +1,88 @@
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import delete, insert, select
+from model.db import db
+from model.replica import ReplicaReferencia, EstadoSincronizacao
+from service.http_client import obter_cliente
+
+ORIGEM = 'gerenciamento'
+
+def _url_feed():
+    # Importado aqui para evitar import circular com service.gerenciamento
+    from service.gerenciamento import URL_GERENCIAMENTO
+    return f'{URL_GERENCIAMENTO}/changes'
+
+def sincronizar():
+    """
+    Aplica na réplica local as alterações do feed /changes do gerenciamento, a partir do último seq aplicado.
+    Cada página do feed é aplicada na mesma transação que avança o seq, então um reinício no meio
+    continua exatamente de onde parou. Uma consulta sem alterações não grava nada, a não ser na primeira
+    sincronização, que marca a réplica como disponível. Retorna a quantidade de alterações aplicadas.
+    """
+    lote = current_app.config['SINCRONIZACAO_LOTE']
+    cliente = obter_cliente()
+    estado = db.session.get(EstadoSincronizacao, ORIGEM)
+    if estado is None:
+        estado = EstadoSincronizacao(origem=ORIGEM, ultimo_seq=0)
+        db.session.add(estado)
+
+    aplicadas = 0
+    while True:
+        response = cliente.get(_url_feed(), params={'since': estado.ultimo_seq, 'limit': lote})
+        response.raise_for_status()
+        pagina = response.json()
+        alteracoes = pagina['alteracoes']
+
+        # Só a última operação de cada registro na página importa
+        finais = {}
+        for alteracao in alteracoes:
+            finais[(alteracao['tabela'], alteracao['id'])] = alteracao['operacao']
+        por_tabela = {}
+        for (tabela, registro_id) in finais:
+            por_tabela.setdefault(tabela, []).append(registro_id)
+        for tabela, ids in por_tabela.items():
+            db.session.execute(
+                delete(ReplicaReferencia)
+                .where(ReplicaReferencia.tabela == tabela, ReplicaReferencia.registro_id.in_(ids))
+            )
+        novos = [
+            {'tabela': tabela, 'registro_id': registro_id}
+            for (tabela, registro_id), operacao in finais.items() if operacao == 'upsert'
+        ]
+        if novos:
+            db.session.execute(insert(ReplicaReferencia), novos)
+
+        if alteracoes or estado.atualizado_em is None:
+            estado.ultimo_seq = pagina['ultimo_seq']
+            estado.atualizado_em = datetime.utcnow()
+            db.session.commit()
+        else:
+            # Feed sem novidades: nenhuma transação de escrita (nem o lock de escrita do SQLite) a cada consulta
+            db.session.rollback()
+        aplicadas += len(alteracoes)
+        if not pagina['tem_mais']:
+            return aplicadas
+
+def replica_disponivel():
+    """A réplica só é usada depois de aplicada pelo menos uma vez; antes disso a validação vai ao gerenciamento."""
+    if not current_app.config['REPLICA_HABILITADA']:
+        return False
+    estado = db.session.get(EstadoSincronizacao, ORIGEM)
+    return estado is not None and estado.atualizado_em is not None
+
+def ids_replicados(tabela, ids):
+    """Retorna o conjunto dos `ids` (int) presentes na réplica local da tabela, com uma consulta indexada."""
+    convertidos = set()
+    for id in ids:
+        try:
+            convertidos.add(int(id))
+        except (TypeError, ValueError):
+            pass
+    if not convertidos:
+        return set()
+    return {
+        registro_id for (registro_id,) in db.session.execute(
+            select(ReplicaReferencia.registro_id)
+            .where(ReplicaReferencia.tabela == tabela, ReplicaReferencia.registro_id.in_(convertidos))
+        )
+    }
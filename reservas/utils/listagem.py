@@ -0,0 +1,251 @@
+import hashlib
+import operator
+from datetime import date, datetime, timezone
+from urllib.parse import urlencode
+from flask import request, jsonify, current_app, Response, stream_with_context
+from sqlalchemy import select, type_coerce, Boolean, Date, DateTime, Integer, String
+from model.db import db
+from model.versao import versoes_tabelas
+
+MIMETYPE_NDJSON = 'application/x-ndjson'
+# Tamanho aproximado de cada pedaço enviado ao socket no modo streaming
+TAMANHO_PEDACO_STREAM = 64 * 1024
+
+class ParametroInvalido(ValueError):
+    """Parâmetro de listagem inválido na query string; vira uma resposta 400."""
+
+def _inteiro(nome, minimo):
+    valor = request.args.get(nome)
+    if valor is None:
+        return None
+    try:
+        valor = int(valor)
+    except ValueError:
+        raise ParametroInvalido(f"O parâmetro '{nome}' deve ser um número inteiro.")
+    if valor < minimo:
+        raise ParametroInvalido(f"O parâmetro '{nome}' deve ser maior ou igual a {minimo}.")
+    return valor
+
+def _verdadeiro(nome):
+    return request.args.get(nome, '').lower() in ('1', 'true', 'sim')
+
+class Filtro:
+    """
+    Filtro de listagem por um parâmetro da query string, aplicado no SQL (WHERE coluna <operador> valor).
+    O valor é convertido de acordo com o tipo da coluna; use operador '>=' / '<=' para intervalos.
+    """
+    OPERADORES = {'==': operator.eq, '>=': operator.ge, '<=': operator.le}
+
+    def __init__(self, coluna, operador='=='):
+        self.coluna = coluna
+        self.operador = self.OPERADORES[operador]
+
+    def converter(self, nome, texto):
+        tipo = self.coluna.type
+        try:
+            if isinstance(tipo, DateTime):
+                return datetime.fromisoformat(texto)
+            if isinstance(tipo, Date):
+                return date.fromisoformat(texto)
+            if isinstance(tipo, Boolean):
+                if texto.lower() not in ('1', '0', 'true', 'false'):
+                    raise ValueError(texto)
+                return texto.lower() in ('1', 'true')
+            if isinstance(tipo, Integer):
+                return int(texto)
+        except ValueError:
+            raise ParametroInvalido(f"Valor inválido para o filtro '{nome}': {texto}.")
+        return texto
+
+    def condicao(self, nome, texto):
+        return self.operador(self.coluna, self.converter(nome, texto))
+
+def _condicoes(filtros):
+    """Monta as condições WHERE dos filtros presentes na query string."""
+    return [
+        filtro.condicao(nome, request.args[nome])
+        for nome, filtro in (filtros or {}).items() if nome in request.args
+    ]
+
+def _campos_pedidos(campos):
+    """Aplica ?fields=a,b,c sobre o mapa de campos disponíveis (nome no JSON -> coluna)."""
+    pedidos = request.args.get('fields')
+    if not pedidos:
+        return campos
+    nomes = [nome.strip() for nome in pedidos.split(',') if nome.strip()]
+    invalidos = [nome for nome in nomes if nome not in campos]
+    if invalidos or not nomes:
+        raise ParametroInvalido(
+            f"Campos inválidos em 'fields': {', '.join(invalidos) or '(vazio)'}. "
+            f"Disponíveis: {', '.join(campos)}."
+        )
+    return {nome: campos[nome] for nome in dict.fromkeys(nomes)}
+
+def colunas_leitura(campos):
+    """
+    Colunas lidas do banco para `campos`. No SQLite as colunas Date já são gravadas como texto ISO
+    (AAAA-MM-DD) e são lidas como texto, sem converter para date e de volta para texto a cada linha.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return campos
+    return {
+        nome: type_coerce(coluna, String) if isinstance(coluna.type, Date) else coluna
+        for nome, coluna in campos.items()
+    }
+
+def serializador(campos):
+    """
+    Monta a função que transforma uma linha (tupla de colunas, na ordem de `campos`) no dict da resposta.
+    Datas são convertidas para o formato ISO (AAAA-MM-DD); as demais colunas passam direto.
+    Colunas extras no fim da linha (como o cursor) são ignoradas pelo zip.
+    """
+    nomes = list(campos)
+    datas = [i for i, coluna in enumerate(campos.values()) if isinstance(coluna.type, (Date, DateTime))]
+    if not datas:
+        return lambda linha: dict(zip(nomes, linha))
+
+    def serializar(linha):
+        valores = list(linha)
+        for i in datas:
+            if valores[i] is not None:
+                valores[i] = valores[i].isoformat()
+        return dict(zip(nomes, valores))
+    return serializar
+
+def executar_core(consulta):
+    """
+    Executa uma consulta só de colunas direto na conexão da sessão (Core), sem o processamento do ORM
+    em cada linha. A conexão é obtida a cada chamada: no streaming a sessão da view já foi encerrada.
+    """
+    return db.session.connection().execute(consulta)
+
+def quer_stream():
+    """O cliente pediu a listagem em streaming (NDJSON) via ?stream=1 ou Accept: application/x-ndjson."""
+    if _verdadeiro('stream'):
+        return True
+    return request.accept_mimetypes.best == MIMETYPE_NDJSON
+
+def responder_stream(consulta, serializar, executar=None):
+    """
+    Envia os registros como NDJSON (um objeto JSON por linha) enquanto são lidos do banco.
+    A consulta usa yield_per, então só um lote de STREAM_LOTE linhas fica em memória por vez e o
+    primeiro byte sai sem esperar a tabela inteira. `executar` roda a consulta (padrão: db.session.execute).
+    """
+    lote = current_app.config['STREAM_LOTE']
+    dumps = current_app.json.dumps
+    executar = executar or db.session.execute
+
+    def gerar():
+        pedaco = []
+        tamanho = 0
+        for linha in executar(consulta.execution_options(yield_per=lote)):
+            texto = dumps(serializar(linha), separators=(',', ':')) + '\n'
+            pedaco.append(texto)
+            tamanho += len(texto)
+            if tamanho >= TAMANHO_PEDACO_STREAM:
+                yield ''.join(pedaco)
+                pedaco = []
+                tamanho = 0
+        if pedaco:
+            yield ''.join(pedaco)
+
+    return Response(stream_with_context(gerar()), mimetype=MIMETYPE_NDJSON)
+
+def _nao_modificado(etag, modificado):
+    # If-None-Match tem precedência; If-Modified-Since só vale quando não há ETag na requisição
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return modificado.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def responder_condicional(tabelas, responder):
+    """
+    Responde 304 Not Modified, sem chamar `responder` (e sem consultar as tabelas), quando o ETag
+    (If-None-Match) ou a data (If-Modified-Since) do cliente ainda correspondem às versões atuais de
+    `tabelas`. Senão chama `responder()` e anexa ETag, Last-Modified e Cache-Control: no-cache.
+    As versões são lidas antes dos dados: com um commit no meio, o ETag fica mais antigo que o conteúdo
+    e a próxima requisição recebe os dados novos, nunca o contrário.
+    """
+    versoes = versoes_tabelas(tabelas)
+    if len(versoes) != len(set(tabelas)):
+        return responder()
+    assinatura = repr(sorted(versoes.items())) + (MIMETYPE_NDJSON if quer_stream() else '')
+    etag = hashlib.sha1(assinatura.encode()).hexdigest()[:20]
+    modificado = max(atualizado_em for _, atualizado_em in versoes.values()).replace(tzinfo=timezone.utc)
+    if _nao_modificado(etag, modificado):
+        response = current_app.response_class(status=304)
+    else:
+        response = responder()
+        if not isinstance(response, current_app.response_class) or response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=True)
+    response.last_modified = modificado
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def listar(campos, coluna_id, filtros=None):
+    """
+    Responde uma listagem paginada por cursor (keyset), ordenada pela chave primária.
+    `campos` mapeia o nome de cada campo no JSON para a coluna do modelo e `filtros` mapeia
+    parâmetros da query string para Filtro (ex. ?id_aluno=3), aplicados no SQL.
+
+    - ?limit=N: itens por página (padrão PAGINACAO_LIMITE_PADRAO, máximo PAGINACAO_LIMITE_MAXIMO);
+    - ?after=ID: devolve só os itens com id maior que ID (o cursor recebido na página anterior);
+    - ?fields=a,b: devolve só esses campos;
+    - ?todos=1: devolve a tabela inteira sem paginação, como antes;
+    - ?stream=1 ou Accept: application/x-ndjson: devolve NDJSON em streaming, sem montar a lista em
+      memória. Nesse modo a tabela inteira é enviada, a menos que limit/after sejam informados.
+
+    A consulta seleciona só as colunas pedidas e devolve tuplas, sem criar objetos do ORM nem passar
+    pelo identity map da sessão.
+    O corpo continua sendo uma lista JSON. Quando há mais itens, o cursor da próxima página vai no
+    cabeçalho X-Proximo-Cursor e a URL pronta no cabeçalho Link (rel="next").
+    Como a consulta usa "id > cursor" sobre a chave primária, o custo de cada página não depende de quantas
+    páginas já foram lidas (ao contrário de OFFSET).
+    A resposta leva ETag/Last-Modified da versão da tabela; uma requisição condicional que ainda bate
+    recebe 304 sem consultar a tabela (ver responder_condicional).
+    """
+    return responder_condicional([coluna_id.table.name], lambda: _listar(campos, coluna_id, filtros))
+
+def _listar(campos, coluna_id, filtros):
+    try:
+        limite = _inteiro('limit', 1)
+        after = _inteiro('after', 0)
+        selecionados = _campos_pedidos(campos)
+        condicoes = _condicoes(filtros)
+    except ParametroInvalido as e:
+        return jsonify({'erro': str(e)}), 400
+
+    # O id vai sempre por último, como cursor, mesmo que não tenha sido pedido em ?fields=
+    selecionados = colunas_leitura(selecionados)
+    consulta = select(*selecionados.values(), coluna_id.label('_cursor')).order_by(coluna_id)
+    if after is not None:
+        consulta = consulta.where(coluna_id > after)
+    if condicoes:
+        consulta = consulta.where(*condicoes)
+    serializar = serializador(selecionados)
+    executar = executar_core
+
+    if quer_stream():
+        if limite is not None:
+            consulta = consulta.limit(limite)
+        return responder_stream(consulta, serializar, executar)
+
+    if _verdadeiro('todos'):
+        return jsonify([serializar(linha) for linha in executar(consulta)])
+
+    config = current_app.config
+    limite = min(limite or config['PAGINACAO_LIMITE_PADRAO'], config['PAGINACAO_LIMITE_MAXIMO'])
+    linhas = executar(consulta.limit(limite + 1)).all()
+
+    tem_mais = len(linhas) > limite
+    linhas = linhas[:limite]
+    response = jsonify([serializar(linha) for linha in linhas])
+    if tem_mais:
+        cursor = linhas[-1]._cursor
+        argumentos = request.args.to_dict()
+        argumentos.update({'limit': limite, 'after': cursor})
+        response.headers['X-Proximo-Cursor'] = str(cursor)
+        response.headers['Link'] = f'<{request.base_url}?{urlencode(argumentos)}>; rel="next"'
+    return response